@@ -54,6 +54,9 @@ def pytest_runtest_setup(item):
     Per-test setup.
     - Add an option to run those tests marked as 'slow'
     - Clear the django cache between runs
+    - Clear the bug suggestion search results cache between runs
+    - Clear the reference data cache of the job ingestion between runs
+    - Clear the cache of the task definitions & artifacts between runs
     """
 
     if 'slow' in item.keywords and not item.config.getoption("--runslow"):
@@ -61,7 +64,14 @@ def pytest_runtest_setup(item):
 
     from django.core.cache import cache
 
+    from treeherder.etl.reference_data import reference_data_cache
+    from treeherder.model.error_summary import search_results_cache
+    from treeherder.utils.taskcluster import taskcluster_cache
+
     cache.clear()
+    search_results_cache.clear()
+    reference_data_cache.clear()
+    taskcluster_cache.clear()
 
 
 @pytest.fixture(scope="session", autouse=True)
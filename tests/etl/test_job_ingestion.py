@@ -307,3 +307,91 @@ def test_ingest_job_with_updated_job_group(
 
     assert second_job.job_group.name == second_job_datum["job"]["group_name"]
     assert first_job.job_group.name == first_job_datum["job"]["group_name"]
+
+
+def test_ingest_job_batch_queries(
+    test_repository,
+    failure_classifications,
+    sample_data,
+    sample_push,
+    mock_log_parser,
+    django_assert_max_num_queries,
+):
+    """A batch of jobs is loaded with a fixed amount of queries, whatever its size"""
+    store_push_data(test_repository, sample_push)
+    job_data = copy.deepcopy(sample_data.job_data[:10])
+    for datum in job_data:
+        datum['revision'] = sample_push[0]['revision']
+    # resolve the reference data up front
+    test_utils.do_job_ingestion(test_repository, copy.deepcopy(job_data), sample_push, False)
+    for datum in job_data:
+        datum['job']['job_guid'] += '-batch'
+
+    with django_assert_max_num_queries(20):
+        store_job_data(test_repository, job_data)
+
+    assert Job.objects.count() == 2 * len(job_data)
+    assert JobLog.objects.count() == 2 * sum(
+        len(datum['job'].get('log_references', [])) for datum in job_data
+    )
+
+
+def test_ingest_job_batch_skips_bad_jobs(
+    test_repository,
+    failure_classifications,
+    sample_data,
+    sample_push,
+    mock_log_parser,
+    monkeypatch,
+):
+    """A bad job of a batch is skipped in production, without failing the others"""
+    monkeypatch.setenv('DYNO', 'web.1')
+    store_push_data(test_repository, sample_push)
+    job_data = copy.deepcopy(sample_data.job_data[:3])
+    for datum in job_data:
+        datum['revision'] = sample_push[0]['revision']
+    job_data[1]['revision'] = '0' * 40
+
+    store_job_data(test_repository, job_data)
+
+    assert set(Job.objects.values_list('guid', flat=True)) == {
+        job_data[0]['job']['job_guid'],
+        job_data[2]['job']['job_guid'],
+    }
+
+
+def test_ingest_job_schedules_one_log_parsing_task(
+    test_repository, failure_classifications, sample_data, sample_push, monkeypatch
+):
+    """All the logs of a job are parsed by a single task, so they get downloaded concurrently"""
+    from treeherder.log_parser import tasks
+
+    scheduled = []
+
+    class ParseLogsMock:
+        @staticmethod
+        def apply_async(queue, args):
+            scheduled.append((queue, args))
+
+    monkeypatch.setattr(tasks, 'parse_logs', ParseLogsMock)
+    store_push_data(test_repository, sample_push)
+    job_datum = copy.deepcopy(sample_data.job_data[0])
+    job_datum['revision'] = sample_push[0]['revision']
+    job_datum['job']['result'] = 'testfailed'
+    job_datum['job']['log_references'].append(
+        {'url': 'http://example.com/errorsummary.log', 'name': 'errorsummary_json'}
+    )
+
+    store_job_data(test_repository, [job_datum])
+
+    job = Job.objects.get(guid=job_datum['job']['job_guid'])
+    assert scheduled == [
+        (
+            'log_parser_fail_json_unsheriffed',
+            [
+                job.id,
+                sorted(JobLog.objects.filter(job=job).values_list('id', flat=True)),
+                'failures',
+            ],
+        )
+    ]
@@ -242,6 +242,50 @@ def test_ingest_pulse_jobs_with_missing_push(pulse_jobs):
     assert Job.objects.count() == 0
 
 
+@responses.activate
+def test_process_jobs_returns_jobs_with_missing_push(
+    pulse_jobs, failure_classifications, mock_log_parser
+):
+    """
+    Store a batch of jobs, handing back those of which the push is missing
+    rather than failing the whole batch
+    """
+    missing_push_job = pulse_jobs[0]
+    missing_push_job["origin"]["revision"] = "1234567890123456789012345678901234567890"
+    responses.add(
+        responses.GET,
+        "https://firefox-ci-tc.services.mozilla.com/api/queue/v1/task/IYyscnNMTLuxzna7PNqUJQ",
+        json={},
+        content_type='application/json',
+        status=200,
+    )
+
+    failed_jobs = JobLoader().process_jobs(pulse_jobs, 'https://firefox-ci-tc.services.mozilla.com')
+
+    assert failed_jobs == [missing_push_job]
+    assert Job.objects.count() == 4
+
+
+def test_process_jobs_out_of_order(first_job, failure_classifications, mock_log_parser):
+    """
+    A batch of messages received out of order doesn't transition a completed
+    job back to running
+    """
+    running_job = copy.deepcopy(first_job)
+    running_job["state"] = "running"
+    running_job["result"] = "unknown"
+    completed_job = copy.deepcopy(first_job)
+    completed_job["state"] = "completed"
+    completed_job["result"] = "fail"
+
+    JobLoader().process_jobs(
+        [completed_job, running_job], 'https://firefox-ci-tc.services.mozilla.com'
+    )
+
+    job = Job.objects.get()
+    assert (job.state, job.result) == ("completed", "testfailed")
+
+
 def test_transition_pending_running_complete(first_job, failure_classifications, mock_log_parser):
     jl = JobLoader()
 
@@ -3,12 +3,13 @@ import datetime
 import json
 import operator
 import time
+from unittest.mock import patch
 
 import pytest
 from typing import List
 
 from django.core.management import call_command
-from django.db import IntegrityError
+from django.db import IntegrityError, connection
 
 from tests.etl.test_perf_data_adapters import _verify_signature
 from tests.test_utils import create_generic_job
@@ -25,6 +26,8 @@ FRAMEWORK_NAME = 'browsertime'
 MEASUREMENT_UNIT = 'ms'
 UPDATED_MEASUREMENT_UNIT = 'seconds'
 DATA_PER_ARTIFACT = 8  # related to sample_perf_artifact fixture
+LARGE_ARTIFACT_SUITES = 10  # related to large_perf_artifact fixture
+LARGE_ARTIFACT_SUBTESTS = 200
 
 
 @pytest.fixture
@@ -147,6 +150,36 @@ def sample_perf_artifact_with_new_unit():
     }
 
 
+@pytest.fixture
+def large_perf_artifact() -> dict:
+    """Resembles the PERFHERDER_DATA of a Raptor job with many pages & metrics"""
+    return {
+        'job_guid': 'fake_job_guid',
+        'name': 'test',
+        'type': 'test',
+        'blob': {
+            'framework': {'name': FRAMEWORK_NAME},
+            'suites': [
+                {
+                    'name': 'raptor-tp6-{}'.format(suite_idx),
+                    'extraOptions': ['fission', 'webrender'],
+                    'value': 1000.0 + suite_idx,
+                    'unit': MEASUREMENT_UNIT,
+                    'subtests': [
+                        {
+                            'name': 'metric-{}'.format(subtest_idx),
+                            'value': float(subtest_idx),
+                            'unit': MEASUREMENT_UNIT,
+                        }
+                        for subtest_idx in range(LARGE_ARTIFACT_SUBTESTS)
+                    ],
+                }
+                for suite_idx in range(LARGE_ARTIFACT_SUITES)
+            ],
+        },
+    }
+
+
 @pytest.fixture
 def later_perf_push(test_repository):
     later_timestamp = datetime.datetime.fromtimestamp(int(time.time()) + 5)
@@ -291,6 +324,93 @@ def test_measurement_unit_can_be_updated(
     assert not_changed_subtest_signature.measurement_unit == MEASUREMENT_UNIT
 
 
+@pytest.mark.parametrize('PERFHERDER_ENABLE_MULTIDATA_INGESTION', [True, False])
+def test_large_artifact_is_ingested_in_bulk(
+    PERFHERDER_ENABLE_MULTIDATA_INGESTION,
+    test_repository,
+    perf_job,
+    later_perf_push,
+    generic_reference_data,
+    large_perf_artifact,
+    django_assert_max_num_queries,
+    settings,
+):
+    settings.PERFHERDER_ENABLE_MULTIDATA_INGESTION = PERFHERDER_ENABLE_MULTIDATA_INGESTION
+    large_perf_artifact['blob']['pushTimestamp'] = int(later_perf_push.time.timestamp())
+    _, submit_datum = _prepare_test_data(large_perf_artifact)
+    later_job = create_generic_job(
+        'lateguid', test_repository, later_perf_push.id, generic_reference_data
+    )
+    expected_data = LARGE_ARTIFACT_SUITES * (LARGE_ARTIFACT_SUBTESTS + 1)
+
+    with patch('treeherder.etl.perf.schedule_alert_generation') as schedule_alert_generation:
+        # the amount of queries doesn't depend on the amount of subtests
+        with django_assert_max_num_queries(20):
+            store_performance_artifact(perf_job, submit_datum)
+        # signatures already exist now, so they're updated instead
+        with django_assert_max_num_queries(20):
+            store_performance_artifact(later_job, submit_datum)
+
+    assert PerformanceSignature.objects.count() == expected_data
+    assert PerformanceSignature.objects.filter(parent_signature__isnull=False).count() == (
+        LARGE_ARTIFACT_SUITES * LARGE_ARTIFACT_SUBTESTS
+    )
+    assert PerformanceDatum.objects.count() == 2 * expected_data
+    assert schedule_alert_generation.call_count == 2 * expected_data
+    assert MultiCommitDatum.objects.count() == (
+        2 * expected_data if PERFHERDER_ENABLE_MULTIDATA_INGESTION else 0
+    )
+    for signature in PerformanceSignature.objects.all():
+        assert signature.last_updated == later_perf_push.time
+
+    datum = PerformanceDatum.objects.get(
+        job=perf_job, signature__suite='raptor-tp6-3', signature__test='metric-42'
+    )
+    assert datum.value == 42.0
+    assert datum.signature.parent_signature.suite == 'raptor-tp6-3'
+
+
+def test_data_stored_concurrently_isnt_counted_as_new(
+    test_repository, perf_job, sibling_perf_artifacts, settings
+):
+    settings.PERFHERDER_ENABLE_MULTIDATA_INGESTION = True
+    artifact = sibling_perf_artifacts[0]
+    _, submit_datum = _prepare_test_data(artifact)
+    stored_concurrently = []
+
+    def store_concurrently(execute, sql, params, many, context):
+        result = execute(sql, params, many, context)
+        # a concurrent ingestion of the same artifact stores a datum right
+        # after the check for existing data
+        if sql.startswith('SELECT') and 'performance_datum' in sql and not stored_concurrently:
+            stored_concurrently.append(True)
+            datum = PerformanceDatum.objects.create(
+                repository=perf_job.repository,
+                job=perf_job,
+                push=perf_job.push,
+                push_timestamp=datetime.datetime.fromtimestamp(artifact['blob']['pushTimestamp']),
+                signature=PerformanceSignature.objects.get(suite='youtube-watch', test=''),
+                value=10.0,
+            )
+            MultiCommitDatum.objects.create(perf_datum=datum)
+        return result
+
+    with connection.execute_wrapper(store_concurrently), patch(
+        'treeherder.etl.perf.schedule_alert_generation'
+    ) as schedule_alert_generation:
+        store_performance_artifact(perf_job, submit_datum)
+
+    assert stored_concurrently
+    assert PerformanceDatum.objects.count() == DATA_PER_ARTIFACT
+    assert MultiCommitDatum.objects.count() == DATA_PER_ARTIFACT
+    # only the other two suites got new data to generate alerts for
+    alerted_suites = {
+        PerformanceSignature.objects.get(id=args[0]).suite
+        for (args, _) in schedule_alert_generation.call_args_list
+    }
+    assert alerted_suites == {'youtube-watch 2', 'youtube-watch 3'}
+
+
 def test_changing_extra_options_decouples_perf_signatures(
     test_repository, later_perf_push, perf_job, generic_reference_data, sample_perf_artifact
 ):
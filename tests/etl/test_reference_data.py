@@ -0,0 +1,52 @@
+from tests import test_utils
+from treeherder.etl.jobs import store_job_data
+from treeherder.etl.reference_data import reference_data_cache
+from treeherder.model.models import Job, JobType, MachinePlatform
+
+
+def test_get_or_create_is_cached(transactional_db, django_assert_num_queries):
+    # the stats are kept since the process started
+    stats = reference_data_cache.stats().get('MachinePlatform', {'hits': 0, 'misses': 0})
+    platform = reference_data_cache.get_or_create(
+        MachinePlatform, os_name='linux', platform='linux64', architecture='x86_64'
+    )
+
+    with django_assert_num_queries(0):
+        assert (
+            reference_data_cache.get_or_create(
+                MachinePlatform, os_name='linux', platform='linux64', architecture='x86_64'
+            ).id
+            == platform.id
+        )
+    assert reference_data_cache.stats()['MachinePlatform'] == {
+        'hits': stats['hits'] + 1,
+        'misses': stats['misses'] + 1,
+    }
+
+
+def test_preload(failure_classifications, django_assert_num_queries):
+    JobType.objects.create(symbol='B', name='build')
+    reference_data_cache.preload()
+
+    with django_assert_num_queries(0):
+        reference_data_cache.get_or_create(JobType, symbol='B', name='build')
+        reference_data_cache.get(JobType, symbol='B', name='build')
+
+
+def test_ingestion_after_reference_data_got_pruned(
+    test_repository, failure_classifications, sample_data, sample_push, mock_log_parser
+):
+    job_data = sample_data.job_data[:1]
+    test_utils.do_job_ingestion(test_repository, job_data, sample_push)
+    job = Job.objects.get()
+    job_type = job.job_type
+
+    # what the data cycling does to job types no job refers to anymore
+    job.delete()
+    JobType.objects.filter(id=job_type.id).delete()
+
+    store_job_data(test_repository, job_data)
+
+    job = Job.objects.get()
+    assert job.job_type_id != job_type.id
+    assert (job.job_type.symbol, job.job_type.name) == (job_type.symbol, job_type.name)
@@ -5,6 +5,7 @@ from tests.test_utils import add_log_response
 from treeherder.log_parser.artifactbuildercollection import (
     MAX_DOWNLOAD_SIZE_IN_BYTES,
     ArtifactBuilderCollection,
+    ChunkedLogScanner,
     LogSizeException,
 )
 from treeherder.log_parser.artifactbuilders import LogViewerArtifactBuilder
@@ -71,3 +72,38 @@ def test_log_download_size_limit():
 
     with pytest.raises(LogSizeException):
         lpc.parse()
+
+
+@responses.activate
+@pytest.mark.parametrize(
+    'log',
+    [
+        'mozilla-inbound_ubuntu64_vm-debug_test-mochitest-other-bm53-tests1-linux-build122.txt.gz',
+        'mozilla-inbound-linux64-bm72-build1-build225.txt.gz',
+    ],
+)
+def test_chunked_scan_matches_line_by_line_parsing(log, settings):
+    url = add_log_response(log)
+    artifacts = []
+    for chunked_scan in (False, True):
+        settings.LOG_PARSER_CHUNKED_SCAN = chunked_scan
+        lpc = ArtifactBuilderCollection(url)
+        lpc.parse()
+        artifacts.append(lpc.artifacts)
+
+    assert artifacts[0] == artifacts[1]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 1024])
+def test_chunked_log_scanner(chunk_size):
+    log = b'foo\r\nERROR one\r\n\rbar\rPERFHERDER_DATA: {}\n\nbaz\r\r\nERROR two'
+    chunks = [log[i : i + chunk_size] for i in range(0, len(log), chunk_size)]
+
+    scanner = ChunkedLogScanner(['ERROR', 'PERFHERDER_DATA:'])
+    assert list(scanner.scan(chunks)) == [
+        (1, b'ERROR one'),
+        (4, b'PERFHERDER_DATA: {}'),
+        (8, b'ERROR two'),
+    ]
+    # same as splitlines()
+    assert scanner.line_count == 9
@@ -1,5 +1,8 @@
+import gzip
+
 import pytest
 
+from tests.sampledata import SampleData
 from treeherder.log_parser.parsers import ErrorParser
 
 ERROR_TEST_CASES = (
@@ -120,6 +123,49 @@ def test_error_lines_taskcluster(line):
     assert len(parser.artifact) == 1
 
 
+@pytest.mark.parametrize("line", ERROR_TEST_CASES)
+def test_error_lines_pass_prefilter(line):
+    assert ErrorParser.may_be_error_line(line)
+
+
+def test_prefilter_checks_all_terms():
+    # the terms the prefilter checks are spelled out, so make sure they're
+    # still the ones of PREFILTER_TERMS, in the same order
+    code = ErrorParser.may_be_error_line.__code__
+    terms = [const for const in code.co_consts[1:] if isinstance(const, str)]
+    assert terms == list(ErrorParser.PREFILTER_TERMS)
+
+    for term in ErrorParser.PREFILTER_TERMS:
+        assert ErrorParser.may_be_error_line("12:34:56 INFO - foo {} bar".format(term))
+    assert not ErrorParser.may_be_error_line("12:34:56 INFO - foo bar")
+
+
+@pytest.mark.parametrize(
+    "log",
+    [
+        "crash-2.txt.gz",
+        "errorlog.txt.gz",
+        "large-number-of-error-lines.txt.gz",
+        "multiple-timeouts.txt.gz",
+        "taskcluster-missing-finish-step-marker.txt.gz",
+    ],
+)
+def test_prefilter_finds_same_errors(log, settings):
+    settings.MAX_ERROR_LINES = 10000
+    with gzip.open(SampleData().get_log_path(log), 'rb') as f:
+        lines = [line.decode('utf-8', 'replace') for line in f.read().splitlines()]
+
+    artifacts = []
+    for prefilter in (False, True):
+        parser = ErrorParser(prefilter=prefilter)
+        for lineno, line in enumerate(lines):
+            parser.parse_line(line, lineno)
+        artifacts.append(parser.artifact)
+
+    assert artifacts[0]
+    assert artifacts[0] == artifacts[1]
+
+
 @pytest.mark.parametrize("line", NON_ERROR_TEST_CASES)
 def test_successful_lines_not_matched(line):
     parser = ErrorParser()
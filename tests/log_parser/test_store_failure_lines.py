@@ -6,6 +6,7 @@ from django.conf import settings
 from requests.exceptions import HTTPError
 
 from treeherder.log_parser.failureline import (
+    read_log,
     store_failure_lines,
     write_failure_lines,
     get_group_results,
@@ -74,6 +75,32 @@ def test_store_error_summary_truncated(activate_responses, test_repository, test
     assert failure.repository == test_repository
 
 
+def test_read_log_stops_at_cutoff(activate_responses, monkeypatch):
+    log_url = 'http://my-log.mozilla.org'
+    monkeypatch.setattr(settings, 'FAILURE_LINES_CUTOFF', 5)
+
+    body = "\n".join(json.dumps({"action": "log", "line": i}) for i in range(100))
+    responses.add(responses.GET, log_url, body=body, status=200)
+
+    assert [item["line"] for item in read_log(log_url)] == list(range(5 + 1))
+
+
+def test_store_error_summary_truncated_last_line(activate_responses, test_repository, test_job):
+    log_path = SampleData().get_log_path("plain-chunked_errorsummary_10_lines.log")
+    log_url = 'http://my-log.mozilla.org'
+
+    with open(log_path) as log_handler:
+        # the upload of the log got cut off in the middle of a line
+        body = log_handler.read() + '{"action": "log", "line": 10, "mess'
+    responses.add(responses.GET, log_url, body=body, status=200)
+
+    log_obj = JobLog.objects.create(job=test_job, name="errorsummary_json", url=log_url)
+
+    store_failure_lines(log_obj)
+
+    assert FailureLine.objects.count() == 10
+
+
 def test_store_error_summary_astral(activate_responses, test_repository, test_job):
     log_path = SampleData().get_log_path("plain-chunked_errorsummary_astral.log")
     log_url = 'http://my-log.mozilla.org'
@@ -183,6 +210,31 @@ def test_store_error_summary_group_status(activate_responses, test_repository, t
     assert error_groups.first().name == "toolkit/components/pictureinpicture/tests/browser.ini"
 
 
+def test_store_error_summary_in_bulk(
+    activate_responses, test_repository, test_job, django_assert_max_num_queries
+):
+    log_path = SampleData().get_log_path("mochitest-browser-chrome_errorsummary.log")
+    log_url = 'http://my-log.mozilla.org'
+
+    with open(log_path) as log_handler:
+        responses.add(responses.GET, log_url, body=log_handler.read(), status=200)
+
+    log_obj = JobLog.objects.create(job=test_job, name="errorsummary_json", url=log_url)
+    # 5 failure lines & 29 group results, written with a constant amount of queries
+    with django_assert_max_num_queries(15):
+        store_failure_lines(log_obj)
+
+    assert FailureLine.objects.filter(job_log=log_obj).count() == 5
+    assert GroupStatus.objects.filter(job_log=log_obj).count() == 29
+
+    # existing groups are reused
+    other_log = JobLog.objects.create(job=test_job, name="errorsummary_json_2", url=log_url)
+    store_failure_lines(other_log)
+
+    assert Group.objects.count() == 29
+    assert GroupStatus.objects.filter(job_log=other_log).count() == 29
+
+
 def test_get_group_results(activate_responses, test_repository, test_job):
     log_path = SampleData().get_log_path("mochitest-browser-chrome_errorsummary.log")
     log_url = 'http://my-log.mozilla.org'
@@ -1,10 +1,14 @@
+from unittest.mock import patch
+
 import pytest
+import responses
 
 from tests.test_utils import add_log_response
 from treeherder.etl.jobs import store_job_data
 from treeherder.etl.push import store_push_data
+from treeherder.log_parser.tasks import parse_logs
 from treeherder.model.error_summary import get_error_summary
-from treeherder.model.models import Job, TextLogError
+from treeherder.model.models import FailureLine, Job, JobLog, TextLogError
 
 from ..sampledata import SampleData
 
@@ -52,3 +56,43 @@ def test_create_error_summary(
     expected_keys = set(["search", "search_terms", "bugs", "line_number"])
     for failure_line in bug_suggestions:
         assert set(failure_line.keys()) == expected_keys
+
+
+@pytest.fixture
+def job_with_both_logs(activate_responses, test_job):
+    errorsummary_url = 'http://my-log.mozilla.org/errorsummary.log'
+    with open(SampleData().get_log_path("plain-chunked_errorsummary.log")) as log_handler:
+        responses.add(responses.GET, errorsummary_url, body=log_handler.read(), status=200)
+    raw_log_url = add_log_response(
+        "mozilla-inbound_ubuntu64_vm-debug_test-mochitest-other-bm53-tests1-linux-build122.txt.gz"
+    )
+
+    return [
+        JobLog.objects.create(job=test_job, name="live_backing_log", url=raw_log_url),
+        JobLog.objects.create(job=test_job, name="errorsummary_json", url=errorsummary_url),
+    ]
+
+
+def test_parse_logs_of_job(test_job, job_with_both_logs):
+    parse_logs(test_job.id, [job_log.id for job_log in job_with_both_logs], "failures")
+
+    for job_log in job_with_both_logs:
+        job_log.refresh_from_db()
+        assert job_log.status == JobLog.PARSED
+    assert TextLogError.objects.filter(job=test_job).exists()
+    assert FailureLine.objects.count() == 1
+
+
+def test_parse_logs_raises_first_exception(test_job, job_with_both_logs):
+    raw_log, errorsummary_log = job_with_both_logs
+
+    with patch('treeherder.log_parser.tasks.parse_text_log', side_effect=ValueError("first")):
+        with pytest.raises(ValueError, match="first"):
+            parse_logs(test_job.id, [raw_log.id, errorsummary_log.id], "failures")
+
+    # the failing log doesn't prevent the other ones from being stored
+    raw_log.refresh_from_db()
+    errorsummary_log.refresh_from_db()
+    assert raw_log.status == JobLog.FAILED
+    assert errorsummary_log.status == JobLog.PARSED
+    assert FailureLine.objects.count() == 1
@@ -6,7 +6,15 @@ from django.db.models import Max
 
 from tests import test_utils
 from tests.autoclassify.utils import create_failure_lines, test_line
-from treeherder.model.models import Job, FailureLine, JobLog, JobType, Machine, JobGroup
+from treeherder.model.models import (
+    Job,
+    JobChange,
+    FailureLine,
+    JobLog,
+    JobType,
+    Machine,
+    JobGroup,
+)
 from treeherder.perf.models import PerformanceDatum
 
 
@@ -126,6 +134,27 @@ def test_cycle_all_data_in_chunks(
     assert FailureLine.objects.count() == 0
 
 
+def test_cycle_job_changes(
+    test_repository, failure_classifications, sample_data, sample_push, mock_log_parser
+):
+    """
+    Test that only the recent job changes are kept, even for jobs which aren't cycled
+    """
+    job_data = sample_data.job_data[:20]
+    test_utils.do_job_ingestion(test_repository, job_data, sample_push, False)
+    Job.objects.update(submit_time=datetime.now())
+
+    recent_change = JobChange.objects.latest('id')
+    JobChange.objects.exclude(id=recent_change.id).update(
+        created=datetime.now() - timedelta(days=3)
+    )
+
+    call_command('cycle_data', 'from:treeherder', sleep_time=0, chunk_size=3)
+
+    assert Job.objects.count() == 20
+    assert list(JobChange.objects.all()) == [recent_change]
+
+
 def test_cycle_job_model_reference_data(
     test_repository, failure_classifications, sample_data, sample_push, mock_log_parser
 ):
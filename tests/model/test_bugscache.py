@@ -3,7 +3,9 @@ import os
 from datetime import datetime, timedelta
 
 import pytest
+from django.db.utils import ProgrammingError
 
+from treeherder.model.error_summary import search_bugs, search_results_cache
 from treeherder.model.models import Bugscache
 
 
@@ -91,6 +93,26 @@ def test_get_all_other_bugs(transactional_db, sample_bugs, search_term, exp_bugs
     assert all_others_bugs == exp_bugs
 
 
+def test_search_many(transactional_db, sample_bugs, monkeypatch, django_assert_num_queries):
+    """Test that searching many terms at once finds the same bugs as searching each of them."""
+    bug_list = sample_bugs['bugs']
+    fifty_days_ago = datetime.now() - timedelta(days=50)
+    for bug in bug_list:
+        bug['last_change_time'] = fifty_days_ago
+    _update_bugscache(bug_list)
+
+    search_terms = [search_term for (search_term, _) in BUG_SEARCHES]
+    monkeypatch.setattr(Bugscache, 'SEARCH_BATCH_SIZE', 5)
+    # two queries (open recent & all others) per batch of search terms
+    with django_assert_num_queries(2 * 3):
+        suggestions = Bugscache.search_many(search_terms)
+
+    assert list(suggestions) == search_terms
+    for search_term, exp_bugs in BUG_SEARCHES:
+        assert [b['id'] for b in suggestions[search_term]['open_recent']] == exp_bugs
+        assert suggestions[search_term] == Bugscache.search(search_term)
+
+
 def test_get_recent_resolved_bugs(transactional_db, sample_bugs):
     """Test that we retrieve recent, but fixed bugs for a search term."""
     search_term = "Recently modified resolved bugs should be returned in all_others"
@@ -152,3 +174,24 @@ def test_sanitized_search_term():
     for case in SEARCH_TERMS:
         sanitized_term = Bugscache.sanitized_search_term(case[0])
         assert sanitized_term == case[1]
+
+
+def test_search_many_isolates_failing_terms(monkeypatch):
+    """Test that a term failing the FULLTEXT search doesn't fail the other terms of its batch."""
+
+    def search_batch(batch, condition, time_limit, max_size):
+        if 'bad term' in batch:
+            raise ProgrammingError()
+        return {search_term: [{'summary': search_term}] for search_term in batch}
+
+    monkeypatch.setattr(Bugscache, '_search_batch', search_batch)
+    suggestions, failed_terms = Bugscache.search_many_with_failures(['a', 'bad term', 'b'])
+
+    assert failed_terms == {'bad term'}
+    assert suggestions['a']['open_recent'] == [{'summary': 'a'}]
+    assert suggestions['b']['all_others'] == [{'summary': 'b'}]
+    assert suggestions['bad term'] == {'open_recent': [], 'all_others': []}
+
+    # the failing term is searched for again next time
+    search_bugs(['a', 'bad term'])
+    assert search_results_cache.get_many(['a', 'bad term']) == {'a': suggestions['a']}
@@ -1,6 +1,7 @@
 import pytest
 
 from treeherder.model.error_summary import (
+    SearchResultsCache,
     get_cleaned_line,
     get_crash_signature,
     get_error_search_term,
@@ -242,3 +243,20 @@ def test_get_blacklisted_search_term(line, exp_search_term):
     """Test search term extraction for lines that contain a blacklisted term"""
     actual_search_term = get_error_search_term(line)
     assert actual_search_term == exp_search_term
+
+
+def test_search_results_cache(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('treeherder.model.error_summary.time.monotonic', lambda: now[0])
+    results_cache = SearchResultsCache(timeout=60, max_size=2)
+
+    results_cache.set_many({'a': 1, 'b': 2})
+    assert results_cache.get_many(['a', 'b', 'c']) == {'a': 1, 'b': 2}
+
+    # 'a' was used more recently than 'b', so 'b' is evicted
+    results_cache.get_many(['a'])
+    results_cache.set_many({'c': 3})
+    assert results_cache.get_many(['a', 'b', 'c']) == {'a': 1, 'c': 3}
+
+    now[0] += 61
+    assert results_cache.get_many(['a', 'c']) == {}
@@ -0,0 +1,41 @@
+from django.core.management import call_command
+
+from treeherder.model.models import Job, Push
+
+
+def test_get_statuses(eleven_jobs_stored, django_assert_num_queries):
+    pushes = list(Push.objects.order_by('id'))
+
+    with django_assert_num_queries(1):
+        statuses = Push.get_statuses(push.id for push in pushes)
+    assert statuses == {push.id: Push.compute_statuses([push.id])[push.id] for push in pushes}
+
+    # cached from now on
+    with django_assert_num_queries(0):
+        assert Push.get_statuses(push.id for push in pushes) == statuses
+        assert pushes[0].get_status() == statuses[pushes[0].id]
+
+
+def test_status_invalidated_by_job_change(test_job):
+    push = test_job.push
+    assert push.get_status() == {'success': 1, 'completed': 1, 'pending': 0, 'running': 0}
+
+    test_job.state = 'running'
+    test_job.result = 'unknown'
+    test_job.save()
+
+    assert push.get_status() == {'completed': 0, 'pending': 0, 'running': 1}
+
+
+def test_reconcile_push_statuses(test_job, capsys):
+    push = test_job.push
+    status = push.get_status()
+
+    # the job changed without the cached status getting invalidated
+    Job.objects.filter(id=test_job.id).update(result='testfailed')
+    assert push.get_status() == status
+
+    call_command('reconcile_push_statuses', days=100000)
+
+    assert "1 had drifted" in capsys.readouterr().out
+    assert push.get_status() == {'testfailed': 1, 'completed': 1, 'pending': 0, 'running': 0}
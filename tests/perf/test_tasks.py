@@ -0,0 +1,131 @@
+from unittest.mock import patch
+
+import pytest
+
+from treeherder.perf import tasks
+from treeherder.perf.tasks import (
+    generate_alerts_batch,
+    get_alert_generation_counters,
+    schedule_alert_generation,
+)
+
+
+def test_alert_generation_not_coalesced_by_default(settings, test_perf_signature):
+    settings.PERFHERDER_ALERTS_COALESCING_WINDOW = 0
+
+    with patch.object(tasks.generate_alerts, 'apply_async') as apply_async:
+        schedule_alert_generation(test_perf_signature.id)
+        schedule_alert_generation(test_perf_signature.id)
+
+    assert apply_async.call_count == 2
+
+
+def test_alert_generation_coalesced_per_signature(
+    settings, test_perf_signature, test_perf_signature_2
+):
+    settings.PERFHERDER_ALERTS_COALESCING_WINDOW = 60
+
+    with patch.object(tasks.generate_alerts_batch, 'apply_async') as apply_async:
+        for _ in range(3):
+            schedule_alert_generation(test_perf_signature.id)
+        for _ in range(2):
+            schedule_alert_generation(test_perf_signature_2.id)
+
+    # only a single batch got scheduled, at the end of the window
+    apply_async.assert_called_once_with(queue='generate_perf_alerts', countdown=60)
+
+    with patch.object(tasks, 'generate_new_alerts_in_series') as generate_new_alerts:
+        generate_alerts_batch()
+
+    assert [args[0] for (args, _) in generate_new_alerts.call_args_list] == [
+        test_perf_signature,
+        test_perf_signature_2,
+    ]
+    assert get_alert_generation_counters() == {'requested': 5, 'executed': 2}
+
+    # requests arriving after the batch started get a new batch
+    with patch.object(tasks.generate_alerts_batch, 'apply_async') as apply_async:
+        schedule_alert_generation(test_perf_signature.id)
+    apply_async.assert_called_once()
+
+
+def test_failed_signature_falls_back_to_single_task(settings, test_perf_signature):
+    settings.PERFHERDER_ALERTS_COALESCING_WINDOW = 60
+
+    with patch.object(tasks.generate_alerts_batch, 'apply_async'):
+        schedule_alert_generation(test_perf_signature.id)
+
+    with patch.object(tasks, 'generate_new_alerts_in_series', side_effect=ValueError), patch.object(
+        tasks.generate_alerts, 'apply_async'
+    ) as apply_async:
+        generate_alerts_batch()
+
+    apply_async.assert_called_once_with(args=[test_perf_signature.id], queue='generate_perf_alerts')
+    # it's only executed once the single task succeeds
+    assert get_alert_generation_counters() == {'requested': 1, 'executed': 0}
+
+
+def test_alert_generation_batch_survives_dying_worker(
+    settings, test_perf_signature, test_perf_signature_2
+):
+    settings.PERFHERDER_ALERTS_COALESCING_WINDOW = 60
+
+    with patch.object(tasks.generate_alerts_batch, 'apply_async'):
+        schedule_alert_generation(test_perf_signature.id)
+        schedule_alert_generation(test_perf_signature_2.id)
+
+    # the worker gets killed while generating the alerts of the first signature
+    with patch.object(
+        tasks, 'generate_new_alerts_in_series', side_effect=SystemExit
+    ), pytest.raises(SystemExit):
+        generate_alerts_batch()
+
+    # so the redelivered batch task generates the alerts of both again
+    with patch.object(tasks, 'generate_new_alerts_in_series') as generate_new_alerts:
+        generate_alerts_batch()
+    assert [args[0] for (args, _) in generate_new_alerts.call_args_list] == [
+        test_perf_signature,
+        test_perf_signature_2,
+    ]
+
+    # and nothing is left for the next batch
+    with patch.object(tasks, 'generate_new_alerts_in_series') as generate_new_alerts:
+        generate_alerts_batch()
+    assert not generate_new_alerts.called
+    assert get_alert_generation_counters() == {'requested': 2, 'executed': 2}
+
+
+def test_overlapping_alert_generation_batches(settings, test_perf_signature, test_perf_signature_2):
+    settings.PERFHERDER_ALERTS_COALESCING_WINDOW = 60
+
+    with patch.object(tasks.generate_alerts_batch, 'apply_async'):
+        schedule_alert_generation(test_perf_signature.id)
+        schedule_alert_generation(test_perf_signature_2.id)
+
+    generated = []
+    deferred = []
+
+    def generate_new_alerts(signature):
+        generated.append(signature)
+        if signature == test_perf_signature:
+            # the first batch takes longer than the window, so the batch
+            # scheduled by a request coming in meanwhile starts already
+            with patch.object(tasks.generate_alerts_batch, 'apply_async') as apply_async:
+                schedule_alert_generation(test_perf_signature.id)
+                generate_alerts_batch()
+            deferred.extend(apply_async.call_args_list)
+
+    with patch.object(tasks, 'generate_new_alerts_in_series', side_effect=generate_new_alerts):
+        generate_alerts_batch()
+
+    # the second batch didn't touch the signatures the first one was working
+    # on, but got deferred
+    assert generated == [test_perf_signature, test_perf_signature_2]
+    assert len(deferred) == 2
+    assert deferred[-1] == ((), {'queue': 'generate_perf_alerts', 'countdown': 60})
+
+    # once run again, it only has the signature requested meanwhile
+    with patch.object(tasks, 'generate_new_alerts_in_series') as generate_new_alerts:
+        generate_alerts_batch()
+    assert [args[0] for (args, _) in generate_new_alerts.call_args_list] == [test_perf_signature]
+    assert get_alert_generation_counters() == {'requested': 3, 'executed': 3}
@@ -9,6 +9,7 @@ from treeherder.perf.models import (
     PerformanceAlert,
     PerformanceAlertSummary,
     PerformanceDatum,
+    PerformanceDetectionState,
     PerformanceSignature,
 )
 
@@ -71,12 +72,14 @@ def _generate_performance_data(
         )
 
 
+@pytest.mark.parametrize('engine', ['python', 'numpy'])
 def test_detect_alerts_in_series(
     test_repository,
     test_issue_tracker,
     failure_classifications,
     generic_reference_data,
     test_perf_signature,
+    engine,
 ):
 
     base_time = time.time()  # generate it based off current time
@@ -98,7 +101,7 @@ def test_detect_alerts_in_series(
         int(INTERVAL / 2),
     )
 
-    generate_new_alerts_in_series(test_perf_signature)
+    generate_new_alerts_in_series(test_perf_signature, engine=engine)
 
     assert PerformanceAlert.objects.count() == 1
     assert PerformanceAlertSummary.objects.count() == 1
@@ -117,7 +120,7 @@ def test_detect_alerts_in_series(
     )
 
     # verify that no new alerts generated if we rerun
-    generate_new_alerts_in_series(test_perf_signature)
+    generate_new_alerts_in_series(test_perf_signature, engine=engine)
     assert PerformanceAlert.objects.count() == 1
     assert PerformanceAlertSummary.objects.count() == 1
     _verify_alert(
@@ -143,7 +146,7 @@ def test_detect_alerts_in_series(
         2.0,
         INTERVAL,
     )
-    generate_new_alerts_in_series(test_perf_signature)
+    generate_new_alerts_in_series(test_perf_signature, engine=engine)
 
     assert PerformanceAlert.objects.count() == 2
     assert PerformanceAlertSummary.objects.count() == 2
@@ -162,12 +165,14 @@ def test_detect_alerts_in_series(
     )
 
 
+@pytest.mark.parametrize('engine', ['python', 'numpy'])
 def test_detect_alerts_in_series_with_retriggers(
     test_repository,
     test_issue_tracker,
     failure_classifications,
     generic_reference_data,
     test_perf_signature,
+    engine,
 ):
 
     # sometimes we detect an alert in the middle of a series
@@ -206,7 +211,7 @@ def test_detect_alerts_in_series_with_retriggers(
             1,
         )
 
-    generate_new_alerts_in_series(test_perf_signature)
+    generate_new_alerts_in_series(test_perf_signature, engine=engine)
     _verify_alert(
         1,
         2,
@@ -222,6 +227,75 @@ def test_detect_alerts_in_series_with_retriggers(
     )
 
 
+@pytest.mark.parametrize('engine', ['python', 'numpy'])
+def test_detect_alerts_incrementally(
+    test_repository,
+    test_issue_tracker,
+    failure_classifications,
+    generic_reference_data,
+    test_perf_signature,
+    settings,
+    engine,
+):
+    settings.PERFHERDER_ALERTS_INCREMENTAL_DETECTION = True
+
+    # same series as in test_detect_alerts_in_series, but coming
+    # in one data point at a time
+    base_time = time.time()  # generate it based off current time
+    INTERVAL = 30
+    for t in range(1, INTERVAL + 1):
+        value = 0.5 if t <= INTERVAL / 2 else 1.0
+        _generate_performance_data(test_repository, test_perf_signature, base_time, t, value, 1)
+        generate_new_alerts_in_series(test_perf_signature, engine=engine)
+
+    assert PerformanceAlert.objects.count() == 1
+    assert PerformanceAlertSummary.objects.count() == 1
+    _verify_alert(
+        1,
+        (INTERVAL / 2) + 1,
+        (INTERVAL / 2),
+        test_perf_signature,
+        0.5,
+        1.0,
+        True,
+        PerformanceAlert.UNTRIAGED,
+        PerformanceAlertSummary.UNTRIAGED,
+        None,
+        "MODAL",
+    )
+    assert PerformanceDetectionState.objects.filter(signature=test_perf_signature).exists()
+
+
+def test_incremental_detection_state_invalidated(
+    test_repository,
+    test_issue_tracker,
+    failure_classifications,
+    generic_reference_data,
+    test_perf_signature,
+    settings,
+):
+    settings.PERFHERDER_ALERTS_INCREMENTAL_DETECTION = True
+
+    base_time = time.time()  # generate it based off current time
+    _generate_performance_data(test_repository, test_perf_signature, base_time, 1, 0.5, 30)
+    generate_new_alerts_in_series(test_perf_signature)
+    state = PerformanceDetectionState.objects.get(signature=test_perf_signature)
+    assert state.last_datum_id == PerformanceDatum.objects.latest('id').id
+
+    # nothing new, nothing to analyze
+    generate_new_alerts_in_series(test_perf_signature)
+    assert (
+        PerformanceDetectionState.objects.get(signature=test_perf_signature).last_updated
+        == state.last_updated
+    )
+
+    # a retrigger of an already analyzed push
+    _generate_performance_data(test_repository, test_perf_signature, base_time, 5, 0.5, 1)
+    generate_new_alerts_in_series(test_perf_signature)
+    state = PerformanceDetectionState.objects.get(signature=test_perf_signature)
+    assert state.last_datum_id == PerformanceDatum.objects.latest('id').id
+
+
 def test_no_alerts_with_old_data(
     test_repository,
     test_issue_tracker,
@@ -1,4 +1,5 @@
 import os
+import random
 
 import pytest
 
@@ -9,8 +10,10 @@ from treeherder.perfalert.perfalert import (
     calc_t,
     default_weights,
     detect_changes,
+    detection_checkpoint,
     linear_weights,
 )
+from treeherder.perfalert.perfalert.vectorized import detect_changes_vectorized
 
 
 @pytest.mark.parametrize(
@@ -141,3 +144,128 @@ def test_detect_changes_historical_data(filename, expected_timestamps):
     )
     regression_timestamps = [d.push_timestamp for d in results if d.change_detected]
     assert regression_timestamps == expected_timestamps
+
+
+def _assert_same_analysis(series, **kwargs):
+    expected = detect_changes([RevisionDatum(t, t, values) for (t, values) in series], **kwargs)
+    actual = detect_changes_vectorized(
+        [RevisionDatum(t, t, values) for (t, values) in series], **kwargs
+    )
+
+    assert [d.push_timestamp for d in actual] == [d.push_timestamp for d in expected]
+    for (a, e) in zip(actual, expected):
+        # compare reprs so that floats have to match bit for bit
+        assert repr(a.t) == repr(e.t)
+        assert a.change_detected == e.change_detected
+        assert repr(getattr(a, 'historical_stats', None)) == repr(
+            getattr(e, 'historical_stats', None)
+        )
+        assert repr(getattr(a, 'forward_stats', None)) == repr(getattr(e, 'forward_stats', None))
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        'runs1.json',
+        'runs2.json',
+        'runs3.json',
+        'runs4.json',
+        'runs5.json',
+        'a11y.json',
+        'tp5rss.json',
+    ],
+)
+def test_detect_changes_vectorized_historical_data(filename):
+    payload = SampleData.get_perf_data(os.path.join('graphs', filename))
+    _assert_same_analysis([(r[2], [r[3]]) for r in payload['test_runs']])
+
+
+@pytest.mark.parametrize(
+    "windows",
+    [
+        {},
+        {"min_back_window": 5, "max_back_window": 5, "fore_window": 5, "t_threshold": 2},
+        {"min_back_window": 0, "max_back_window": 3, "fore_window": 1, "t_threshold": 1},
+        {"min_back_window": 2, "max_back_window": 40, "fore_window": 20, "t_threshold": 4},
+    ],
+)
+def test_detect_changes_vectorized_random_series(windows):
+    """
+    Tests that both engines agree on noisy series with steps, retriggers
+    (multiple values per revision) and duplicate timestamps
+    """
+    rng = random.Random(42)
+    for _ in range(20):
+        level = rng.uniform(1, 100)
+        series = []
+        for t in range(rng.randint(0, 150)):
+            if rng.random() < 0.05:
+                level *= rng.choice([0.7, 1.4])
+            noise = rng.choice([0, 0.01, 1, 5])
+            values = [level + rng.gauss(0, noise) for _ in range(rng.choice([1, 1, 1, 2, 3, 6]))]
+            series.append((rng.randint(0, t) if rng.random() < 0.1 else t, values))
+        _assert_same_analysis(series, **windows)
+
+
+def test_detect_changes_vectorized_few_revisions_many_values():
+    _assert_same_analysis(
+        [(0, [0] * 50 + [1] * 30), (1, [0] * 10 + [1] * 30), (1, [0] * 10 + [1] * 30)],
+        min_back_window=5,
+        max_back_window=10,
+        fore_window=5,
+        t_threshold=2,
+    )
+
+
+@pytest.mark.parametrize("engine", [detect_changes, detect_changes_vectorized])
+def test_detect_changes_resumed(engine):
+    """
+    Tests that resuming the analysis from a checkpoint gives the
+    same results as analyzing the whole series again
+    """
+    rng = random.Random(7)
+    series = {}
+    level = 10.0
+    checkpoint = None
+    for _ in range(150):
+        if rng.random() < 0.05:
+            level *= rng.choice([0.7, 1.4])
+        # mostly new pushes, sometimes retriggers or late results of recent pushes
+        last = max(series, default=0)
+        t = last + 1 if rng.random() < 0.7 else max(1, last - rng.randint(0, 5))
+        series.setdefault(t, []).append(level + rng.gauss(0, 1))
+
+        analyzed = engine([RevisionDatum(ts, ts, values) for (ts, values) in series.items()])
+        resume_from, last_seen_regression = 0, 0
+        if checkpoint and t > checkpoint[0][-1].push_timestamp:
+            (revisions, resume_from, last_seen_regression) = checkpoint
+            resumed = engine(
+                revisions
+                + [
+                    RevisionDatum(ts, ts, values)
+                    for (ts, values) in series.items()
+                    if ts > revisions[-1].push_timestamp
+                ],
+                resume_from=resume_from,
+                last_seen_regression=last_seen_regression,
+            )
+            offset = len(analyzed) - len(resumed)
+            for (r, a) in zip(resumed[resume_from:], analyzed[resume_from + offset :]):
+                assert r.push_timestamp == a.push_timestamp
+                assert repr(r.t) == repr(a.t)
+                assert r.change_detected == a.change_detected
+                assert r.historical_stats == a.historical_stats
+                assert r.forward_stats == a.forward_stats
+            analyzed = resumed
+
+        (first_needed, resume_from, last_seen_regression, last_stable) = detection_checkpoint(
+            analyzed, resume_from=resume_from, last_seen_regression=last_seen_regression
+        )
+        checkpoint = None
+        if resume_from:
+            revisions = []
+            for d in analyzed[first_needed : last_stable + 1]:
+                revision = RevisionDatum(d.push_timestamp, d.push_id, d.values)
+                revision.t = d.t
+                revisions.append(revision)
+            checkpoint = (revisions, resume_from - first_needed, last_seen_regression)
@@ -0,0 +1,69 @@
+from treeherder.etl.jobs import store_job_data
+from treeherder.model.models import OptionCollection
+from treeherder.push_health.builds import get_build_failures
+from treeherder.push_health.linting import get_lint_failures
+from treeherder.push_health.summary import get_health_summaries
+from treeherder.push_health.tests import (
+    get_histories,
+    get_test_failure_jobs,
+    get_test_failures,
+    get_test_in_progress_count,
+)
+
+
+def test_get_health_summaries(
+    failure_classifications,
+    test_repository,
+    test_job,
+    text_log_error_lines,
+    sample_data,
+    mock_log_parser,
+    django_assert_max_num_queries,
+):
+    test_job.result = 'testfailed'
+    test_job.save()
+    push = test_job.push
+
+    jobs = sample_data.job_data[20:25]
+    for blob in jobs:
+        blob['revision'] = push.revision
+        blob['job'].update(
+            {
+                'result': 'busted',
+                'taskcluster_task_id': 'V3SVuxO8TFy37En_6HcXLs',
+                'taskcluster_retry_id': '0',
+            }
+        )
+    store_job_data(test_repository, jobs)
+    # fill the cache of the failure history day buckets, which takes a query per day
+    get_histories(push.time.date(), OptionCollection.objects.get_option_collection_map())
+
+    with django_assert_max_num_queries(10):
+        summary = get_health_summaries([push], with_in_progress_tests=True)[push.id]
+
+    result_status, jobs = get_test_failure_jobs(push)
+    assert (summary['test_result'], summary['test_failures']) == get_test_failures(
+        push, jobs, result_status
+    )
+    assert summary['test_result'] == 'fail'
+    assert (
+        summary['build_result'],
+        summary['build_failures'],
+        summary['builds_in_progress_count'],
+    ) == get_build_failures(push)
+    assert (
+        summary['lint_result'],
+        summary['lint_failures'],
+        summary['linting_in_progress_count'],
+    ) == get_lint_failures(push)
+    assert summary['test_in_progress_count'] == get_test_in_progress_count(push)
+    assert summary['status'] == push.get_status()
+
+
+def test_get_health_summaries_without_jobs(test_repository, test_push):
+    summary = get_health_summaries([test_push])[test_push.id]
+
+    assert summary['test_result'] == 'none'
+    assert summary['build_result'] == 'none'
+    assert summary['lint_result'] == 'none'
+    assert summary['test_in_progress_count'] == 0
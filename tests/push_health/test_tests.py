@@ -1,7 +1,18 @@
+import datetime
+import json
+
 import pytest
+from django.core.cache import cache
 
 from treeherder.model.models import FailureLine, Job, Repository
-from treeherder.push_health.tests import get_test_failures, get_test_failure_jobs, has_job, has_line
+from treeherder.push_health.tests import (
+    get_day_history_cache_key,
+    get_history,
+    get_test_failures,
+    get_test_failure_jobs,
+    has_job,
+    has_line,
+)
 
 
 @pytest.mark.parametrize(('find_it',), [(True,), (False,)])
@@ -47,3 +58,25 @@ def test_get_test_failures(
     assert result == 'fail'
     assert len(need_investigation) == 1
     assert len(jobs[need_investigation[0]['jobName']]) == 1
+
+
+def test_get_history_sums_day_buckets(db, django_assert_num_queries):
+    push_date = datetime.date(2021, 6, 20)
+    # the history of a push date covers the days from num_days up to 2 days before it
+    for days_before in range(3, 6):
+        day = push_date - datetime.timedelta(days=days_before)
+        cache.set(
+            get_day_history_cache_key(4, day),
+            json.dumps(
+                {
+                    'test.js': {'linux64': {'opt': 1}},
+                    'day-{}.js'.format(days_before): {'osx': {'debug': 1}},
+                }
+            ),
+        )
+
+    with django_assert_num_queries(0):
+        history = get_history(4, push_date, 5, {}, [1])
+
+    assert history['test.js'] == {'linux64': {'opt': 3}}
+    assert sorted(history) == ['day-3.js', 'day-4.js', 'day-5.js', 'test.js']
@@ -4,6 +4,7 @@ from treeherder.push_health.utils import (
     clean_config,
     clean_platform,
     clean_test,
+    clean_test_hit_rate,
     is_valid_failure_line,
 )
 
@@ -58,6 +59,73 @@ def test_clean_test(action, test, signature, message, expected):
     assert expected == clean_test(test, signature, message)
 
 
+# Test names as found in failure lines, with the names clean_test has always turned them into.
+GOLDEN_TEST_NAMES = [
+    (
+        ('dom/media/test/test_playback.html', None, None),
+        'dom/media/test/test_playback.html',
+    ),
+    (
+        (
+            'layout/reftests/bugs/1234.html == layout/reftests/bugs/1234-ref.html',
+            None,
+            None,
+        ),
+        'layout/reftests/bugs/1234.html == layout/reftests/bugs/1234-ref.html',
+    ),
+    (
+        (
+            'file:///builds/worker/build/tests/reftest/tests/layout/reftests/a.html'
+            ' != file:///builds/worker/build/tests/reftest/tests/layout/reftests/a-ref.html',
+            None,
+            None,
+        ),
+        'layout/reftests/a.html != layout/reftests/a-ref.html',
+    ),
+    (
+        ('http://10.0.2.2:8854/tests/dom/tests/mochitest/test_bug1.html', None, None),
+        'dom/tests/mochitest/test_bug1.html',
+    ),
+    (
+        ('http://localhost:50462/1545303666006/4/41276-1.html', None, None),
+        '41276-1.html',
+    ),
+    (
+        ('/webdriver/tests/classic/get_title/get.py', None, None),
+        'webdriver/tests/classic/get_title/get.py',
+    ),
+    (
+        ('jsreftest.html?test=non262/Array/from.js', None, None),
+        'non262/Array/from.js',
+    ),
+    (
+        ('toolkit\\components\\places\\tests\\unit\\test_frecency.js', None, None),
+        'toolkit/components/places/tests/unit/test_frecency.js',
+    ),
+    (
+        (None, 'TEST-UNEXPECTED-FAIL | dom/tests/test_x.html | assertion count 3', None),
+        ' dom/tests/test_x.html | assertion count 3',
+    ),
+    (
+        (None, None, 'test_end for browser/base/content/test/browser_tabs.js'),
+        'browser/base/content/test/browser_tabs.js',
+    ),
+    ((None, None, 'Last test finished'), None),
+    (('pid:1234', None, None), None),
+    ((None, None, None), 'Non-Test Error'),
+]
+
+
+def test_clean_test_golden():
+    clean_test.cache_clear()
+    # the first round fills the cache, the second one is answered from it
+    for _ in range(2):
+        assert [clean_test(*names) for names, _ in GOLDEN_TEST_NAMES] == [
+            expected for _, expected in GOLDEN_TEST_NAMES
+        ]
+    assert clean_test_hit_rate() == 0.5
+
+
 @pytest.mark.parametrize(
     ('config', 'expected'),
     [
@@ -1,8 +1,11 @@
+from unittest.mock import MagicMock
+
 import pytest
 from django.conf import settings
 
 from tests.conftest import IS_WINDOWS
-from treeherder.services.pulse.consumers import Consumers, PulseConsumer
+from treeherder.services.pulse import consumers
+from treeherder.services.pulse.consumers import Consumers, PulseConsumer, TaskMessageBatch
 
 from .utils import create_and_destroy_exchange
 
@@ -47,3 +50,73 @@ def test_PulseConsumer(pulse_connection):
             None,
         )
         cons.prepare()
+
+
+def test_TaskMessageBatch(monkeypatch):
+    batches = []
+    monkeypatch.setattr(
+        consumers.store_pulse_tasks_batch,
+        'apply_async',
+        lambda args, queue: batches.append((args, queue)),
+    )
+    now = [0]
+    monkeypatch.setattr('treeherder.services.pulse.consumers.time.monotonic', lambda: now[0])
+    root_url = "https://firefox-ci-tc.services.mozilla.com"
+    batch = TaskMessageBatch(root_url, size=2, timeout=0.5)
+    messages = [MagicMock() for _ in range(3)]
+
+    batch.add({"id": 0}, "exchange", "key0", messages[0])
+    batch.flush_if_due()
+    assert not batches
+    batch.add({"id": 1}, "exchange", "key1", messages[1])
+    # a full batch is handed over right away
+    assert batches == [
+        (
+            [[[{"id": 0}, "exchange", "key0"], [{"id": 1}, "exchange", "key1"]], root_url],
+            'store_pulse_tasks',
+        )
+    ]
+    assert all(message.ack.called for message in messages[:2])
+
+    now[0] = 1
+    batch.add({"id": 2}, "exchange", "key2", messages[2])
+    now[0] = 1.4
+    batch.flush_if_due()
+    assert len(batches) == 1
+    assert not messages[2].ack.called
+    # while a partial one is handed over once its first message waited long enough
+    now[0] = 1.5
+    batch.flush_if_due()
+    assert batches[1] == ([[[{"id": 2}, "exchange", "key2"]], root_url], 'store_pulse_tasks')
+    assert messages[2].ack.called
+
+
+def test_TaskMessageBatch_failing_ack(monkeypatch):
+    batches = []
+    monkeypatch.setattr(
+        consumers.store_pulse_tasks_batch,
+        'apply_async',
+        lambda args, queue: batches.append((args, queue)),
+    )
+    root_url = "https://firefox-ci-tc.services.mozilla.com"
+    batch = TaskMessageBatch(root_url, size=2, timeout=0)
+    messages = [MagicMock() for _ in range(2)]
+    # the connection of the messages dropped
+    messages[0].ack.side_effect = ConnectionError()
+
+    batch.add({"id": 0}, "exchange", "key0", messages[0])
+    batch.add({"id": 1}, "exchange", "key1", messages[1])
+    assert len(batches) == 1
+    assert messages[1].ack.called
+
+    # the batch isn't handed over again
+    batch.flush_if_due()
+    batch.flush()
+    assert len(batches) == 1
+
+    # and the messages of a lost connection are dropped, to be redelivered
+    batch.size = 3
+    batch.add({"id": 2}, "exchange", "key2", MagicMock())
+    batch.clear()
+    batch.flush()
+    assert len(batches) == 1
@@ -0,0 +1,136 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+import responses
+
+from treeherder.utils.taskcluster import (
+    client_stats,
+    close_sessions,
+    get_async_session,
+    get_session,
+    get_task_definition,
+    run_async,
+    taskcluster_cache,
+    trim_task_definition,
+)
+
+ROOT_URL = 'https://firefox-ci-tc.services.mozilla.com'
+
+
+class TaskHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = json.dumps({'taskGroupId': 'abc'}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def task_server():
+    server = HTTPServer(('127.0.0.1', 0), TaskHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield 'http://127.0.0.1:{}/task/abc'.format(server.server_address[1])
+    close_sessions()
+    server.shutdown()
+    server.server_close()
+
+
+async def _current_session():
+    return get_async_session()
+
+
+def test_async_session_reuses_connections(task_server):
+    counts = client_stats.stats()['counts']
+
+    async def fetch():
+        async with get_async_session().get(task_server) as response:
+            return await response.json()
+
+    assert run_async(fetch()) == {'taskGroupId': 'abc'}
+    session = run_async(_current_session())
+    assert run_async(fetch()) == {'taskGroupId': 'abc'}
+    assert run_async(_current_session()) is session
+
+    stats = client_stats.stats()
+    assert stats['counts']['requests'] == counts.get('requests', 0) + 2
+    assert stats['counts']['connections_created'] == counts.get('connections_created', 0) + 1
+    assert stats['counts']['connections_reused'] == counts.get('connections_reused', 0) + 1
+    assert sum(stats['latencies'].values()) >= 2
+
+
+@responses.activate
+def test_get_task_definition_shares_session():
+    requests = client_stats.stats()['counts'].get('requests', 0)
+    for task_id in ('abc', 'def'):
+        task_url = '{}/api/queue/v1/task/{}'.format(ROOT_URL, task_id)
+        responses.add(responses.GET, task_url, json={'taskGroupId': 'abc'}, status=200)
+
+    session = get_session()
+    assert get_task_definition(ROOT_URL, 'abc')['taskGroupId'] == 'abc'
+    assert get_task_definition(ROOT_URL, 'def')['taskGroupId'] == 'abc'
+    assert get_session() is session
+    assert client_stats.stats()['counts']['requests'] == requests + 2
+
+
+def test_latency_buckets():
+    assert client_stats.bucket(0.01) == '50ms'
+    assert client_stats.bucket(0.1) == '100ms'
+    assert client_stats.bucket(0.3) == '500ms'
+    assert client_stats.bucket(60) == 'more'
+
+
+@responses.activate
+def test_get_task_definition_is_cached():
+    task_url = '{}/api/queue/v1/task/abc'.format(ROOT_URL)
+    responses.add(responses.GET, task_url, json={'taskGroupId': 'abc'}, status=200)
+
+    task = get_task_definition(ROOT_URL, 'abc')
+    assert task['taskGroupId'] == 'abc'
+    assert get_task_definition(ROOT_URL, 'abc') == task
+    assert len(responses.calls) == 1
+
+    # another worker process gets it from the shared cache
+    taskcluster_cache.clear()
+    assert get_task_definition(ROOT_URL, 'abc') == task
+    assert len(responses.calls) == 1
+
+
+def test_taskcluster_cache_expires():
+    taskcluster_cache.set('key', ['artifact'], 60)
+    assert taskcluster_cache.get('key') == ['artifact']
+    taskcluster_cache.set('key', ['artifact'], -1)
+    assert taskcluster_cache.get('key') is None
+
+
+def test_trim_task_definition():
+    task = {
+        'taskGroupId': 'abc',
+        'routes': ['tc-treeherder.v2.autoland.abc'],
+        'metadata': {'name': 'test', 'owner': 'me', 'description': '', 'source': 'x'},
+        'payload': {
+            'command': ['run'] * 1000,
+            'env': {'MOBILE_HEAD_REF': 'main', 'MOZ_SCM_LEVEL': '3'},
+        },
+        'extra': {'treeherder': {'symbol': 'T'}, 'chunks': {'current': 1}},
+        'dependencies': ['def'] * 1000,
+    }
+
+    assert trim_task_definition(task) == {
+        'taskGroupId': 'abc',
+        'routes': ['tc-treeherder.v2.autoland.abc'],
+        'metadata': {'name': 'test', 'owner': 'me', 'description': '', 'source': 'x'},
+        'payload': {'env': {'MOBILE_HEAD_REF': 'main'}},
+        'extra': {'treeherder': {'symbol': 'T'}},
+    }
+    # tasks which aren't meant for treeherder are still recognized as such
+    assert 'extra' not in trim_task_definition({'taskGroupId': 'abc', 'extra': {}})
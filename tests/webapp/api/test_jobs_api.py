@@ -5,7 +5,7 @@ from dateutil import parser
 from django.urls import reverse
 from rest_framework.status import HTTP_400_BAD_REQUEST
 
-from treeherder.model.models import Job, TextLogError
+from treeherder.model.models import BugJobMap, Job, JobChange, JobNote, TextLogError
 
 
 @pytest.mark.parametrize(
@@ -72,6 +72,75 @@ def test_job_list(client, eleven_jobs_stored, test_repository, offset, count, ex
         assert set(job.keys()) == set(exp_keys)
 
 
+def test_job_list_columns(client, eleven_jobs_stored, test_repository):
+    """
+    test that the columnar encoding of the jobs-list endpoint has the
+    same jobs as the dict one
+    """
+    url = reverse("jobs-list", kwargs={"project": test_repository.name})
+    jobs = client.get(url + '?count=11').json()["results"]
+    columns = client.get(url + '?count=11&return_type=columns').json()["results"]
+
+    assert set(columns.keys()) == set(jobs[0].keys())
+    # repeated values are dictionary encoded
+    assert columns['job_type_name'].keys() == {'values', 'indexes'}
+    assert len(columns['result']['values']) < len(jobs)
+
+    decoded_columns = {
+        name: (
+            [column['values'][i] for i in column['indexes']] if isinstance(column, dict) else column
+        )
+        for (name, column) in columns.items()
+    }
+    assert [
+        {name: decoded_columns[name][i] for name in decoded_columns} for i in range(len(jobs))
+    ] == jobs
+
+
+def test_job_list_cursor_pagination(client, eleven_jobs_stored, test_repository):
+    """
+    test paging through the jobs of the jobs-list endpoint with cursors
+    """
+    url = reverse("jobs-list", kwargs={"project": test_repository.name})
+    url += '?pagination=cursor&count=4'
+
+    job_ids = []
+    page_sizes = []
+    while url:
+        resp = client.get(url)
+        assert resp.status_code == 200
+        response_dict = resp.json()
+        assert 'offset' not in response_dict['meta']
+        page_sizes.append(len(response_dict['results']))
+        job_ids.extend(job['id'] for job in response_dict['results'])
+        url = response_dict['meta']['next']
+
+    assert page_sizes == [4, 4, 3]
+    assert job_ids == sorted(Job.objects.values_list('id', flat=True))
+
+
+def test_jobs_cursor_pagination(client, eleven_jobs_stored, test_repository):
+    """
+    test paging through the jobs of the /jobs/ endpoint with cursors
+    """
+    push_id = Job.objects.first().push_id
+    url = '/api/jobs/?pagination=cursor&count=2&push_id={}'.format(push_id)
+
+    job_ids = []
+    while url:
+        resp = client.get(url)
+        assert resp.status_code == 200
+        response_dict = resp.json()
+        assert 'count' not in response_dict
+        id_index = response_dict['job_property_names'].index('id')
+        job_ids.extend(job[id_index] for job in response_dict['results'])
+        url = response_dict['next']
+
+    assert job_ids == list(
+        Job.objects.filter(push_id=push_id).order_by('id').values_list('id', flat=True)
+    )
+
+
 def test_job_list_bad_project(client, transactional_db):
     """
     test retrieving a job list with a bad project throws 404.
@@ -166,6 +235,94 @@ def test_job_list_in_filter(client, eleven_jobs_stored, test_repository):
     assert len(resp.json()['results']) == 2
 
 
+def test_job_changes(client, eleven_jobs_stored, test_repository, test_user, settings):
+    """
+    test following the job change feed
+    """
+    settings.JOB_CHANGES_FEED_LAG = 0
+    url = reverse("jobs-changes", kwargs={"project": test_repository.name})
+
+    # without a cursor, the feed starts from the latest change
+    resp = client.get(url)
+    assert resp.status_code == 200
+    cursor = resp.json()["cursor"]
+    assert resp.json()["results"] == []
+
+    job = Job.objects.get(id=1)
+    JobNote.objects.create(job=job, failure_classification_id=2, user=test_user, text="")
+    BugJobMap.create(job_id=job.id, bug_id=12345)
+
+    resp = client.get(url + '?cursor={}'.format(cursor))
+    assert resp.status_code == 200
+    response_dict = resp.json()
+    # both changes of the job are merged
+    assert response_dict["results"] == [[job.id, job.state, job.result, 2]]
+    assert response_dict["cursor"] > cursor
+    assert not response_dict["more"]
+
+    resp = client.get(url + '?cursor={}'.format(response_dict["cursor"]))
+    assert resp.json()["results"] == []
+    assert resp.json()["cursor"] == response_dict["cursor"]
+
+
+def test_job_changes_paging(client, eleven_jobs_stored, test_repository, settings):
+    """
+    test fetching the changes of the job change feed in pages
+    """
+    settings.JOB_CHANGES_FEED_LAG = 0
+    url = reverse("jobs-changes", kwargs={"project": test_repository.name})
+
+    job_ids = set()
+    cursor = 0
+    more = True
+    while more:
+        resp = client.get(url + '?cursor={}&count=4'.format(cursor))
+        assert resp.status_code == 200
+        response_dict = resp.json()
+        job_ids.update(job[0] for job in response_dict["results"])
+        cursor = response_dict["cursor"]
+        more = response_dict["more"]
+
+    assert job_ids == set(Job.objects.values_list('id', flat=True))
+
+
+def test_job_changes_wait_for_earlier_ids(client, eleven_jobs_stored, test_repository):
+    """
+    test the job change feed doesn't skip a change committed after one with a higher id
+    """
+    url = reverse("jobs-changes", kwargs={"project": test_repository.name})
+    old = datetime.datetime.now() - datetime.timedelta(hours=1)
+    JobChange.objects.update(created=old)
+    cursor = client.get(url).json()["cursor"]
+    assert cursor == JobChange.objects.order_by('id').last().id
+    jobs = list(Job.objects.order_by('id')[:2])
+
+    def record_change(change_id, job):
+        return JobChange.objects.create(
+            id=change_id,
+            repository=test_repository,
+            job=job,
+            state=job.state,
+            result=job.result,
+            failure_classification_id=job.failure_classification_id,
+        )
+
+    # the change with the id before it hasn't been committed yet
+    record_change(cursor + 2, jobs[1])
+    response_dict = client.get(url + '?cursor={}'.format(cursor)).json()
+    assert response_dict["results"] == []
+    assert response_dict["cursor"] == cursor
+    assert not response_dict["more"]
+
+    record_change(cursor + 1, jobs[0])
+    assert client.get(url + '?cursor={}'.format(cursor)).json()["results"] == []
+
+    JobChange.objects.filter(id__gt=cursor).update(created=old)
+    response_dict = client.get(url + '?cursor={}'.format(cursor)).json()
+    assert [job[0] for job in response_dict["results"]] == [jobs[0].id, jobs[1].id]
+    assert response_dict["cursor"] == cursor + 2
+
+
 def test_job_detail(client, test_job):
     """
     test retrieving a single job from the jobs-detail
@@ -1,4 +1,6 @@
 import copy
+import json
+import time
 import pytest
 import datetime
 from django.urls import reverse
@@ -265,6 +267,35 @@ def test_filter_data_by_no_retriggers(
     assert signature_for_retrigger_data.id not in set(datum['signature_id'] for datum in datums)
 
 
+def test_performance_data_columns(client, test_repository, test_perf_signature, test_perf_data):
+    url = reverse('performance-data-list', kwargs={"project": test_repository.name})
+    url += '?signature_id={}'.format(test_perf_signature.id)
+
+    datums = client.get(url).json()[test_perf_signature.signature_hash]
+    resp = client.get(url + '&return_type=columns')
+    assert resp.status_code == 200
+    columns = resp.json()[test_perf_signature.signature_hash]
+
+    revision = columns.pop('revision')
+    assert [revision['values'][index] for index in revision['indexes']] == [
+        datum['revision'] for datum in datums
+    ]
+    assert len(revision['values']) == len(set(datum['revision'] for datum in datums))
+    for name, column in columns.items():
+        assert column == [datum[name] for datum in datums]
+    assert sorted(columns['push_timestamp']) == sorted(
+        int(time.mktime(datum.push_timestamp.timetuple())) for datum in test_perf_data
+    )
+
+
+def test_performance_data_bad_return_type(client, test_repository, test_perf_signature):
+    resp = client.get(
+        reverse('performance-data-list', kwargs={"project": test_repository.name})
+        + '?signature_id={}&return_type=xml'.format(test_perf_signature.id)
+    )
+    assert resp.status_code == 400
+
+
 def test_filter_data_by_framework(
     client,
     test_repository,
@@ -583,6 +614,71 @@ def test_no_retriggers_perf_summary(
     assert len(content[0]['data']) == 1
 
 
+@pytest.mark.parametrize('no_retriggers', [False, True])
+def test_stream_perf_summary(
+    client, push_stored, test_perf_signature, test_perf_data, no_retriggers
+):
+    push = Push.objects.get(id=1)
+    PerformanceDatum.objects.create(
+        repository=test_perf_signature.repository,
+        push=push,
+        signature=test_perf_signature,
+        value=0.0,
+        push_timestamp=push.time,
+    )
+    query_params = '?repository={}&framework={}&revision={}&all_data=true&signature={}&no_retriggers={}'.format(
+        test_perf_signature.repository.name,
+        test_perf_signature.framework_id,
+        push.revision,
+        test_perf_signature.id,
+        no_retriggers,
+    )
+
+    response = client.get(reverse('performance-summary') + query_params)
+    assert response.status_code == 200
+    streamed_response = client.get(reverse('performance-summary') + query_params + '&stream=true')
+    assert streamed_response.status_code == 200
+    assert streamed_response.streaming
+
+    content = json.loads(b''.join(streamed_response.streaming_content))
+    assert content == response.json()
+    assert len(content[0]['data']) > 0
+
+
+def test_perf_summary_of_many_signatures(
+    client, test_perf_signature, test_perf_signature_2, test_perf_data
+):
+    for datum in test_perf_data[:2]:
+        PerformanceDatum.objects.create(
+            repository=datum.repository,
+            push=datum.push,
+            job=datum.job,
+            signature=test_perf_signature_2,
+            value=20,
+            push_timestamp=datum.push_timestamp,
+        )
+    query_params = '?repository={}&startday=2013-11-01T23%3A28%3A29&endday=2013-11-30T23%3A28%3A29&all_data=true&signatures={},{}'.format(
+        test_perf_signature.repository.name, test_perf_signature.id, test_perf_signature_2.id
+    )
+
+    response = client.get(reverse('performance-summary') + query_params)
+    assert response.status_code == 200
+    data = {summary['signature_id']: summary['data'] for summary in response.json()}
+    assert sorted(datum['id'] for datum in data[test_perf_signature.id]) == [
+        datum.id for datum in test_perf_data
+    ]
+    assert [datum['value'] for datum in data[test_perf_signature_2.id]] == [20, 20]
+
+
+def test_perf_summary_bad_signatures(client, test_perf_signature):
+    query_params = '?repository={}&interval=172800&all_data=true&signatures={},abc'.format(
+        test_perf_signature.repository.name, test_perf_signature.id
+    )
+
+    response = client.get(reverse('performance-summary') + query_params)
+    assert response.status_code == 400
+
+
 def test_filter_out_retriggers():
     input_data = [
         {
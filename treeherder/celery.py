@@ -1,6 +1,8 @@
+import logging
 import os
 
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 
 # set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'treeherder.config.settings')
@@ -15,3 +17,26 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 
 # Load task modules from all registered Django app configs.
 app.autodiscover_tasks()
+
+
+@worker_process_init.connect
+def preload_reference_data(**kwargs):
+    from django.conf import settings
+
+    if not settings.REFERENCE_DATA_CACHE_PRELOAD:
+        return
+
+    from treeherder.etl.reference_data import reference_data_cache
+
+    try:
+        reference_data_cache.preload()
+    except Exception:
+        # the cache fills up on its own as well
+        logging.getLogger(__name__).exception("Failed to preload the reference data")
+
+
+@worker_process_shutdown.connect
+def close_taskcluster_sessions(**kwargs):
+    from treeherder.utils.taskcluster import close_sessions
+
+    close_sessions()
@@ -439,9 +439,48 @@ BZ_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
 # For intermittents commenter
 COMMENTER_API_KEY = env("BUG_COMMENTER_API_KEY", default=None)
 
+# Bug suggestions
+# Seconds for which (each worker process) reuses the bugs found for a search term
+BUG_SUGGESTION_SEARCH_CACHE_TIMEOUT = env.int('BUG_SUGGESTION_SEARCH_CACHE_TIMEOUT', default=300)
+# Maximum amount of search terms of which the bugs found are kept around
+BUG_SUGGESTION_SEARCH_CACHE_SIZE = env.int('BUG_SUGGESTION_SEARCH_CACHE_SIZE', default=10000)
+
+# Job ingestion
+# Maximum amount of reference data rows (platforms, job types, ...) each worker process keeps around
+REFERENCE_DATA_CACHE_SIZE = env.int('REFERENCE_DATA_CACHE_SIZE', default=50000)
+# Load the small reference data tables into that cache when a worker process starts
+REFERENCE_DATA_CACHE_PRELOAD = env.bool('REFERENCE_DATA_CACHE_PRELOAD', default=True)
+# Maximum amount of task messages the pulse listener hands over to a single
+# store_pulse_tasks_batch task; 1 hands over every message on its own
+PULSE_TASKS_BATCH_SIZE = env.int('PULSE_TASKS_BATCH_SIZE', default=1)
+# Milliseconds after which a batch of task messages is handed over, even if it isn't full
+PULSE_TASKS_BATCH_TIMEOUT = env.int('PULSE_TASKS_BATCH_TIMEOUT', default=500)
+# Maximum amount of (keep-alive) connections each worker process opens to Taskcluster,
+# in total & per host
+TASKCLUSTER_CLIENT_CONNECTIONS = env.int('TASKCLUSTER_CLIENT_CONNECTIONS', default=100)
+TASKCLUSTER_CLIENT_CONNECTIONS_PER_HOST = env.int(
+    'TASKCLUSTER_CLIENT_CONNECTIONS_PER_HOST', default=20
+)
+# Seconds for which an idle connection to Taskcluster is kept open
+TASKCLUSTER_CLIENT_KEEPALIVE = env.int('TASKCLUSTER_CLIENT_KEEPALIVE', default=60)
+# Seconds for which the definitions of tasks & the artifact lists of their runs are
+# cached, to be shared by the messages of all the states of a task
+TASKCLUSTER_TASK_CACHE_TIMEOUT = env.int('TASKCLUSTER_TASK_CACHE_TIMEOUT', default=10800)
+TASKCLUSTER_ARTIFACTS_CACHE_TIMEOUT = env.int('TASKCLUSTER_ARTIFACTS_CACHE_TIMEOUT', default=3600)
+# Maximum amount of those each worker process keeps around, in front of the shared cache
+TASKCLUSTER_CACHE_SIZE = env.int('TASKCLUSTER_CACHE_SIZE', default=1000)
+# Seconds after which the job change feed returns a change, by which time all
+# the changes recorded before it are expected to be committed; changes taking
+# longer than that to commit may be missed by the feed
+JOB_CHANGES_FEED_LAG = env.int('JOB_CHANGES_FEED_LAG', default=30)
+
 # Log Parsing
 MAX_ERROR_LINES = 100
 FAILURE_LINES_CUTOFF = 35
+# Only decode & parse the log lines containing markers the parsers look for
+LOG_PARSER_CHUNKED_SCAN = env.bool('LOG_PARSER_CHUNKED_SCAN', default=False)
+# Maximum amount of a job's logs to download & parse concurrently
+LOG_PARSER_FETCH_WORKERS = env.int('LOG_PARSER_FETCH_WORKERS', default=4)
 
 # Perfherder
 # Default minimum regression threshold for perfherder is 2% (otherwise
@@ -452,6 +491,15 @@ PERFHERDER_REGRESSION_THRESHOLD = 2
 PERFHERDER_ALERTS_MIN_BACK_WINDOW = 12
 PERFHERDER_ALERTS_MAX_BACK_WINDOW = 24
 PERFHERDER_ALERTS_FORE_WINDOW = 12
+# Implementation of the above algorithm: 'python' (reference) or 'numpy' (vectorized)
+PERFHERDER_ALERTS_DETECTION_ENGINE = env('PERFHERDER_ALERTS_DETECTION_ENGINE', default='python')
+# Only analyze the data which came in since the previous alert generation of a signature
+PERFHERDER_ALERTS_INCREMENTAL_DETECTION = env.bool(
+    'PERFHERDER_ALERTS_INCREMENTAL_DETECTION', default=False
+)
+# Collapse the alert generation requests of a signature arriving within this
+# many seconds into a single (batched) run; 0 generates alerts for every request
+PERFHERDER_ALERTS_COALESCING_WINDOW = env.int('PERFHERDER_ALERTS_COALESCING_WINDOW', default=0)
 # Assess if tests should be (non)sheriffed
 QUANTIFYING_PERIOD = timedelta(weeks=24)  # how far back to look over Bugzilla data
 BUG_COOLDOWN_TIME = timedelta(weeks=2)  # time after bug is ready for assessment
@@ -1,5 +1,6 @@
 import logging
 import uuid
+from collections import defaultdict
 
 import jsonschema
 import newrelic.agent
@@ -59,29 +60,79 @@ class JobLoader:
 
     def process_job(self, pulse_job, root_url):
         if self._is_valid_job(pulse_job):
+            newrelic.agent.add_custom_parameter("project", pulse_job["origin"]["project"])
             try:
-                project = pulse_job["origin"]["project"]
-                newrelic.agent.add_custom_parameter("project", project)
-
-                repository = Repository.objects.get(name=project)
-                if repository.active_status != 'active':
-                    (real_task_id, _) = task_and_retry_ids(pulse_job["taskId"])
-                    logger.debug(
-                        "Task %s belongs to a repository that is not active.", real_task_id
-                    )
-                    return
-
-                if pulse_job["state"] != "unscheduled":
-                    try:
-                        self.validate_revision(repository, pulse_job)
-                        transformed_job = self.transform(pulse_job)
-                        store_job_data(repository, [transformed_job])
-                        # Returning the transformed_job is only for testing purposes
-                        return transformed_job
-                    except AttributeError:
-                        logger.warning("Skipping job due to bad attribute", exc_info=1)
-            except Repository.DoesNotExist:
-                logger.info("Job with unsupported project: %s", project)
+                prepared = self._prepare_job(pulse_job, {})
+                if prepared:
+                    repository, transformed_job = prepared
+                    store_job_data(repository, [transformed_job])
+                    # Returning the transformed_job is only for testing purposes
+                    return transformed_job
+            except AttributeError:
+                logger.warning("Skipping job due to bad attribute", exc_info=1)
+
+    def process_jobs(self, pulse_jobs, root_url):
+        """
+        Validate, transform & store many pulse jobs at once, with a single
+        ``store_job_data`` call per repository.
+
+        Rather than raising, returns the pulse jobs which failed to be stored,
+        e.g. because their push is missing, so they can be retried on their own.
+        """
+        repositories = {}
+        jobs_by_repository = defaultdict(list)
+        failed_jobs = []
+        for pulse_job in pulse_jobs:
+            if not self._is_valid_job(pulse_job):
+                continue
+            try:
+                prepared = self._prepare_job(pulse_job, repositories)
+            except AttributeError:
+                logger.warning("Skipping job due to bad attribute", exc_info=1)
+                continue
+            except Exception as e:
+                logger.info("Failed to prepare job %s: %r", pulse_job["taskId"], e)
+                failed_jobs.append(pulse_job)
+                continue
+            if prepared:
+                repository, transformed_job = prepared
+                jobs_by_repository[repository].append((pulse_job, transformed_job))
+
+        for repository, jobs in jobs_by_repository.items():
+            try:
+                store_job_data(repository, [transformed_job for _, transformed_job in jobs])
+            except AttributeError:
+                logger.warning("Skipping jobs due to bad attribute", exc_info=1)
+            except Exception:
+                logger.warning("Failed to store %s jobs of %s", len(jobs), repository, exc_info=1)
+                failed_jobs.extend(pulse_job for pulse_job, _ in jobs)
+
+        return failed_jobs
+
+    def _prepare_job(self, pulse_job, repositories):
+        """
+        Transform a valid pulse job, returning it along with its repository,
+        or ``None`` if it isn't meant to be stored.
+
+        ``repositories`` caches the repositories by project.
+        """
+        project = pulse_job["origin"]["project"]
+        try:
+            if project not in repositories:
+                repositories[project] = Repository.objects.get(name=project)
+            repository = repositories[project]
+        except Repository.DoesNotExist:
+            logger.info("Job with unsupported project: %s", project)
+            return
+
+        if repository.active_status != 'active':
+            (real_task_id, _) = task_and_retry_ids(pulse_job["taskId"])
+            logger.debug("Task %s belongs to a repository that is not active.", real_task_id)
+            return
+
+        if pulse_job["state"] != "unscheduled":
+            self.validate_revision(repository, pulse_job)
+            return repository, self.transform(pulse_job)
 
     def validate_revision(self, repository, pulse_job):
         revision = pulse_job["origin"].get("revision")
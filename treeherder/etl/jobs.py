@@ -7,13 +7,16 @@ from hashlib import sha1
 
 import newrelic.agent
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
 from django.db.utils import IntegrityError
 
 from treeherder.etl.common import get_guid_root
+from treeherder.etl.reference_data import reference_data_cache
 from treeherder.model.models import (
     BuildPlatform,
     FailureClassification,
     Job,
+    JobChange,
     JobGroup,
     JobLog,
     JobType,
@@ -29,6 +32,30 @@ from treeherder.model.models import (
 
 logger = logging.getLogger(__name__)
 
+# The fields of a job updated whenever a new state of it comes in
+JOB_UPDATE_FIELDS = (
+    'guid',
+    'signature',
+    'build_platform',
+    'machine_platform',
+    'machine',
+    'option_collection_hash',
+    'job_type',
+    'job_group',
+    'product',
+    'result',
+    'state',
+    'tier',
+    'submit_time',
+    'start_time',
+    'end_time',
+    'push_id',
+)
+# The fields of an existing job needed to load a new state of it
+JOB_CHANGE_FIELDS = ('guid', 'repository', 'push', 'state', 'result', 'failure_classification')
+# Maximum amount of jobs updated by a single query
+JOB_BULK_UPDATE_SIZE = 100
+
 
 def _get_number(s):
     try:
@@ -46,6 +73,10 @@ def _remove_existing_jobs(data):
        are in ``data``.
     3. build a new list of jobs in ``new_data`` that are not already in
        the db and pass that back.  It could end up empty at that point.
+
+    Several states of the same job in ``data`` are checked against each
+    other in order as well, so a batch of pulse messages received out of order
+    can't transition a completed job back to running.
     """
     new_data = []
 
@@ -57,9 +88,7 @@ def _remove_existing_jobs(data):
 
     for datum in data:
         job = datum['job']
-        if not state_map.get(job['job_guid']):
-            new_data.append(datum)
-        else:
+        if state_map.get(job['job_guid']):
             # should not transition from running to pending,
             # or completed to any other state
             current_state = state_map[job['job_guid']]
@@ -67,29 +96,29 @@ def _remove_existing_jobs(data):
                 job['state'] == 'pending' and current_state == 'running'
             ):
                 continue
-            new_data.append(datum)
+        new_data.append(datum)
+        # a retry takes over the job of its guid root, see _load_job
+        state_map.pop(get_guid_root(job['job_guid']), None)
+        state_map[job['job_guid']] = job.get('state')
 
     return new_data
 
 
-def _load_job(repository, job_datum, push_id):
+def _get_job_fields(repository, job_datum, push_id):
     """
-    Load a job into the treeherder database
-
-    If the job is a ``retry`` the ``job_guid`` will have a special
-    suffix on it.  But the matching ``pending``/``running`` job will not.
-    So we append the suffixed ``job_guid`` to ``retry_job_guids``
-    so that we can update the job_id_lookup later with the non-suffixed
-    ``job_guid`` (root ``job_guid``). Then we can find the right
-    ``pending``/``running`` job and update it with this ``retry`` job.
+    Resolve the reference data of a job, returning the values of the fields of
+    its ``Job``.  Only those in ``JOB_UPDATE_FIELDS`` are meant to be updated
+    once the job exists.
     """
-    build_platform, _ = BuildPlatform.objects.get_or_create(
+    build_platform = reference_data_cache.get_or_create(
+        BuildPlatform,
         os_name=job_datum.get('build_platform', {}).get('os_name', 'unknown'),
         platform=job_datum.get('build_platform', {}).get('platform', 'unknown'),
         architecture=job_datum.get('build_platform', {}).get('architecture', 'unknown'),
     )
 
-    machine_platform, _ = MachinePlatform.objects.get_or_create(
+    machine_platform = reference_data_cache.get_or_create(
+        MachinePlatform,
         os_name=job_datum.get('machine_platform', {}).get('os_name', 'unknown'),
         platform=job_datum.get('machine_platform', {}).get('platform', 'unknown'),
         architecture=job_datum.get('machine_platform', {}).get('architecture', 'unknown'),
@@ -97,7 +126,7 @@ def _load_job(repository, job_datum, push_id):
 
     option_names = job_datum.get('option_collection', [])
     option_collection_hash = OptionCollection.calculate_hash(option_names)
-    if not OptionCollection.objects.filter(option_collection_hash=option_collection_hash).exists():
+    if not reference_data_cache.option_collection_exists(option_collection_hash):
         # in the unlikely event that we haven't seen this set of options
         # before, add the appropriate database rows
         options = []
@@ -109,13 +138,16 @@ def _load_job(repository, job_datum, push_id):
                 option_collection_hash=option_collection_hash, option=option
             )
 
-    machine, _ = Machine.objects.get_or_create(name=job_datum.get('machine', 'unknown'))
+    machine = reference_data_cache.get_or_create(Machine, name=job_datum.get('machine', 'unknown'))
 
-    job_type, _ = JobType.objects.get_or_create(
-        symbol=job_datum.get('job_symbol') or 'unknown', name=job_datum.get('name') or 'unknown'
+    job_type = reference_data_cache.get_or_create(
+        JobType,
+        symbol=job_datum.get('job_symbol') or 'unknown',
+        name=job_datum.get('name') or 'unknown',
     )
 
-    job_group, _ = JobGroup.objects.get_or_create(
+    job_group = reference_data_cache.get_or_create(
+        JobGroup,
         name=job_datum.get('group_name') or 'unknown',
         symbol=job_datum.get('group_symbol') or 'unknown',
     )
@@ -123,7 +155,7 @@ def _load_job(repository, job_datum, push_id):
     product_name = job_datum.get('product_name', 'unknown')
     if not product_name.strip():
         product_name = 'unknown'
-    product, _ = Product.objects.get_or_create(name=product_name)
+    product = reference_data_cache.get_or_create(Product, name=product_name)
 
     job_guid = job_datum['job_guid']
     job_guid = job_guid[0:50]
@@ -141,7 +173,9 @@ def _load_job(repository, job_datum, push_id):
 
     reference_data_name = job_datum.get('reference_data_name', None)
 
-    default_failure_classification = FailureClassification.objects.get(name='not classified')
+    default_failure_classification = reference_data_cache.get(
+        FailureClassification, name='not classified'
+    )
 
     sh = sha1()
     sh.update(
@@ -174,7 +208,8 @@ def _load_job(repository, job_datum, push_id):
     if not reference_data_name:
         reference_data_name = signature_hash
 
-    signature, _ = ReferenceDataSignatures.objects.get_or_create(
+    signature = reference_data_cache.get_or_create(
+        ReferenceDataSignatures,
         name=reference_data_name,
         signature=signature_hash,
         build_system_type=build_system_type,
@@ -203,39 +238,80 @@ def _load_job(repository, job_datum, push_id):
     start_time = datetime.fromtimestamp(_get_number(job_datum.get('start_timestamp')))
     end_time = datetime.fromtimestamp(_get_number(job_datum.get('end_timestamp')))
 
+    return {
+        "guid": job_guid,
+        "repository": repository,
+        "signature": signature,
+        "build_platform": build_platform,
+        "machine_platform": machine_platform,
+        "machine": machine,
+        "option_collection_hash": option_collection_hash,
+        "job_type": job_type,
+        "job_group": job_group,
+        "product": product,
+        "failure_classification": default_failure_classification,
+        "who": who,
+        "reason": reason,
+        "result": result,
+        "state": state,
+        "tier": tier,
+        "submit_time": submit_time,
+        "start_time": start_time,
+        "end_time": end_time,
+        "push_id": push_id,
+    }
+
+
+def _get_job_log_fields(job_datum):
+    """Returns the ``(name, url, status)`` of each of the logs of a job."""
+    parse_status_map = dict([(k, v) for (v, k) in JobLog.STATUSES])
+    log_fields = []
+    for log in job_datum.get('log_references', []):
+        name = log.get('name') or 'unknown'
+        name = name[0:50]
+
+        url = log.get('url') or 'unknown'
+        url = url[0:255]
+
+        mapped_status = parse_status_map.get(log.get('parse_status'))
+        if mapped_status:
+            parse_status = mapped_status
+        else:
+            parse_status = JobLog.PENDING
+
+        log_fields.append((name, url, parse_status))
+    return log_fields
+
+
+def _load_job(repository, job_datum, push_id):
+    """
+    Load a job into the treeherder database
+
+    If the job is a ``retry`` the ``job_guid`` will have a special
+    suffix on it.  But the matching ``pending``/``running`` job will not.
+    So we append the suffixed ``job_guid`` to ``retry_job_guids``
+    so that we can update the job_id_lookup later with the non-suffixed
+    ``job_guid`` (root ``job_guid``). Then we can find the right
+    ``pending``/``running`` job and update it with this ``retry`` job.
+    """
+    fields = _get_job_fields(repository, job_datum, push_id)
+    job_guid = fields['guid']
+    state = fields['state']
+    result = fields['result']
+
     # first, try to create the job with the given guid (if it doesn't
     # exist yet)
     job_guid_root = get_guid_root(job_guid)
+    job_created = False
     if not Job.objects.filter(guid__in=[job_guid, job_guid_root]).exists():
         # This could theoretically already have been created by another process
         # that is running updates simultaneously.  So just attempt to create
         # it, but allow it to skip if it's the same guid.  The odds are
         # extremely high that this is a pending and running job that came in
         # quick succession and are being processed by two different workers.
-        Job.objects.get_or_create(
-            guid=job_guid,
-            defaults={
-                "repository": repository,
-                "signature": signature,
-                "build_platform": build_platform,
-                "machine_platform": machine_platform,
-                "machine": machine,
-                "option_collection_hash": option_collection_hash,
-                "job_type": job_type,
-                "job_group": job_group,
-                "product": product,
-                "failure_classification": default_failure_classification,
-                "who": who,
-                "reason": reason,
-                "result": result,
-                "state": state,
-                "tier": tier,
-                "submit_time": submit_time,
-                "start_time": start_time,
-                "end_time": end_time,
-                "last_modified": datetime.now(),
-                "push_id": push_id,
-            },
+        defaults = {field: value for field, value in fields.items() if field != 'guid'}
+        _, job_created = Job.objects.get_or_create(
+            guid=job_guid, defaults=dict(defaults, last_modified=datetime.now())
         )
     # Can't just use the ``job`` we would get from the ``get_or_create``
     # because we need to try the job_guid_root instance first for update,
@@ -258,42 +334,18 @@ def _load_job(repository, job_datum, push_id):
 
     # Update job with any data that would have changed
     Job.objects.filter(id=job.id).update(
-        guid=job_guid,
-        signature=signature,
-        build_platform=build_platform,
-        machine_platform=machine_platform,
-        machine=machine,
-        option_collection_hash=option_collection_hash,
-        job_type=job_type,
-        job_group=job_group,
-        product=product,
-        result=result,
-        state=state,
-        tier=tier,
-        submit_time=submit_time,
-        start_time=start_time,
-        end_time=end_time,
-        last_modified=datetime.now(),
-        push_id=push_id,
+        last_modified=datetime.now(), **{field: fields[field] for field in JOB_UPDATE_FIELDS}
     )
+    Push.invalidate_statuses([push_id, job.push_id])
+    if job_created or (job.state, job.result) != (state, result):
+        job.state = state
+        job.result = result
+        JobChange.record([job])
 
-    log_refs = job_datum.get('log_references', [])
+    log_fields = _get_job_log_fields(job_datum)
     job_logs = []
-    if log_refs:
-        for log in log_refs:
-            name = log.get('name') or 'unknown'
-            name = name[0:50]
-
-            url = log.get('url') or 'unknown'
-            url = url[0:255]
-
-            parse_status_map = dict([(k, v) for (v, k) in JobLog.STATUSES])
-            mapped_status = parse_status_map.get(log.get('parse_status'))
-            if mapped_status:
-                parse_status = mapped_status
-            else:
-                parse_status = JobLog.PENDING
-
+    if log_fields:
+        for name, url, parse_status in log_fields:
             jl, _ = JobLog.objects.get_or_create(
                 job=job, name=name, url=url, defaults={'status': parse_status}
             )
@@ -305,6 +357,135 @@ def _load_job(repository, job_datum, push_id):
     return job_guid
 
 
+def _load_jobs(repository, jobs_fields):
+    """
+    Load many jobs into the treeherder database at once, the set-based
+    equivalent of calling ``_load_job`` for each of them.
+
+    ``jobs_fields`` holds the datum of each job along with the values returned
+    by ``_get_job_fields`` for it.  No two of the jobs may share a guid or guid
+    root, as the updates of the same job have to be applied in order.
+    """
+    now = datetime.now()
+    guids = [fields['guid'] for _, fields in jobs_fields]
+    existing_jobs = {
+        job.guid: job
+        for job in Job.objects.filter(
+            guid__in=set(guids) | {get_guid_root(guid) for guid in guids}
+        ).only(*JOB_CHANGE_FIELDS)
+    }
+
+    new_jobs = []
+    updated_jobs = []
+    changed_push_ids = set()
+    for _, fields in jobs_fields:
+        guid = fields['guid']
+        # try the job_guid_root instance first, as _load_job does
+        job = existing_jobs.get(get_guid_root(guid)) or existing_jobs.get(guid)
+        if job is None:
+            new_jobs.append(Job(last_modified=now, **fields))
+        else:
+            updated_jobs.append((job, job.state, job.result))
+            changed_push_ids.add(job.push_id)
+            for field in JOB_UPDATE_FIELDS:
+                setattr(job, field, fields[field])
+            job.last_modified = now
+        changed_push_ids.add(fields['push_id'])
+
+    with transaction.atomic():
+        # Other processes may be creating some of these jobs concurrently.
+        # MySQL doesn't return the ids of bulk created rows either, hence
+        # fetching all of them afterwards.
+        Job.objects.bulk_create(new_jobs, ignore_conflicts=True)
+        created_jobs = {
+            job.guid: job
+            for job in Job.objects.filter(guid__in=[job.guid for job in new_jobs]).only(
+                *JOB_CHANGE_FIELDS
+            )
+        }
+        changed_jobs = []
+        for new_job in new_jobs:
+            job = created_jobs[new_job.guid]
+            if (job.state, job.result, job.push_id) == (
+                new_job.state,
+                new_job.result,
+                new_job.push_id,
+            ):
+                changed_jobs.append(job)
+            else:
+                # created by another process in the meantime, so update it as
+                # _load_job would
+                updated_jobs.append((job, job.state, job.result))
+                changed_push_ids.add(job.push_id)
+                for field in JOB_UPDATE_FIELDS:
+                    setattr(job, field, getattr(new_job, field))
+                job.last_modified = now
+
+        Job.objects.bulk_update(
+            [job for job, _, _ in updated_jobs],
+            JOB_UPDATE_FIELDS + ('last_modified',),
+            batch_size=JOB_BULK_UPDATE_SIZE,
+        )
+        changed_jobs.extend(
+            job for job, state, result in updated_jobs if (job.state, job.result) != (state, result)
+        )
+        JobChange.record(changed_jobs)
+
+        jobs = dict(created_jobs)
+        jobs.update((job.guid, job) for job, _, _ in updated_jobs)
+
+        TaskclusterMetadata.objects.bulk_create(
+            [
+                TaskclusterMetadata(
+                    job_id=jobs[fields['guid']].id,
+                    task_id=job_datum['taskcluster_task_id'],
+                    retry_id=job_datum['taskcluster_retry_id'],
+                )
+                for job_datum, fields in jobs_fields
+                if all([k in job_datum for k in ['taskcluster_task_id', 'taskcluster_retry_id']])
+            ],
+            ignore_conflicts=True,
+        )
+
+        log_fields = {
+            fields['guid']: _get_job_log_fields(job_datum) for job_datum, fields in jobs_fields
+        }
+        logged_job_ids = [
+            jobs[guid].id for guid, job_log_fields in log_fields.items() if job_log_fields
+        ]
+        job_logs = {
+            (job_log.job_id, job_log.name, job_log.url): job_log
+            for job_log in JobLog.objects.filter(job_id__in=logged_job_ids)
+        }
+        new_job_logs = {}
+        for guid, job_log_fields in log_fields.items():
+            for name, url, parse_status in job_log_fields:
+                key = (jobs[guid].id, name, url)
+                if key not in job_logs and key not in new_job_logs:
+                    new_job_logs[key] = JobLog(
+                        job_id=jobs[guid].id, name=name, url=url, status=parse_status
+                    )
+        if new_job_logs:
+            JobLog.objects.bulk_create(new_job_logs.values(), ignore_conflicts=True)
+            job_logs = {
+                (job_log.job_id, job_log.name, job_log.url): job_log
+                for job_log in JobLog.objects.filter(job_id__in=logged_job_ids)
+            }
+
+    Push.invalidate_statuses(changed_push_ids)
+
+    # only schedule the log parsing once the logs got committed
+    for guid, job_log_fields in log_fields.items():
+        if job_log_fields:
+            job = jobs[guid]
+            _schedule_log_parsing(
+                job,
+                [job_logs[(job.id, name, url)] for name, url, _ in job_log_fields],
+                job.result,
+                repository,
+            )
+
+
 def _schedule_log_parsing(job, job_logs, result, repository):
     """Kick off the initial task that parses the log data.
 
@@ -325,6 +506,7 @@ def _schedule_log_parsing(job, job_logs, result, repository):
     }
 
     job_log_ids = []
+    job_log_names = set()
     for job_log in job_logs:
         # a log can be submitted already parsed.  So only schedule
         # a parsing task if it's ``pending``
@@ -338,26 +520,96 @@ def _schedule_log_parsing(job, job_logs, result, repository):
             continue
 
         job_log_ids.append(job_log.id)
+        job_log_names.add(job_log.name)
 
-        # TODO: Replace the use of different queues for failures vs not with the
-        # RabbitMQ priority feature (since the idea behind separate queues was
-        # only to ensure failures are dealt with first if there is a backlog).
-        if result != 'success':
-            if job_log.name == "errorsummary_json":
-                queue = "log_parser_fail_json"
-                priority = "failures"
-            else:
-                queue = "log_parser_fail_raw"
-                priority = "failures"
-            if repository.name in sheriffed_repos:
-                queue += "_sheriffed"
-            else:
-                queue += "_unsheriffed"
+    if not job_log_ids:
+        return
+
+    # TODO: Replace the use of different queues for failures vs not with the
+    # RabbitMQ priority feature (since the idea behind separate queues was
+    # only to ensure failures are dealt with first if there is a backlog).
+    if result != 'success':
+        # all the logs of a job are parsed by a single task, which downloads
+        # them concurrently, so it goes to the queue of its errorsummary log
+        if "errorsummary_json" in job_log_names:
+            queue = "log_parser_fail_json"
         else:
-            queue = 'log_parser'
-            priority = "normal"
+            queue = "log_parser_fail_raw"
+        priority = "failures"
+        if repository.name in sheriffed_repos:
+            queue += "_sheriffed"
+        else:
+            queue += "_unsheriffed"
+    else:
+        queue = 'log_parser'
+        priority = "normal"
+
+    parse_logs.apply_async(queue=queue, args=[job.id, job_log_ids, priority])
+
+
+def _get_push_ids(repository, data):
+    """Fetch the ids of the pushes of the given jobs by their full revision, at once."""
+    revisions = {datum.get('revision') for datum in data}
+    return dict(
+        Push.objects.filter(
+            repository=repository,
+            revision__in=[
+                revision
+                for revision in revisions
+                if isinstance(revision, str) and len(revision) >= 40
+            ],
+        ).values_list('revision', 'id')
+    )
 
-        parse_logs.apply_async(queue=queue, args=[job.id, [job_log.id], priority])
+
+def _get_push_id(repository, revision, push_ids):
+    if revision in push_ids:
+        return push_ids[revision]
+    revision_field = 'revision__startswith' if len(revision) < 40 else 'revision'
+    filter_kwargs = {'repository': repository, revision_field: revision}
+    return Push.objects.values_list('id', flat=True).get(**filter_kwargs)
+
+
+def _split_by_guid_root(data):
+    """
+    Split the job data into consecutive batches in which no two jobs share a
+    guid or guid root, so every batch can be loaded at once while the states
+    of the same job still get applied in order.
+    """
+    batch = []
+    batch_guids = set()
+    for datum in data:
+        guid = str(datum.get('job', {}).get('job_guid', ''))[0:50]
+        guids = {guid, get_guid_root(guid)}
+        if guids & batch_guids:
+            yield batch
+            batch = []
+            batch_guids = set()
+        batch.append(datum)
+        batch_guids |= guids
+    if batch:
+        yield batch
+
+
+def _store_job_batch(repository, batch, push_ids):
+    """
+    Load a batch of jobs at once, returning their superseded guid placeholders.
+    """
+    jobs_fields = [
+        (
+            datum['job'],
+            _get_job_fields(
+                repository, datum['job'], _get_push_id(repository, datum['revision'], push_ids)
+            ),
+        )
+        for datum in batch
+    ]
+    _load_jobs(repository, jobs_fields)
+    return [
+        [fields['guid'], superseded_guid]
+        for datum, (_, fields) in zip(batch, jobs_fields)
+        for superseded_guid in datum.get('superseded', [])
+    ]
 
 
 def store_job_data(repository, originalData):
@@ -420,53 +672,73 @@ def store_job_data(repository, originalData):
     if not data:
         return
 
+    push_ids = _get_push_ids(repository, data)
     superseded_job_guid_placeholders = []
 
-    # TODO: Refactor this now that store_job_data() is only over called with one job at a time.
-    for datum in data:
-        try:
-            # TODO: this might be a good place to check the datum against
-            # a JSON schema to ensure all the fields are valid.  Then
-            # the exception we caught would be much more informative.  That
-            # being said, if/when we transition to only using the pulse
-            # job consumer, then the data will always be vetted with a
-            # JSON schema before we get to this point.
-            job = datum['job']
-            revision = datum['revision']
-            superseded = datum.get('superseded', [])
-
-            revision_field = 'revision__startswith' if len(revision) < 40 else 'revision'
-            filter_kwargs = {'repository': repository, revision_field: revision}
-            push_id = Push.objects.values_list('id', flat=True).get(**filter_kwargs)
-
-            # load job
-            job_guid = _load_job(repository, job, push_id)
-
-            for superseded_guid in superseded:
-                superseded_job_guid_placeholders.append(
-                    # superseded by guid, superseded guid
-                    [job_guid, superseded_guid]
+    for batch in _split_by_guid_root(data):
+        if len(batch) > 1:
+            try:
+                superseded_job_guid_placeholders.extend(
+                    _store_job_batch(repository, batch, push_ids)
+                )
+                continue
+            except Exception:
+                # load them one at a time instead, which skips just the bad ones
+                logger.warning(
+                    "Failed to load a batch of %s jobs at once", len(batch), exc_info=True
                 )
-        except Exception as e:
-            # Surface the error immediately unless running in production, where we'd
-            # rather report it on New Relic and not block storing the remaining jobs.
-            # TODO: Once buildbot support is removed, remove this as part of
-            # refactoring this method to process just one job at a time.
-            if 'DYNO' not in os.environ:
-                raise
-
-            logger.exception(e)
-            # make more fields visible in new relic for the job
-            # where we encountered the error
-            datum.update(datum.get("job", {}))
-            newrelic.agent.record_exception(params=datum)
-
-            # skip any jobs that hit errors in these stages.
-            continue
+
+        for datum in batch:
+            try:
+                # TODO: this might be a good place to check the datum against
+                # a JSON schema to ensure all the fields are valid.  Then
+                # the exception we caught would be much more informative.  That
+                # being said, if/when we transition to only using the pulse
+                # job consumer, then the data will always be vetted with a
+                # JSON schema before we get to this point.
+                job = datum['job']
+                revision = datum['revision']
+                superseded = datum.get('superseded', [])
+
+                push_id = _get_push_id(repository, revision, push_ids)
+
+                # load job
+                try:
+                    job_guid = _load_job(repository, job, push_id)
+                except IntegrityError:
+                    # one of the cached reference data rows may have been
+                    # pruned by the data cycling in the meantime
+                    reference_data_cache.clear()
+                    job_guid = _load_job(repository, job, push_id)
+
+                for superseded_guid in superseded:
+                    superseded_job_guid_placeholders.append(
+                        # superseded by guid, superseded guid
+                        [job_guid, superseded_guid]
+                    )
+            except Exception as e:
+                # Surface the error immediately unless running in production, where we'd
+                # rather report it on New Relic and not block storing the remaining jobs.
+                if 'DYNO' not in os.environ:
+                    raise
+
+                logger.exception(e)
+                # make more fields visible in new relic for the job
+                # where we encountered the error
+                datum.update(datum.get("job", {}))
+                newrelic.agent.record_exception(params=datum)
+
+                # skip any jobs that hit errors in these stages.
+                continue
 
     # Update the result/state of any jobs that were superseded by those ingested above.
     if superseded_job_guid_placeholders:
-        for (job_guid, superseded_by_guid) in superseded_job_guid_placeholders:
-            Job.objects.filter(guid=superseded_by_guid).update(
-                result='superseded', state='completed'
-            )
+        superseded_jobs = Job.objects.filter(
+            guid__in=[superseded_guid for _, superseded_guid in superseded_job_guid_placeholders]
+        )
+        if superseded_jobs.update(result='superseded', state='completed'):
+            superseded_jobs = list(superseded_jobs)
+            JobChange.record(superseded_jobs)
+            Push.invalidate_statuses({job.push_id for job in superseded_jobs})
+
+    reference_data_cache.record_metrics()
@@ -1,12 +1,14 @@
 import copy
 import logging
+from collections import defaultdict
 from datetime import datetime
 from hashlib import sha1
-from typing import List, Tuple
+from typing import Dict, List, Set, Tuple
 
 import simplejson as json
 
 from django.conf import settings
+from django.db import IntegrityError, models, transaction
 from treeherder.log_parser.utils import validate_perf_data
 from treeherder.model.models import Job, OptionCollection
 from treeherder.perf.models import (
@@ -15,7 +17,7 @@ from treeherder.perf.models import (
     PerformanceFramework,
     PerformanceSignature,
 )
-from treeherder.perf.tasks import generate_alerts
+from treeherder.perf.tasks import schedule_alert_generation
 
 logger = logging.getLogger(__name__)
 
@@ -47,25 +49,140 @@ def _order_and_concat(words: List) -> str:
     return ' '.join(sorted(words))
 
 
-def _create_or_update_signature(repository, signature_hash, framework, application, defaults):
-    signature, created = PerformanceSignature.objects.get_or_create(
-        repository=repository,
-        signature_hash=signature_hash,
-        framework=framework,
-        application=application,
-        defaults=defaults,
-    )
-    if not created:
-        if signature.last_updated > defaults['last_updated']:
-            defaults['last_updated'] = signature.last_updated
-        signature, _ = PerformanceSignature.objects.update_or_create(
+def _create_or_update_signatures(
+    repository, framework, application, defaults_by_hash: dict
+) -> Dict[str, PerformanceSignature]:
+    """
+    Bulk equivalent of a `get_or_create` followed by an `update_or_create` for every
+    signature hash, resolving all of them with a single query.
+    """
+    signatures = {
+        signature.signature_hash: signature
+        for signature in PerformanceSignature.objects.filter(
             repository=repository,
-            signature_hash=signature_hash,
             framework=framework,
             application=application,
-            defaults=defaults,
+            signature_hash__in=list(defaults_by_hash),
+        )
+    }
+
+    # usually the same few properties (e.g. last_updated) change for all signatures,
+    # so group them by their changes & update each group with a single query
+    signatures_by_changes = defaultdict(list)
+    for signature_hash, signature in signatures.items():
+        defaults = dict(defaults_by_hash[signature_hash])
+        defaults['last_updated'] = max(signature.last_updated, defaults['last_updated'])
+        changes = []
+        for field, value in defaults.items():
+            # compare foreign keys by id, to avoid fetching the related objects
+            field = PerformanceSignature._meta.get_field(field).attname
+            if isinstance(value, models.Model):
+                value = value.pk
+            if getattr(signature, field) != value:
+                setattr(signature, field, value)
+                changes.append((field, value))
+        if changes:
+            signatures_by_changes[tuple(changes)].append(signature.id)
+    for changes, signature_ids in signatures_by_changes.items():
+        PerformanceSignature.objects.filter(id__in=signature_ids).update(**dict(changes))
+
+    missing_hashes = [
+        signature_hash for signature_hash in defaults_by_hash if signature_hash not in signatures
+    ]
+    if missing_hashes:
+        # conflicts mean the signatures got created in the meantime,
+        # by a concurrent ingestion
+        PerformanceSignature.objects.bulk_create(
+            [
+                PerformanceSignature(
+                    repository=repository,
+                    framework=framework,
+                    application=application,
+                    signature_hash=signature_hash,
+                    **defaults_by_hash[signature_hash],
+                )
+                for signature_hash in missing_hashes
+            ],
+            ignore_conflicts=True,
+        )
+        # bulk_create doesn't provide primary keys on MySQL
+        signatures.update(
+            (signature.signature_hash, signature)
+            for signature in PerformanceSignature.objects.filter(
+                repository=repository,
+                framework=framework,
+                application=application,
+                signature_hash__in=missing_hashes,
+            )
+        )
+    return signatures
+
+
+def _get_or_create_data(
+    job: Job, push_timestamp: datetime, value_by_signature: dict, is_multi_commit: bool
+) -> Set[int]:
+    """
+    Bulk equivalent of a `PerformanceDatum.objects.get_or_create` for every signature.
+    Returns the ids of the signatures which got new data.
+    """
+    common_properties = dict(
+        repository=job.repository, job=job, push=job.push, push_timestamp=push_timestamp
+    )
+    existing_data = set(
+        PerformanceDatum.objects.filter(
+            **common_properties, signature_id__in=[s.id for s in value_by_signature]
+        ).values_list('signature_id', flat=True)
+    )
+    new_data = [
+        PerformanceDatum(**common_properties, signature=signature, value=value)
+        for (signature, value) in value_by_signature.items()
+        if signature.id not in existing_data
+    ]
+    if not new_data:
+        return set()
+    try:
+        with transaction.atomic():
+            PerformanceDatum.objects.bulk_create(new_data)
+        created_for = {datum.signature_id for datum in new_data}
+    except IntegrityError:
+        # some of the data got stored meanwhile (e.g. by a concurrent retry of
+        # the job's ingestion), so find out which of it is actually new
+        created_for = {
+            datum.signature_id
+            for datum in new_data
+            if PerformanceDatum.objects.get_or_create(
+                **common_properties,
+                signature_id=datum.signature_id,
+                defaults={'value': datum.value},
+            )[1]
+        }
+
+    # bulk_create skips PerformanceDatum.save(), so mirror it
+    # by keeping the signatures' last_updated in sync
+    outdated_signatures = [
+        signature
+        for signature in value_by_signature
+        if signature.id in created_for and signature.last_updated < push_timestamp
+    ]
+    for signature in outdated_signatures:
+        signature.last_updated = push_timestamp
+    if outdated_signatures:
+        PerformanceSignature.objects.filter(id__in=[s.id for s in outdated_signatures]).update(
+            last_updated=push_timestamp
         )
-    return signature
+
+    if PerformanceDatum.should_mark_as_multi_commit(is_multi_commit, bool(created_for)):
+        # keep a register with all multi commit perf data
+        MultiCommitDatum.objects.bulk_create(
+            [
+                MultiCommitDatum(perf_datum_id=datum_id)
+                for datum_id in PerformanceDatum.objects.filter(
+                    **common_properties, signature_id__in=created_for
+                ).values_list('id', flat=True)
+            ],
+            ignore_conflicts=True,
+        )
+    return created_for
 
 
 def _deduce_push_timestamp(perf_datum: dict, job_push_time: datetime) -> Tuple[datetime, bool]:
@@ -139,10 +256,18 @@ def _load_perf_datum(job: Job, perf_datum: dict):
         )
         return
     application = _get_application_name(perf_datum)
+    deduced_timestamp, is_multi_commit = _deduce_push_timestamp(perf_datum, job.push.time)
+
+    # the same signature may be reported multiple times: its latest properties
+    # win, while its datum gets the first value, as subsequent ones are
+    # considered already ingested
+    summary_defaults = {}
+    subtest_defaults = {}
+    values = {}
+    suites = {}
     for suite in perf_datum['suites']:
         suite_extra_properties = copy.copy(extra_properties)
         ordered_tags = _order_and_concat(suite.get('tags', []))
-        deduced_timestamp, is_multi_commit = _deduce_push_timestamp(perf_datum, job.push.time)
         suite_extra_options = ''
 
         if suite.get('extraOptions'):
@@ -158,117 +283,107 @@ def _load_perf_datum(job: Job, perf_datum: dict):
             summary_properties.update(reference_data)
             summary_properties.update(suite_extra_properties)
             summary_signature_hash = _get_signature_hash(summary_properties)
-            signature = _create_or_update_signature(
-                job.repository,
-                summary_signature_hash,
-                framework,
-                application,
-                {
-                    'test': '',
-                    'suite': suite['name'],
-                    'suite_public_name': suite.get('publicName'),
-                    'option_collection': option_collection,
-                    'platform': job.machine_platform,
-                    'tags': ordered_tags,
-                    'extra_options': suite_extra_options,
-                    'measurement_unit': suite.get('unit'),
-                    'lower_is_better': suite.get('lowerIsBetter', True),
-                    'has_subtests': True,
-                    # these properties below can be either True, False, or null
-                    # (None). Null indicates no preference has been set.
-                    'should_alert': suite.get('shouldAlert'),
-                    'alert_change_type': PerformanceSignature._get_alert_change_type(
-                        suite.get('alertChangeType')
-                    ),
-                    'alert_threshold': suite.get('alertThreshold'),
-                    'min_back_window': suite.get('minBackWindow'),
-                    'max_back_window': suite.get('maxBackWindow'),
-                    'fore_window': suite.get('foreWindow'),
-                    'last_updated': job.push.time,
-                },
-            )
-
-            (suite_datum, datum_created) = PerformanceDatum.objects.get_or_create(
-                repository=job.repository,
-                job=job,
-                push=job.push,
-                signature=signature,
-                push_timestamp=deduced_timestamp,
-                defaults={'value': suite['value']},
-            )
-            if suite_datum.should_mark_as_multi_commit(is_multi_commit, datum_created):
-                # keep a register with all multi commit perf data
-                MultiCommitDatum.objects.create(perf_datum=suite_datum)
-
-            if _suite_should_alert_based_on(signature, job, datum_created):
-                generate_alerts.apply_async(args=[signature.id], queue='generate_perf_alerts')
+            summary_defaults[summary_signature_hash] = {
+                'test': '',
+                'suite': suite['name'],
+                'suite_public_name': suite.get('publicName'),
+                'option_collection': option_collection,
+                'platform': job.machine_platform,
+                'tags': ordered_tags,
+                'extra_options': suite_extra_options,
+                'measurement_unit': suite.get('unit'),
+                'lower_is_better': suite.get('lowerIsBetter', True),
+                'has_subtests': True,
+                # these properties below can be either True, False, or null
+                # (None). Null indicates no preference has been set.
+                'should_alert': suite.get('shouldAlert'),
+                'alert_change_type': PerformanceSignature._get_alert_change_type(
+                    suite.get('alertChangeType')
+                ),
+                'alert_threshold': suite.get('alertThreshold'),
+                'min_back_window': suite.get('minBackWindow'),
+                'max_back_window': suite.get('maxBackWindow'),
+                'fore_window': suite.get('foreWindow'),
+                'last_updated': job.push.time,
+            }
+            values.setdefault(summary_signature_hash, suite['value'])
+            suites.setdefault(summary_signature_hash, suite)
+
+        subtest_values = {}
+        for subtest in suite['subtests']:
+            subtest_values.setdefault(subtest['name'], subtest['value'])
 
         for subtest in suite['subtests']:
             subtest_properties = {'suite': suite['name'], 'test': subtest['name']}
             subtest_properties.update(reference_data)
             subtest_properties.update(suite_extra_properties)
 
-            summary_signature = None
             if summary_signature_hash is not None:
                 subtest_properties.update({'parent_signature': summary_signature_hash})
-                summary_signature = PerformanceSignature.objects.get(
-                    repository=job.repository,
-                    framework=framework,
-                    signature_hash=summary_signature_hash,
-                    application=application,
-                )
             subtest_signature_hash = _get_signature_hash(subtest_properties)
-            value = list(
-                subtest['value']
-                for subtest in suite['subtests']
-                if subtest['name'] == subtest_properties['test']
-            )
-            signature = _create_or_update_signature(
-                job.repository,
-                subtest_signature_hash,
-                framework,
-                application,
-                {
-                    'test': subtest_properties['test'],
-                    'suite': suite['name'],
-                    'test_public_name': subtest.get('publicName'),
-                    'suite_public_name': suite.get('publicName'),
-                    'option_collection': option_collection,
-                    'platform': job.machine_platform,
-                    'tags': ordered_tags,
-                    'extra_options': suite_extra_options,
-                    'measurement_unit': subtest.get('unit'),
-                    'lower_is_better': subtest.get('lowerIsBetter', True),
-                    'has_subtests': False,
-                    # these properties below can be either True, False, or
-                    # null (None). Null indicates no preference has been
-                    # set.
-                    'should_alert': subtest.get('shouldAlert'),
-                    'alert_change_type': PerformanceSignature._get_alert_change_type(
-                        subtest.get('alertChangeType')
-                    ),
-                    'alert_threshold': subtest.get('alertThreshold'),
-                    'min_back_window': subtest.get('minBackWindow'),
-                    'max_back_window': subtest.get('maxBackWindow'),
-                    'fore_window': subtest.get('foreWindow'),
-                    'parent_signature': summary_signature,
-                    'last_updated': job.push.time,
-                },
-            )
-            (subtest_datum, datum_created) = PerformanceDatum.objects.get_or_create(
-                repository=job.repository,
-                job=job,
-                push=job.push,
-                signature=signature,
-                push_timestamp=deduced_timestamp,
-                defaults={'value': value[0]},
-            )
-            if subtest_datum.should_mark_as_multi_commit(is_multi_commit, datum_created):
-                # keep a register with all multi commit perf data
-                MultiCommitDatum.objects.create(perf_datum=subtest_datum)
+            subtest_defaults[subtest_signature_hash] = {
+                'test': subtest_properties['test'],
+                'suite': suite['name'],
+                'test_public_name': subtest.get('publicName'),
+                'suite_public_name': suite.get('publicName'),
+                'option_collection': option_collection,
+                'platform': job.machine_platform,
+                'tags': ordered_tags,
+                'extra_options': suite_extra_options,
+                'measurement_unit': subtest.get('unit'),
+                'lower_is_better': subtest.get('lowerIsBetter', True),
+                'has_subtests': False,
+                # these properties below can be either True, False, or
+                # null (None). Null indicates no preference has been
+                # set.
+                'should_alert': subtest.get('shouldAlert'),
+                'alert_change_type': PerformanceSignature._get_alert_change_type(
+                    subtest.get('alertChangeType')
+                ),
+                'alert_threshold': subtest.get('alertThreshold'),
+                'min_back_window': subtest.get('minBackWindow'),
+                'max_back_window': subtest.get('maxBackWindow'),
+                'fore_window': subtest.get('foreWindow'),
+                # resolved to the actual signature once that's stored
+                'parent_signature': summary_signature_hash,
+                'last_updated': job.push.time,
+            }
+            values.setdefault(subtest_signature_hash, subtest_values[subtest['name']])
+            suites.setdefault(subtest_signature_hash, suite)
+
+    signatures = {}
+    if summary_defaults:
+        signatures.update(
+            _create_or_update_signatures(job.repository, framework, application, summary_defaults)
+        )
+    if subtest_defaults:
+        for defaults in subtest_defaults.values():
+            if defaults['parent_signature'] is not None:
+                defaults['parent_signature'] = signatures[defaults['parent_signature']]
+        signatures.update(
+            _create_or_update_signatures(job.repository, framework, application, subtest_defaults)
+        )
+    if not signatures:
+        return
 
-            if _test_should_alert_based_on(signature, job, datum_created, suite):
-                generate_alerts.apply_async(args=[signature.id], queue='generate_perf_alerts')
+    created_for = _get_or_create_data(
+        job,
+        deduced_timestamp,
+        {signatures[signature_hash]: value for (signature_hash, value) in values.items()},
+        is_multi_commit,
+    )
+
+    for signature_hash in values:
+        signature = signatures[signature_hash]
+        datum_created = signature.id in created_for
+        if signature.has_subtests:
+            should_alert = _suite_should_alert_based_on(signature, job, datum_created)
+        else:
+            should_alert = _test_should_alert_based_on(
+                signature, job, datum_created, suites[signature_hash]
+            )
+        if should_alert:
+            schedule_alert_generation(signature.id)
 
 
 def store_performance_artifact(job, artifact):
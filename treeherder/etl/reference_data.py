@@ -0,0 +1,159 @@
+import logging
+import threading
+from collections import Counter, OrderedDict
+
+import newrelic.agent
+from django.conf import settings
+
+from treeherder.model.models import (
+    BuildPlatform,
+    FailureClassification,
+    JobGroup,
+    JobType,
+    Machine,
+    MachinePlatform,
+    OptionCollection,
+    Product,
+    ReferenceDataSignatures,
+)
+
+logger = logging.getLogger(__name__)
+
+# The fields identifying a row of each of the reference data models
+NATURAL_KEYS = {
+    BuildPlatform: ('os_name', 'platform', 'architecture'),
+    MachinePlatform: ('os_name', 'platform', 'architecture'),
+    Machine: ('name',),
+    JobType: ('symbol', 'name'),
+    JobGroup: ('name', 'symbol'),
+    Product: ('name',),
+    FailureClassification: ('name',),
+    ReferenceDataSignatures: ('name', 'signature', 'build_system_type', 'repository'),
+}
+
+# The models with few enough rows to load all of them up front
+PRELOADED_MODELS = (
+    BuildPlatform,
+    MachinePlatform,
+    JobType,
+    JobGroup,
+    Product,
+    FailureClassification,
+)
+
+
+class ReferenceDataCache:
+    """
+    Process wide cache of the reference data rows (platforms, job types,
+    signatures, ...) by their natural key.
+
+    Every ingested job refers to a handful of these rows, which hardly ever
+    change, so this saves a `get_or_create` round trip per row and job. The
+    least recently used rows are evicted once `max_size` are cached. Rows can
+    get deleted by the data cycling though, so whoever gets an IntegrityError
+    while referring to them should `clear` the cache.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.hits = Counter()
+        self.misses = Counter()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._reported = (Counter(), Counter())
+
+    @staticmethod
+    def _key(model, natural_key):
+        return (model, tuple(natural_key[field] for field in NATURAL_KEYS[model]))
+
+    def _get(self, key):
+        with self._lock:
+            instance = self._entries.get(key)
+            if instance is None:
+                self.misses[key[0].__name__] += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits[key[0].__name__] += 1
+            return instance
+
+    def _set_many(self, items):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            for key, instance in items:
+                self._entries[key] = instance
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get(self, model, **natural_key):
+        key = self._key(model, natural_key)
+        instance = self._get(key)
+        if instance is None:
+            instance = model.objects.get(**natural_key)
+            self._set_many([(key, instance)])
+        return instance
+
+    def get_or_create(self, model, defaults=None, **natural_key):
+        key = self._key(model, natural_key)
+        instance = self._get(key)
+        if instance is None:
+            instance, _ = model.objects.get_or_create(defaults=defaults, **natural_key)
+            self._set_many([(key, instance)])
+        return instance
+
+    def option_collection_exists(self, option_collection_hash):
+        key = (OptionCollection, option_collection_hash)
+        if self._get(key) is not None:
+            return True
+        if OptionCollection.objects.filter(option_collection_hash=option_collection_hash).exists():
+            self._set_many([(key, True)])
+            return True
+        return False
+
+    def preload(self, models=PRELOADED_MODELS):
+        items = []
+        for model in models:
+            fields = NATURAL_KEYS[model]
+            items.extend(
+                ((model, tuple(getattr(instance, field) for field in fields)), instance)
+                for instance in model.objects.all()
+            )
+        items.extend(
+            ((OptionCollection, option_collection_hash), True)
+            for option_collection_hash in OptionCollection.objects.values_list(
+                'option_collection_hash', flat=True
+            ).distinct()
+        )
+        self._set_many(items)
+        logger.info("Preloaded %s reference data rows", len(items))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hits & misses by model name, since the process started."""
+        with self._lock:
+            return {
+                name: {'hits': self.hits[name], 'misses': self.misses[name]}
+                for name in sorted(set(self.hits) | set(self.misses))
+            }
+
+    def record_metrics(self):
+        """Report the hits & misses since the previous report to New Relic."""
+        with self._lock:
+            hits, misses = self.hits.copy(), self.misses.copy()
+            reported_hits, reported_misses = self._reported
+            self._reported = (hits, misses)
+        for name in set(hits) | set(misses):
+            newrelic.agent.record_custom_metric(
+                'Custom/ReferenceDataCache/{}/Hits'.format(name), hits[name] - reported_hits[name]
+            )
+            newrelic.agent.record_custom_metric(
+                'Custom/ReferenceDataCache/{}/Misses'.format(name),
+                misses[name] - reported_misses[name],
+            )
+
+
+reference_data_cache = ReferenceDataCache(settings.REFERENCE_DATA_CACHE_SIZE)
@@ -1,16 +1,25 @@
 # Code imported from https://github.com/taskcluster/taskcluster/blob/32629c562f8d6f5a6b608a3141a8ee2e0984619f/services/treeherder/src/handler.js
+import asyncio
 import logging
 import os
 
 import environ
 import jsonschema
 import slugid
-import taskcluster
 import taskcluster.aio
 import taskcluster_urls
+from django.conf import settings
 
 from treeherder.etl.schema import get_json_schema
 from treeherder.etl.taskcluster_pulse.parse_route import parseRoute
+from treeherder.utils.taskcluster import (
+    artifacts_cache_key,
+    get_async_session,
+    get_task_definition,
+    task_cache_key,
+    taskcluster_cache,
+    trim_task_definition,
+)
 
 env = environ.Env()
 logger = logging.getLogger(__name__)
@@ -132,8 +141,7 @@ def ignore_task(task, taskId, rootUrl, project):
                 pass
         else:
             # The decision task is the ultimate source for determining this information
-            queue = taskcluster.Queue({"rootUrl": rootUrl})
-            decision_task = queue.task(task["taskGroupId"])
+            decision_task = get_task_definition(rootUrl, task["taskGroupId"])
             scopes = decision_task["metadata"].get("source")
             ignore = True
             for scope in scopes:
@@ -160,51 +168,79 @@ def ignore_task(task, taskId, rootUrl, project):
 # Only messages that contain the properly formatted routing key and contains
 # treeherder job information in task.extra.treeherder are accepted
 # This will generate a list of messages that need to be ingested by Treeherder
-async def handleMessage(message, taskDefinition=None):
-    async with taskcluster.aio.createSession() as session:
-        jobs = []
-        taskId = message["payload"]["status"]["taskId"]
-        asyncQueue = taskcluster.aio.Queue({"rootUrl": message["root_url"]}, session=session)
-        task = (await asyncQueue.task(taskId)) if not taskDefinition else taskDefinition
+async def handleMessage(message, taskDefinition=None, session=None):
+    if session is None:
+        session = get_async_session()
+
+    jobs = []
+    taskId = message["payload"]["status"]["taskId"]
+    task = (
+        (await fetchTask(message["root_url"], taskId, session))
+        if not taskDefinition
+        else taskDefinition
+    )
 
-        try:
-            parsedRoute = parseRouteInfo("tc-treeherder", taskId, task["routes"], task)
-        except PulseHandlerError as e:
-            logger.debug("%s", str(e))
-            return jobs
-
-        if ignore_task(task, taskId, message["root_url"], parsedRoute['project']):
-            return jobs
-
-        logger.debug("Message received for task %s", taskId)
-
-        # Validation failures are common and logged, so do nothing more.
-        if not validateTask(task):
-            return jobs
-
-        taskType = EXCHANGE_EVENT_MAP.get(message["exchange"])
-
-        # Originally this code was only within the "pending" case, however, in order to support
-        # ingesting all tasks at once which might not have "pending" case
-        # If the job is an automatic rerun we mark the previous run as "retry"
-        # This will only work if the previous run has not yet been processed by Treeherder
-        # since _remove_existing_jobs() will prevent it
-        if message["payload"]["runId"] > 0:
-            jobs.append(await handleTaskRerun(parsedRoute, task, message, session))
-
-        if not taskType:
-            raise Exception("Unknown exchange: {exchange}".format(exchange=message["exchange"]))
-        elif taskType == "pending":
-            jobs.append(handleTaskPending(parsedRoute, task, message))
-        elif taskType == "running":
-            jobs.append(handleTaskRunning(parsedRoute, task, message))
-        elif taskType in ("completed", "failed"):
-            jobs.append(await handleTaskCompleted(parsedRoute, task, message, session))
-        elif taskType == "exception":
-            jobs.append(await handleTaskException(parsedRoute, task, message, session))
+    try:
+        parsedRoute = parseRouteInfo("tc-treeherder", taskId, task["routes"], task)
+    except PulseHandlerError as e:
+        logger.debug("%s", str(e))
+        return jobs
+
+    if ignore_task(task, taskId, message["root_url"], parsedRoute['project']):
+        return jobs
+
+    logger.debug("Message received for task %s", taskId)
 
+    # Validation failures are common and logged, so do nothing more.
+    if not validateTask(task):
         return jobs
 
+    taskType = EXCHANGE_EVENT_MAP.get(message["exchange"])
+
+    # Originally this code was only within the "pending" case, however, in order to support
+    # ingesting all tasks at once which might not have "pending" case
+    # If the job is an automatic rerun we mark the previous run as "retry"
+    # This will only work if the previous run has not yet been processed by Treeherder
+    # since _remove_existing_jobs() will prevent it
+    if message["payload"]["runId"] > 0:
+        jobs.append(await handleTaskRerun(parsedRoute, task, message, session))
+
+    if not taskType:
+        raise Exception("Unknown exchange: {exchange}".format(exchange=message["exchange"]))
+    elif taskType == "pending":
+        jobs.append(handleTaskPending(parsedRoute, task, message))
+    elif taskType == "running":
+        jobs.append(handleTaskRunning(parsedRoute, task, message))
+    elif taskType in ("completed", "failed"):
+        jobs.append(await handleTaskCompleted(parsedRoute, task, message, session))
+    elif taskType == "exception":
+        jobs.append(await handleTaskException(parsedRoute, task, message, session))
+
+    return jobs
+
+
+# The definition of a task is needed for the messages of each of its states,
+# so it's only fetched for the first of them
+async def fetchTask(root_url, taskId, session):
+    cacheKey = task_cache_key(root_url, taskId)
+    task = taskcluster_cache.get(cacheKey)
+    if task is None:
+        asyncQueue = taskcluster.aio.Queue({"rootUrl": root_url}, session=session)
+        task = trim_task_definition(await asyncQueue.task(taskId))
+        taskcluster_cache.set(cacheKey, task, settings.TASKCLUSTER_TASK_CACHE_TIMEOUT)
+    return task
+
+
+# Handles many messages concurrently.  The result for each message is either
+# the list of its jobs or the exception raised while handling it, so one bad
+# message doesn't fail the others.
+async def handleMessages(messages):
+    session = get_async_session()
+    return await asyncio.gather(
+        *(handleMessage(message, session=session) for message in messages),
+        return_exceptions=True,
+    )
+
 
 # Builds the basic Treeherder job message that's universal for all
 # messsage types.
@@ -348,7 +384,13 @@ async def handleTaskException(pushInfo, task, message, session):
     return job
 
 
+# Only called for resolved runs, of which the artifacts don't change anymore
 async def fetchArtifacts(root_url, taskId, runId, session):
+    cacheKey = artifacts_cache_key(root_url, taskId, runId)
+    artifacts = taskcluster_cache.get(cacheKey)
+    if artifacts is not None:
+        return artifacts
+
     asyncQueue = taskcluster.aio.Queue({"rootUrl": root_url}, session=session)
     res = await asyncQueue.listArtifacts(taskId, runId)
     artifacts = res["artifacts"]
@@ -365,6 +407,7 @@ async def fetchArtifacts(root_url, taskId, runId, session):
         artifacts = artifacts.concat(res["artifacts"])
         continuationToken = res.get("continuationToken")
 
+    taskcluster_cache.set(cacheKey, artifacts, settings.TASKCLUSTER_ARTIFACTS_CACHE_TIMEOUT)
     return artifacts
 
 
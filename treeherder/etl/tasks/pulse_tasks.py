@@ -1,15 +1,18 @@
 """
 This module contains tasks related to pulse job ingestion
 """
-import asyncio
+import logging
 
 import newrelic.agent
 
 from treeherder.etl.job_loader import JobLoader
 from treeherder.etl.push_loader import PushLoader
-from treeherder.etl.taskcluster_pulse.handler import handleMessage
+from treeherder.etl.taskcluster_pulse.handler import handleMessage, handleMessages
+from treeherder.utils.taskcluster import client_stats, run_async
 from treeherder.workers.task import retryable_task
 
+logger = logging.getLogger(__name__)
+
 # NOTE: default values for root_url parameters can be removed once all tasks that lack
 # that parameter have been processed
 
@@ -21,11 +24,10 @@ def store_pulse_tasks(
     """
     Fetches tasks from Taskcluster
     """
-    loop = asyncio.get_event_loop()
     newrelic.agent.add_custom_parameter("exchange", exchange)
     newrelic.agent.add_custom_parameter("routing_key", routing_key)
     # handleMessage expects messages in this format
-    runs = loop.run_until_complete(
+    runs = run_async(
         handleMessage(
             {
                 "exchange": exchange,
@@ -37,6 +39,54 @@ def store_pulse_tasks(
     for run in runs:
         if run:
             JobLoader().process_job(run, root_url)
+    client_stats.record_metrics()
+
+
+@retryable_task(name='store-pulse-tasks-batch', max_retries=10)
+def store_pulse_tasks_batch(messages, root_url='https://firefox-ci-tc.services.mozilla.com'):
+    """
+    Fetches the tasks of many messages from Taskcluster concurrently & stores
+    all their jobs at once.
+
+    ``messages`` is a list of ``[pulse_job, exchange, routing_key]``.  Rather
+    than retrying the whole batch, any message which fails to be handled or
+    stored (e.g. because its push is missing) is handed over to a
+    ``store_pulse_tasks`` task of its own.
+    """
+    newrelic.agent.add_custom_parameter("batch_size", len(messages))
+    results = run_async(
+        handleMessages(
+            [
+                {
+                    "exchange": exchange,
+                    "payload": pulse_job,
+                    "root_url": root_url,
+                }
+                for pulse_job, exchange, _ in messages
+            ]
+        )
+    )
+
+    retried = set()
+    runs = []
+    run_messages = {}
+    for index, result in enumerate(results):
+        if isinstance(result, Exception):
+            logger.warning("Failed to handle task message, retrying it on its own: %r", result)
+            retried.add(index)
+            continue
+        for run in result:
+            if run:
+                runs.append(run)
+                run_messages[id(run)] = index
+
+    for run in JobLoader().process_jobs(runs, root_url):
+        # its message will be handled again, including any other run of it
+        retried.add(run_messages[id(run)])
+
+    for index in sorted(retried):
+        store_pulse_tasks.apply_async(args=[*messages[index], root_url], queue='store_pulse_tasks')
+    client_stats.record_metrics()
 
 
 @retryable_task(name='store-pulse-pushes', max_retries=10)
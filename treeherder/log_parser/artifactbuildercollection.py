@@ -1,6 +1,7 @@
 import logging
 
 import newrelic.agent
+from django.conf import settings
 
 from treeherder.utils.http import make_request
 
@@ -10,6 +11,9 @@ from .parsers import EmptyPerformanceData
 logger = logging.getLogger(__name__)
 # Max log size in bytes we will download (prior to decompression).
 MAX_DOWNLOAD_SIZE_IN_BYTES = 5 * 1024 * 1024
+# Size of the (decompressed) chunks a log is scanned in, when looking for
+# the lines the parsers are interested in.
+SCAN_CHUNK_SIZE_IN_BYTES = 1024 * 1024
 
 
 class ArtifactBuilderCollection:
@@ -96,18 +100,13 @@ class ArtifactBuilderCollection:
                     'Download size of %i bytes exceeds limit' % download_size_in_bytes
                 )
 
-            # Lines must be explicitly decoded since `iter_lines()`` returns bytes by default
-            # and we cannot use its `decode_unicode=True` mode, since otherwise Unicode newline
-            # characters such as `\u0085` (which can appear in test output) are treated the same
-            # as `\n` or `\r`, and so split into unwanted additional lines by `iter_lines()`.
-            for line in response.iter_lines():
-                for builder in self.builders:
-                    try:
-                        # Using `replace` to prevent malformed unicode (which might possibly exist
-                        # in test message output) from breaking parsing of the rest of the log.
-                        builder.parse_line(line.decode('utf-8', 'replace'))
-                    except EmptyPerformanceData:
-                        logger.warning("We have parsed an empty PERFHERDER_DATA for %s", self.url)
+            markers = [builder.parser.MARKERS for builder in self.builders]
+            if settings.LOG_PARSER_CHUNKED_SCAN and all(markers):
+                self.parse_chunks(
+                    response, {marker for marker_set in markers for marker in marker_set}
+                )
+            else:
+                self.parse_lines(response)
 
         # gather the artifacts from all builders
         for builder in self.builders:
@@ -120,6 +119,111 @@ class ArtifactBuilderCollection:
                 continue
             self.artifacts[name] = artifact
 
+    def parse_lines(self, response):
+        """Run every line of the log through each builder."""
+        # Lines must be explicitly decoded since `iter_lines()`` returns bytes by default
+        # and we cannot use its `decode_unicode=True` mode, since otherwise Unicode newline
+        # characters such as `\u0085` (which can appear in test output) are treated the same
+        # as `\n` or `\r`, and so split into unwanted additional lines by `iter_lines()`.
+        for line in response.iter_lines():
+            self.parse_line(line)
+
+    def parse_chunks(self, response, markers):
+        """
+        Only run the lines containing any of the builders' parsers' markers
+        through each builder.
+
+        The log is searched for the markers in large chunks, at the bytes level,
+        so the vast majority of lines never get split out, decoded or passed
+        around. Line numbers are kept in sync by counting line breaks.
+        """
+        scanner = ChunkedLogScanner(markers)
+        chunks = response.iter_content(chunk_size=SCAN_CHUNK_SIZE_IN_BYTES)
+        for lineno, line in scanner.scan(chunks):
+            for builder in self.builders:
+                builder.lineno = lineno
+            self.parse_line(line)
+
+        for builder in self.builders:
+            builder.lineno = scanner.line_count
+
+    def parse_line(self, line):
+        for builder in self.builders:
+            try:
+                # Using `replace` to prevent malformed unicode (which might possibly exist
+                # in test message output) from breaking parsing of the rest of the log.
+                builder.parse_line(line.decode('utf-8', 'replace'))
+            except EmptyPerformanceData:
+                logger.warning("We have parsed an empty PERFHERDER_DATA for %s", self.url)
+
+
+class ChunkedLogScanner:
+    """
+    Finds the lines containing any of the given markers in a log provided as
+    chunks of bytes.
+
+    Lines are split the same way as ``bytes.splitlines()`` (and hence
+    ``iter_lines()``) does, on ``\n``, ``\r`` and ``\r\n``.
+    """
+
+    def __init__(self, markers):
+        # markers are ASCII, so they can be searched for in the raw UTF-8 bytes
+        self.markers = [marker.encode('utf-8') for marker in markers]
+        self.line_count = 0
+
+    def scan(self, chunks):
+        """Yield the ``(lineno, line)`` pairs of the lines containing a marker."""
+        pending = b''
+        for chunk in chunks:
+            buffer = pending + chunk
+            # only scan up to the last complete line; a trailing \r may be the
+            # first half of a \r\n though
+            search_end = len(buffer) - 1 if buffer.endswith(b'\r') else len(buffer)
+            end = max(buffer.rfind(b'\n', 0, search_end), buffer.rfind(b'\r', 0, search_end)) + 1
+            yield from self._scan_buffer(buffer, end)
+            pending = buffer[end:]
+
+        if pending:
+            if not pending.endswith((b'\n', b'\r')):
+                pending += b'\n'
+            yield from self._scan_buffer(pending, len(pending))
+
+    def _scan_buffer(self, buffer, end):
+        """Scan ``buffer[:end]``, which ends with a line break."""
+        line_starts = set()
+        for marker in self.markers:
+            position = buffer.find(marker, 0, end)
+            while position != -1:
+                line_starts.add(
+                    max(buffer.rfind(b'\n', 0, position), buffer.rfind(b'\r', 0, position)) + 1
+                )
+                position = buffer.find(marker, _line_end(buffer, position, end), end)
+
+        lineno = self.line_count
+        previous_start = 0
+        for start in sorted(line_starts):
+            lineno += _count_line_breaks(buffer, previous_start, start)
+            previous_start = start
+            yield lineno, buffer[start : _line_end(buffer, start, end)]
+        self.line_count = lineno + _count_line_breaks(buffer, previous_start, end)
+
+
+def _line_end(buffer, position, end):
+    """Position of the line break ending the line at ``position``."""
+    line_feed = buffer.find(b'\n', position, end)
+    carriage_return = buffer.find(b'\r', position, end)
+    if line_feed == -1 or -1 < carriage_return < line_feed:
+        return carriage_return
+    return line_feed
+
+
+def _count_line_breaks(buffer, start, end):
+    return (
+        buffer.count(b'\n', start, end)
+        + buffer.count(b'\r', start, end)
+        - buffer.count(b'\r\n', start, end)
+    )
+
 
 class LogSizeException(Exception):
     pass
@@ -11,21 +11,29 @@ from requests.exceptions import HTTPError
 
 from treeherder.etl.text import astral_filter
 from treeherder.model.models import FailureLine, Group, JobLog, GroupStatus
-from treeherder.utils.http import fetch_text
+from treeherder.utils.http import make_request
 
 logger = logging.getLogger(__name__)
 
 
-def store_failure_lines(job_log):
-    log_iter = fetch_log(job_log)
-    if not log_iter:
+# Size of the chunks errorsummary logs are downloaded in
+READ_CHUNK_SIZE_IN_BYTES = 64 * 1024
+
+
+def store_failure_lines(job_log, fetch=None):
+    log_list = fetch_log(job_log, fetch)
+    if not log_list:
         return False
-    return write_failure_lines(job_log, log_iter)
+    return write_failure_lines(job_log, log_list)
 
 
-def fetch_log(job_log):
+def fetch_log(job_log, fetch=None):
+    """
+    ``fetch`` returns the entries of the log, in case they got downloaded up
+    front. Otherwise the log is downloaded right away.
+    """
     try:
-        log_text = fetch_text(job_log.url)
+        return fetch() if fetch else read_log(job_log.url)
     except HTTPError as e:
         job_log.update_status(JobLog.FAILED)
         if e.response is not None and e.response.status_code in (403, 404):
@@ -33,10 +41,36 @@ def fetch_log(job_log):
             return
         raise
 
-    if not log_text:
-        return
 
-    return (json.loads(item) for item in log_text.splitlines())
+def read_log(url):
+    """
+    Stream the JSON lines of an errorsummary log, decoding them as they come in.
+
+    Only the first ``FAILURE_LINES_CUTOFF + 1`` entries are ever stored, so the
+    download stops once those have been read.  An undecodable last line is
+    ignored, as it's most likely the result of the log getting cut off.
+    """
+    max_entries = settings.FAILURE_LINES_CUTOFF + 1
+    log_list = []
+    decode_error = None
+    with make_request(url, stream=True) as response:
+        for line in response.iter_lines(chunk_size=READ_CHUNK_SIZE_IN_BYTES):
+            if not line.strip():
+                continue
+            if decode_error is not None:
+                # the undecodable line wasn't the last one after all
+                raise decode_error
+            try:
+                log_list.append(json.loads(line))
+            except ValueError as e:
+                decode_error = e
+                continue
+            if len(log_list) >= max_entries:
+                break
+
+    if decode_error is not None:
+        logger.warning("Ignoring truncated last line of %s: %s", url, decode_error)
+    return log_list
 
 
 def write_failure_lines(job_log, log_iter):
@@ -104,8 +138,8 @@ def get_kwargs(failure_line):
     return {key: failure_line[key] for key in _failure_line_keys if key in failure_line}
 
 
-def create_failure_line(job_log, failure_line):
-    return FailureLine.objects.create(
+def build_failure_line(job_log, failure_line):
+    return FailureLine(
         repository=job_log.job.repository,
         job_guid=job_log.job.guid,
         job_log=job_log,
@@ -113,28 +147,55 @@ def create_failure_line(job_log, failure_line):
     )
 
 
-def create_group_result(job_log, line):
-    group_path = line["group"]
-
-    # Log to New Relic if it's not in a form we like.  We can enter
-    # Bugs to upstream to remedy them.
-    if "\\" in group_path or len(group_path) > 255:
-        newrelic.agent.record_custom_event(
-            "malformed_test_group",
-            {
-                "message": "Group paths must be relative, with no backslashes and <255 chars",
-                "group": line["group"],
-                "group_path": group_path,
-                "length": len(group_path),
-                "repository": job_log.job.repository,
-                "job_guid": job_log.job.guid,
-            },
-        )
-    else:
-        group, _ = Group.objects.get_or_create(name=group_path[:255])
-        GroupStatus.objects.create(
-            job_log=job_log, group=group, status=GroupStatus.get_status(line['status'])
-        )
+def get_groups(names):
+    """
+    Map each of the given group names to the id of its ``Group``, creating the
+    groups which don't exist yet.
+    """
+    groups = dict(Group.objects.filter(name__in=names).values_list('name', 'id'))
+    missing = [name for name in names if name not in groups]
+    if missing:
+        # another log of the same push may be creating some of them concurrently
+        Group.objects.bulk_create([Group(name=name) for name in missing], ignore_conflicts=True)
+        # MySQL doesn't return the ids of bulk created rows
+        groups.update(Group.objects.filter(name__in=missing).values_list('name', 'id'))
+    return groups
+
+
+def create_group_results(job_log, group_results):
+    statuses = []
+    for line in group_results:
+        group_path = line["group"]
+
+        # Log to New Relic if it's not in a form we like.  We can enter
+        # Bugs to upstream to remedy them.
+        if "\\" in group_path or len(group_path) > 255:
+            newrelic.agent.record_custom_event(
+                "malformed_test_group",
+                {
+                    "message": "Group paths must be relative, with no backslashes and <255 chars",
+                    "group": line["group"],
+                    "group_path": group_path,
+                    "length": len(group_path),
+                    "repository": job_log.job.repository,
+                    "job_guid": job_log.job.guid,
+                },
+            )
+        else:
+            statuses.append((group_path[:255], GroupStatus.get_status(line['status'])))
+
+    if not statuses:
+        return
+
+    # dict.fromkeys dedupes the names while keeping the order of the log, so
+    # new groups get their ids in the order they were first seen
+    groups = get_groups(list(dict.fromkeys(name for name, _ in statuses)))
+    GroupStatus.objects.bulk_create(
+        [
+            GroupStatus(job_log=job_log, group_id=groups[name], status=status)
+            for name, status in statuses
+        ]
+    )
 
 
 def create(job_log, log_list):
@@ -156,12 +217,14 @@ def create(job_log, log_list):
         else:
             failure_lines.append(line)
 
-    for group in group_results:
-        create_group_result(job_log, group)
+    create_group_results(job_log, group_results)
 
-    failure_line_results = [
-        create_failure_line(job_log, failure_line) for failure_line in failure_lines
-    ]
+    # A line that was already stored raises an IntegrityError for the whole
+    # batch, which write_failure_lines handles by retrying without it.
+    # Note that the created FailureLines don't have their ids set on MySQL.
+    failure_line_results = FailureLine.objects.bulk_create(
+        [build_failure_line(job_log, failure_line) for failure_line in failure_lines]
+    )
     job_log.update_status(JobLog.PARSED)
     return failure_line_results
 
@@ -0,0 +1,74 @@
+import gzip
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from treeherder.log_parser.parsers import ErrorParser
+
+
+class Command(BaseCommand):
+    help = """
+    Measure the throughput of the error parser with & without its prefilter
+    on (downloaded) live_backing logs, verifying both find the same errors
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'log_paths', nargs='+', help='Paths of the logs to parse (gzipped or plain text)'
+        )
+        parser.add_argument(
+            '--runs',
+            action='store',
+            type=int,
+            default=3,
+            help='Number of times to parse each log; the fastest run is reported',
+        )
+
+    @staticmethod
+    def _read_lines(log_path):
+        opener = gzip.open if log_path.endswith('.gz') else open
+        with opener(log_path, 'rb') as log:
+            # decode the same way ArtifactBuilderCollection does
+            return [line.decode('utf-8', 'replace') for line in log.read().splitlines()]
+
+    @staticmethod
+    def _parse(lines, prefilter):
+        parser = ErrorParser(prefilter=prefilter)
+        start = time.perf_counter()
+        for lineno, line in enumerate(lines):
+            parser.parse_line(line, lineno)
+        return time.perf_counter() - start, parser.artifact
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError("--runs must be at least 1")
+
+        print(','.join(['log', 'lines', 'megabytes', 'prefilter', 'lines per second', 'errors']))
+        for log_path in options['log_paths']:
+            lines = self._read_lines(log_path)
+            megabytes = sum(len(line) for line in lines) / 1024 / 1024
+
+            artifacts = {}
+            for prefilter in (False, True):
+                timings = []
+                for _ in range(options['runs']):
+                    elapsed, artifacts[prefilter] = self._parse(lines, prefilter)
+                    timings.append(elapsed)
+                print(
+                    ','.join(
+                        map(
+                            str,
+                            [
+                                log_path,
+                                len(lines),
+                                '%.1f' % megabytes,
+                                prefilter,
+                                '%.0f' % (len(lines) / min(timings)),
+                                len(artifacts[prefilter]),
+                            ],
+                        )
+                    )
+                )
+
+            if artifacts[True] != artifacts[False]:
+                raise CommandError("The prefilter changes the errors found in %s" % log_path)
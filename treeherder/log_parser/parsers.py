@@ -26,6 +26,11 @@ class ParserBase:
         self.artifact = []
         self.complete = False
 
+    # Literals at least one of which is contained by every line the parser
+    # needs to see, so that the other lines can be skipped without decoding
+    # them. None means the parser needs to see every line.
+    MARKERS = None
+
     def parse_line(self, line, lineno):
         """Parse a single line of the log"""
         raise NotImplementedError  # pragma no cover
@@ -112,10 +117,49 @@ class ErrorParser(ParserBase):
 
     RE_MOZHARNESS_PREFIX = re.compile(r"^\d+:\d+:\d+ +(?:DEBUG|INFO|WARNING) - +")
 
-    def __init__(self):
+    # A line can only be an error line if it contains at least one of these
+    # terms. Each term is a substring of an ``IN_SEARCH_TERMS`` entry or of the
+    # literal part of a ``RE_ERR_1_MATCH``, ``RE_ERR_MATCH`` or ``RE_ERR_SEARCH``
+    # alternative, so this must be kept in sync with them.
+    PREFILTER_TERMS = (
+        # "fatal error", "Automation Error:", "^[A-Za-z.]+Error: ", "^\[taskcluster\] Error:",
+        # "^\[[\w._-]+:(?:error|exception)\]", " error\(\d*\):", ":\d+: error:",
+        # " error R?C\d*:"
+        "rror",
+        # "FATAL ERROR", "REFTEST ERROR", "ERROR [45]\d\d:", RE_ERR_1_MATCH
+        "ERROR",
+        # RE_ERR_1_MATCH
+        "CRITICAL",
+        "FATAL",
+        "TEST-UNEXPECTED-",
+        # "Hit MOZ_CRASH", "PROCESS-CRASH"
+        "CRASH",
+        "Assertion fail",
+        "###!!! ABORT:",
+        # "SUMMARY: AddressSanitizer", "SUMMARY: ThreadSanitizer", "ThreadSanitizer: nested bug"
+        "Sanitizer",
+        "command timed out:",
+        "wget: unable ",
+        # "bash.exe: *** ", "^g?make(?:\[\d+\])?: \*\*\*", "mozmake\.(?:exe|EXE)(?:\[\d+\])?: \*\*\*"
+        "***",
+        "Unsuccessful task run with exit code: 137",
+        "YOU ARE LEAKING THE WORLD",
+        # "^[A-Za-z.]*Exception: ", "^\[[\w._-]+:(?:error|exception)\]"
+        "xception",
+        "[  FAILED  ] ",
+        "remoteFailed:",
+        "rm: cannot ",
+        "abort:",
+    )
+
+    # the TaskCluster log marker has to be seen as well, see ``parse_line``
+    MARKERS = PREFILTER_TERMS + ('[taskcluster ',)
+
+    def __init__(self, prefilter=True):
         """A simple error detection sub-parser"""
         super().__init__("errors")
         self.is_taskcluster = False
+        self.prefilter = prefilter
 
     def add(self, line, lineno):
         self.artifact.append({"linenumber": lineno, "line": line.rstrip()})
@@ -153,6 +197,11 @@ class ErrorParser(ParserBase):
         if line.startswith('[taskcluster '):
             self.is_taskcluster = True
 
+        # Stripping prefixes below only ever shortens the line, so lines without
+        # any of the terms can't turn into error lines.
+        if self.prefilter and not self.may_be_error_line(line):
+            return
+
         # For performance reasons, only do this if we have identified as
         # a TC task.
         if self.is_taskcluster:
@@ -163,6 +212,37 @@ class ErrorParser(ParserBase):
         ):
             self.add(line, lineno)
 
+    @staticmethod
+    def may_be_error_line(line):
+        """
+        Cheaply check whether a line contains any of the ``PREFILTER_TERMS``,
+        which allows skipping the regular expressions for the vast majority of
+        lines.  Chained ``in`` checks are considerably faster than a single
+        alternation regex (or ``any``), so the terms are spelled out here and
+        must be kept in the same order as ``PREFILTER_TERMS``.
+        """
+        return (
+            "rror" in line
+            or "ERROR" in line
+            or "CRITICAL" in line
+            or "FATAL" in line
+            or "TEST-UNEXPECTED-" in line
+            or "CRASH" in line
+            or "Assertion fail" in line
+            or "###!!! ABORT:" in line
+            or "Sanitizer" in line
+            or "command timed out:" in line
+            or "wget: unable " in line
+            or "***" in line
+            or "Unsuccessful task run with exit code: 137" in line
+            or "YOU ARE LEAKING THE WORLD" in line
+            or "xception" in line
+            or "[  FAILED  ] " in line
+            or "remoteFailed:" in line
+            or "rm: cannot " in line
+            or "abort:" in line
+        )
+
     def is_error_line(self, line):
         if self.RE_EXCLUDE_1_SEARCH.search(line):
             return False
@@ -190,6 +270,8 @@ class PerformanceParser(ParserBase):
     # ^M character representation of the windows end of line.
     RE_PERFORMANCE = re.compile(r'.*?PERFHERDER_DATA:\s+({.*})')
 
+    MARKERS = ('PERFHERDER_DATA:',)
+
     def __init__(self):
         super().__init__("performance_data")
 
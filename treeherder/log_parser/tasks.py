@@ -1,8 +1,10 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 import newrelic.agent
 import simplejson as json
 from celery.exceptions import SoftTimeLimitExceeded
+from django.conf import settings
 from requests.exceptions import HTTPError
 
 from treeherder.etl.artifact import serialize_artifact_json_blobs, store_job_artifacts
@@ -32,12 +34,15 @@ def parse_logs(job_id, job_log_ids, priority):
         "errorsummary_json": store_failure_lines,
         "live_backing_log": post_log_artifacts,
     }
+    # Downloading (& parsing) the logs doesn't touch the database, so it's done
+    # concurrently up front, while the results are still stored one log after
+    # the other, in order.
+    fetch_tasks = {
+        "errorsummary_json": failureline.read_log,
+        "live_backing_log": parse_text_log,
+    }
 
-    # We don't want to stop parsing logs for most Exceptions however we still
-    # need to know one occurred so we can skip further steps and reraise to
-    # trigger the retry decorator.
-    first_exception = None
-    completed_names = set()
+    job_logs_to_parse = []
     for job_log in job_logs:
         newrelic.agent.add_custom_parameter("job_log_%s_url" % job_log.name, job_log.url)
         logger.debug("parser_task for %s", job_log.id)
@@ -50,45 +55,62 @@ def parse_logs(job_id, job_log_ids, priority):
             )
             continue
 
-        parser = parser_tasks.get(job_log.name)
-        if not parser:
+        if job_log.name not in parser_tasks:
             continue
 
-        try:
-            parser(job_log)
-        except Exception as e:
-            if isinstance(e, SoftTimeLimitExceeded):
-                # stop parsing further logs but raise so NewRelic and
-                # Papertrail will still show output
-                raise
-
-            if first_exception is None:
-                first_exception = e
+        job_logs_to_parse.append(job_log)
 
-            # track the exception on NewRelic but don't stop parsing future
-            # log lines.
-            newrelic.agent.record_exception()
-        else:
-            completed_names.add(job_log.name)
+    # We don't want to stop parsing logs for most Exceptions however we still
+    # need to know one occurred so we can skip further steps and reraise to
+    # trigger the retry decorator.
+    first_exception = None
+    completed_names = set()
+    executor = ThreadPoolExecutor(max_workers=settings.LOG_PARSER_FETCH_WORKERS)
+    try:
+        fetches = [
+            executor.submit(fetch_tasks[job_log.name], job_log.url) for job_log in job_logs_to_parse
+        ]
+        for job_log, fetch in zip(job_logs_to_parse, fetches):
+            parser = parser_tasks[job_log.name]
+            try:
+                # errors of the download surface from ``fetch.result``
+                parser(job_log, fetch.result)
+            except Exception as e:
+                if isinstance(e, SoftTimeLimitExceeded):
+                    # stop parsing further logs but raise so NewRelic and
+                    # Papertrail will still show output
+                    raise
+
+                if first_exception is None:
+                    first_exception = e
+
+                # track the exception on NewRelic but don't stop parsing future
+                # log lines.
+                newrelic.agent.record_exception()
+            else:
+                completed_names.add(job_log.name)
+    finally:
+        # don't wait for the downloads of logs which won't get stored anymore
+        executor.shutdown(wait=False)
 
     # Raise so we trigger the retry decorator.
     if first_exception:
         raise first_exception
 
 
-def store_failure_lines(job_log):
+def store_failure_lines(job_log, fetch=None):
     """Store the failure lines from a log corresponding to the structured
     errorsummary file."""
     logger.debug('Running store_failure_lines for job %s', job_log.job.id)
-    failureline.store_failure_lines(job_log)
+    failureline.store_failure_lines(job_log, fetch)
 
 
-def post_log_artifacts(job_log):
+def post_log_artifacts(job_log, fetch=None):
     """Post a list of artifacts to a job."""
     logger.debug("Downloading/parsing log for log %s", job_log.id)
 
     try:
-        artifact_list = extract_text_log_artifacts(job_log)
+        artifact_list = extract_text_log_artifacts(job_log, fetch)
     except LogSizeException as e:
         job_log.update_status(JobLog.SKIPPED_SIZE)
         logger.warning('Skipping parsing log for %s: %s', job_log.id, e)
@@ -117,15 +139,24 @@ def post_log_artifacts(job_log):
         raise
 
 
-def extract_text_log_artifacts(job_log):
-    """Generate a set of artifacts by parsing from the raw text log."""
-
-    # parse a log given its url
-    artifact_bc = ArtifactBuilderCollection(job_log.url)
+def parse_text_log(url):
+    """Parse the raw text log at the given url, returning its artifacts by name."""
+    artifact_bc = ArtifactBuilderCollection(url)
     artifact_bc.parse()
+    return artifact_bc.artifacts
+
+
+def extract_text_log_artifacts(job_log, fetch=None):
+    """
+    Generate a set of artifacts by parsing from the raw text log.
+
+    ``fetch`` returns the artifacts of the log, in case it got parsed up front.
+    Otherwise the log is parsed right away.
+    """
+    artifacts = fetch() if fetch else parse_text_log(job_log.url)
 
     artifact_list = []
-    for name, artifact in artifact_bc.artifacts.items():
+    for name, artifact in artifacts.items():
         artifact_list.append(
             {
                 "job_guid": job_log.job.guid,
@@ -8,7 +8,7 @@ from django.db.backends.utils import CursorWrapper
 from django.db.models import Count
 
 from treeherder.model.data_cycling.removal_strategies import RemovalStrategy
-from treeherder.model.models import Job, JobType, JobGroup, Machine
+from treeherder.model.models import Job, JobChange, JobType, JobGroup, Machine
 from treeherder.perf.exceptions import NoDataCyclingAtAll, MaxRuntimeExceeded
 from treeherder.perf.models import (
     PerformanceSignature,
@@ -42,6 +42,7 @@ class DataCycler(ABC):
 
 class TreeherderCycler(DataCycler):
     DEFAULT_CYCLE_INTERVAL = 120  # in days
+    JOB_CHANGES_CYCLE_INTERVAL = 2  # in days
 
     def __init__(
         self, chunk_size: int, sleep_time: int, is_debug: bool = None, days: int = None, **kwargs
@@ -64,8 +65,22 @@ class TreeherderCycler(DataCycler):
         except OperationalError as e:
             logger.error("Error running cycle_data: {}".format(e))
 
+        self._remove_job_changes()
         self._remove_leftovers()
 
+    def _remove_job_changes(self):
+        logger.warning('Pruning job changes')
+        max_timestamp = datetime.now() - timedelta(days=self.JOB_CHANGES_CYCLE_INTERVAL)
+        while True:
+            delete_ids = list(
+                JobChange.objects.filter(created__lt=max_timestamp).values_list('id', flat=True)[
+                    : self.chunk_size
+                ]
+            )
+            if not delete_ids:
+                break
+            JobChange.objects.filter(id__in=delete_ids).delete()
+
     def _remove_leftovers(self):
         logger.warning('Pruning ancillary data: job types, groups and machines')
 
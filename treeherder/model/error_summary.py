@@ -1,7 +1,11 @@
 import logging
 import re
-import newrelic.agent
+import threading
+import time
+from collections import OrderedDict
 
+import newrelic.agent
+from django.conf import settings
 from django.core.cache import cache
 
 from treeherder.model.models import Bugscache, TextLogError
@@ -21,6 +25,80 @@ REFTEST_RE = re.compile(r'\s+[=!]=\s+.*')
 PREFIX_PATTERN = r'^(TEST-UNEXPECTED-\S+|PROCESS-CRASH)\s+\|\s+'
 
 
+class SearchResultsCache:
+    """
+    Process wide cache of the `Bugscache.search` results by search term.
+
+    The same failures tend to show up in many jobs (and pushes), so this saves
+    running the same FULLTEXT searches over and over. Entries expire after
+    `timeout` seconds, so newly filed bugs still get suggested, and the least
+    recently used ones are evicted once `max_size` terms are cached.
+    """
+
+    def __init__(self, timeout, max_size):
+        self.timeout = timeout
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, search_terms):
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for search_term in search_terms:
+                entry = self._entries.get(search_term)
+                if entry is None:
+                    continue
+                expires, results = entry
+                if expires <= now:
+                    del self._entries[search_term]
+                    continue
+                self._entries.move_to_end(search_term)
+                found[search_term] = results
+        return found
+
+    def set_many(self, results_by_term):
+        if self.timeout <= 0 or self.max_size <= 0:
+            return
+        expires = time.monotonic() + self.timeout
+        with self._lock:
+            for search_term, results in results_by_term.items():
+                self._entries[search_term] = (expires, results)
+                self._entries.move_to_end(search_term)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+search_results_cache = SearchResultsCache(
+    settings.BUG_SUGGESTION_SEARCH_CACHE_TIMEOUT, settings.BUG_SUGGESTION_SEARCH_CACHE_SIZE
+)
+
+
+def search_bugs(search_terms):
+    """
+    Get the bugs matching each of the given search terms, as a dict keyed by
+    search term, only searching the Bugscache for the terms not cached yet.
+    """
+    results = search_results_cache.get_many(search_terms)
+    missing = [search_term for search_term in search_terms if search_term not in results]
+    if missing:
+        found, failed_terms = Bugscache.search_many_with_failures(missing)
+        # search for the failed terms again next time, rather than not suggesting any bugs
+        search_results_cache.set_many(
+            {
+                search_term: bugs
+                for search_term, bugs in found.items()
+                if search_term not in failed_terms
+            }
+        )
+        results.update(found)
+    return results
+
+
 def get_error_summary(job):
     """
     Create a list of bug suggestions for a job.
@@ -38,10 +116,7 @@ def get_error_summary(job):
     if not errors:
         return []
 
-    # cache terms generated from error line to save excessive querying
-    term_cache = {}
-
-    error_summary = [bug_suggestions_line(err, term_cache) for err in errors]
+    error_summary = get_bug_suggestions(errors)
 
     try:
         cache.set(cache_key, error_summary, BUG_SUGGESTION_CACHE_TIMEOUT)
@@ -52,51 +127,71 @@ def get_error_summary(job):
     return error_summary
 
 
-def bug_suggestions_line(err, term_cache=None):
+def bug_suggestions_line(err):
     """
     Get Bug suggestions for a given TextLogError (err).
 
-    Tries to extract a search term from a clean version of the given error's
-    line.  We build a search term from the cleaned line and use that to search
-    for bugs.  Returns a dictionary with the cleaned line, the generated search
-    term, and any bugs found with said search term.
+    See `get_bug_suggestions`.
+    """
+    return get_bug_suggestions([err])[0]
+
+
+def get_bug_suggestions(errors):
     """
-    if term_cache is None:
-        term_cache = {}
+    Get Bug suggestions for the given TextLogErrors.
 
+    Tries to extract a search term from a clean version of each error's line.
+    We build a search term from the cleaned line and use that to search for
+    bugs.  Returns a dictionary per error with the cleaned line, the generated
+    search term, and any bugs found with said search term.
+
+    The search terms of all the errors are looked up at once, first the ones
+    generated from the lines, then the crash signatures of the lines for which
+    that didn't yield any bugs.
+    """
     # remove the mozharness prefix
-    clean_line = get_cleaned_line(err.line)
+    clean_lines = [get_cleaned_line(err.line) for err in errors]
 
-    # get a meaningful search term out of the error line
-    search_term = get_error_search_term(clean_line)
-    bugs = dict(open_recent=[], all_others=[])
+    # get a meaningful search term out of the error lines
+    line_search_terms = [get_error_search_term(clean_line) for clean_line in clean_lines]
+    bugs_by_term = search_bugs(list(dict.fromkeys(filter(None, line_search_terms))))
 
-    # collect open recent and all other bugs suggestions
-    search_terms = []
-    if search_term:
-        search_terms.append(search_term)
-        if search_term not in term_cache:
-            term_cache[search_term] = Bugscache.search(search_term)
-        bugs = term_cache[search_term]
-
-    if not bugs or not (bugs['open_recent'] or bugs['all_others']):
-        # no suggestions, try to use
-        # the crash signature as search term
-        crash_signature = get_crash_signature(clean_line)
+    # no suggestions, try to use the crash signatures as search terms
+    crash_signatures = [
+        None if has_bugs(bugs_by_term.get(search_term)) else get_crash_signature(clean_line)
+        for clean_line, search_term in zip(clean_lines, line_search_terms)
+    ]
+    bugs_by_signature = search_bugs(list(dict.fromkeys(filter(None, crash_signatures))))
+
+    bug_suggestions = []
+    for err, clean_line, search_term, crash_signature in zip(
+        errors, clean_lines, line_search_terms, crash_signatures
+    ):
+        # collect open recent and all other bugs suggestions
+        bugs = dict(open_recent=[], all_others=[])
+        search_terms = []
+        if search_term:
+            search_terms.append(search_term)
+            bugs = bugs_by_term[search_term]
         if crash_signature:
             search_terms.append(crash_signature)
-            if crash_signature not in term_cache:
-                term_cache[crash_signature] = Bugscache.search(crash_signature)
-            bugs = term_cache[crash_signature]
-
-    # TODO: Rename 'search' to 'error_text' or similar, since that's
-    # closer to what it actually represents (bug 1091060).
-    return {
-        "search": clean_line,
-        "search_terms": search_terms,
-        "bugs": bugs,
-        "line_number": err.line_number,
-    }
+            bugs = bugs_by_signature[crash_signature]
+
+        # TODO: Rename 'search' to 'error_text' or similar, since that's
+        # closer to what it actually represents (bug 1091060).
+        bug_suggestions.append(
+            {
+                "search": clean_line,
+                "search_terms": search_terms,
+                "bugs": bugs,
+                "line_number": err.line_number,
+            }
+        )
+    return bug_suggestions
+
+
+def has_bugs(bugs):
+    return bool(bugs and (bugs['open_recent'] or bugs['all_others']))
 
 
 def get_cleaned_line(line):
@@ -0,0 +1,88 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from treeherder.model.models import FailureLine
+from treeherder.push_health.utils import clean_test, clean_test_hit_rate
+
+
+class Command(BaseCommand):
+    help = """
+    Measure the throughput of clean_test with & without its cache on a corpus
+    of test names, verifying both clean the names the same way
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'corpus_paths',
+            nargs='*',
+            help='Paths of text files with one test name per line',
+        )
+        parser.add_argument(
+            '--failure-lines',
+            action='store',
+            type=int,
+            default=0,
+            help='Also use the test, signature & message of this many of the latest failure lines',
+        )
+        parser.add_argument(
+            '--runs',
+            action='store',
+            type=int,
+            default=3,
+            help='Number of times to clean the corpus; the fastest run is reported',
+        )
+
+    @staticmethod
+    def _read_corpus(corpus_paths, failure_lines):
+        corpus = []
+        for corpus_path in corpus_paths:
+            with open(corpus_path, encoding='utf-8') as corpus_file:
+                corpus.extend((line.rstrip('\n'), None, None) for line in corpus_file)
+        if failure_lines:
+            corpus.extend(
+                FailureLine.objects.order_by('-id').values_list('test', 'signature', 'message')[
+                    :failure_lines
+                ]
+            )
+        return corpus
+
+    @staticmethod
+    def _clean(corpus, clean):
+        start = time.perf_counter()
+        names = [clean(*entry) for entry in corpus]
+        return time.perf_counter() - start, names
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError("--runs must be at least 1")
+        corpus = self._read_corpus(options['corpus_paths'], options['failure_lines'])
+        if not corpus:
+            raise CommandError("The corpus is empty")
+
+        print(','.join(['variant', 'names', 'names per second', 'cache hit rate']))
+
+        def report(variant, timings, hit_rate=''):
+            print(
+                ','.join(
+                    [variant, str(len(corpus)), '%.0f' % (len(corpus) / min(timings)), hit_rate]
+                )
+            )
+
+        timings = []
+        for _ in range(options['runs']):
+            elapsed, uncached = self._clean(corpus, clean_test.__wrapped__)
+            timings.append(elapsed)
+        report('uncached', timings)
+
+        clean_test.cache_clear()
+        elapsed, cached = self._clean(corpus, clean_test)
+        report('cold cache', [elapsed], '%.2f' % clean_test_hit_rate())
+        timings = []
+        for _ in range(options['runs']):
+            elapsed, warm = self._clean(corpus, clean_test)
+            timings.append(elapsed)
+        report('warm cache', timings, '%.2f' % clean_test_hit_rate())
+
+        if cached != uncached or warm != uncached:
+            raise CommandError("The cache of clean_test changes the clean test names")
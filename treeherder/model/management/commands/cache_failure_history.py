@@ -7,8 +7,10 @@ from treeherder.push_health.tests import (
     fixed_by_commit_history_days,
     get_history,
     intermittent_history_days,
+    refresh_day_histories,
     CACHE_KEY_ROOT,
 )
+from treeherder.push_health.utils import clean_test_hit_rate
 from treeherder.webapp.api.utils import REPO_GROUPS
 
 
@@ -32,6 +34,14 @@ class Command(BaseCommand):
             type=int,
             help='Number of history sets to store (one for each day prior to today)',
         )
+        parser.add_argument(
+            '--refresh-days',
+            action='store',
+            dest='refresh_days',
+            default=5,
+            type=int,
+            help='Number of past days to recompute the failure counts of, to pick up new classifications',
+        )
 
     def handle(self, *args, **options):
         self.is_debug = options['debug']
@@ -41,8 +51,17 @@ class Command(BaseCommand):
 
         option_map = OptionCollection.objects.get_option_collection_map()
         repository_ids = REPO_GROUPS['trunk']
+        today = datetime.datetime.now().date()
+
+        # Only complete days get a bucket; the history of a push date ends 2 days before it anyway.
+        refresh_days = [
+            today - datetime.timedelta(days=day) for day in range(1, options['refresh_days'] + 1)
+        ]
+        refresh_day_histories(refresh_days, option_map)
+        self.debug(f'Recomputed failure counts of {len(refresh_days)} days')
+
         for day in range(days):
-            push_date = datetime.datetime.now().date() - datetime.timedelta(days=day)
+            push_date = today - datetime.timedelta(days=day)
 
             get_history(4, push_date, intermittent_history_days, option_map, repository_ids, True)
 
@@ -54,6 +73,8 @@ class Command(BaseCommand):
 
             self.debug(f'Cached failure history for {CACHE_KEY_ROOT}:{2}:{push_date}')
 
+        self.debug(f'clean_test cache hit rate: {clean_test_hit_rate():.0%}')
+
     def debug(self, msg):
         if self.is_debug:
             self.stdout.write(msg)
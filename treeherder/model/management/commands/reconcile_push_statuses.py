@@ -0,0 +1,61 @@
+import datetime
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from treeherder.model.models import Push
+
+
+class Command(BaseCommand):
+    help = """
+    Recompute the cached job status summaries of recent pushes from their jobs,
+    reporting (and fixing) the ones which drifted
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            action='store',
+            type=int,
+            default=1,
+            help='Reconcile the pushes of the last number of days (defaults to 1)',
+        )
+        parser.add_argument(
+            '--repository', action='store', help='Only reconcile the pushes of this repository'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            action='store',
+            type=int,
+            default=100,
+            help='Amount of pushes to reconcile at a time (defaults to 100)',
+        )
+
+    def handle(self, *args, **options):
+        pushes = Push.objects.filter(
+            time__gte=datetime.datetime.now() - datetime.timedelta(days=options['days'])
+        )
+        if options['repository']:
+            pushes = pushes.filter(repository__name=options['repository'])
+        push_ids = list(pushes.order_by('id').values_list('id', flat=True))
+
+        drifted = 0
+        chunk_size = options['chunk_size']
+        for start in range(0, len(push_ids), chunk_size):
+            chunk = push_ids[start : start + chunk_size]
+            cached = cache.get_many([Push.status_cache_key(push_id) for push_id in chunk])
+            statuses = Push.compute_statuses(chunk)
+            for push_id, status in statuses.items():
+                cached_status = cached.get(Push.status_cache_key(push_id))
+                if cached_status is not None and cached_status != status:
+                    drifted += 1
+                    self.stdout.write(
+                        "Status of push {} drifted: {} instead of {}".format(
+                            push_id, cached_status, status
+                        )
+                    )
+            Push.cache_statuses(statuses)
+
+        self.stdout.write(
+            "Reconciled the status of {} pushes, {} had drifted".format(len(push_ids), drifted)
+        )
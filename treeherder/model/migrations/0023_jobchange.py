@@ -0,0 +1,48 @@
+# Generated by Django 3.1.12 on 2021-08-16 09:21
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('model', '0022_support_group_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobChange',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('state', models.CharField(max_length=25)),
+                ('result', models.CharField(max_length=25)),
+                ('created', models.DateTimeField(auto_now_add=True, db_index=True)),
+                (
+                    'failure_classification',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='+',
+                        to='model.failureclassification',
+                    ),
+                ),
+                (
+                    'job',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='changes',
+                        to='model.job',
+                    ),
+                ),
+                (
+                    'repository',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to='model.repository'
+                    ),
+                ),
+            ],
+            options={
+                'db_table': 'job_change',
+            },
+        ),
+    ]
@@ -147,12 +147,59 @@ class Push(models.Model):
     def total_jobs(self, job_type, result):
         return self.jobs.filter(job_type=job_type, result=result).count()
 
+    # how long the status of a push is cached for; it's invalidated as soon as
+    # any of its jobs changes anyway, this only limits how long it can drift
+    STATUS_CACHE_TIMEOUT = 30 * 60
+
     def get_status(self):
         """
         Gets a summary of what passed/failed for the push
         """
+        return Push.get_statuses([self.id])[self.id]
+
+    @staticmethod
+    def status_cache_key(push_id):
+        return 'push-status-{}'.format(push_id)
+
+    @classmethod
+    def get_statuses(cls, push_ids):
+        """
+        Gets the summaries of what passed/failed for many pushes at once, as a
+        dict by push id.
+
+        Summaries are cached until one of the jobs of the push changes, the
+        ones which aren't get computed with a single query.
+        """
+        push_ids = list(push_ids)
+        cached = cache.get_many([cls.status_cache_key(push_id) for push_id in push_ids])
+        statuses = {
+            push_id: cached[cls.status_cache_key(push_id)]
+            for push_id in push_ids
+            if cls.status_cache_key(push_id) in cached
+        }
+
+        missing = [push_id for push_id in push_ids if push_id not in statuses]
+        if missing:
+            computed = cls.compute_statuses(missing)
+            cls.cache_statuses(computed)
+            statuses.update(computed)
+
+        return statuses
+
+    @classmethod
+    def cache_statuses(cls, statuses):
+        cache.set_many(
+            {cls.status_cache_key(push_id): status for push_id, status in statuses.items()},
+            cls.STATUS_CACHE_TIMEOUT,
+        )
+
+    @classmethod
+    def compute_statuses(cls, push_ids):
+        """
+        Computes the summaries of what passed/failed for the given pushes
+        """
         jobs = (
-            Job.objects.filter(push=self)
+            Job.objects.filter(push_id__in=push_ids)
             .filter(
                 Q(failure_classification__isnull=True)
                 | Q(failure_classification__name='not classified')
@@ -160,20 +207,30 @@ class Push(models.Model):
             .exclude(tier=3)
         )
 
-        status_dict = {'completed': 0, 'pending': 0, 'running': 0}
-        for (state, result, total) in jobs.values_list('state', 'result').annotate(
-            total=Count('result')
-        ):
+        statuses = {push_id: {'completed': 0, 'pending': 0, 'running': 0} for push_id in push_ids}
+        for (push_id, state, result, total) in jobs.values_list(
+            'push_id', 'state', 'result'
+        ).annotate(total=Count('result')):
+            status_dict = statuses[push_id]
             if state == 'completed':
                 status_dict[result] = total
                 status_dict[state] += total
             else:
                 status_dict[state] = total
-        if 'superseded' in status_dict:
-            # backward compatability for API consumers
-            status_dict['coalesced'] = status_dict['superseded']
+        for status_dict in statuses.values():
+            if 'superseded' in status_dict:
+                # backward compatability for API consumers
+                status_dict['coalesced'] = status_dict['superseded']
 
-        return status_dict
+        return statuses
+
+    @classmethod
+    def invalidate_statuses(cls, push_ids):
+        """
+        Drops the cached summaries of the given pushes, to be called whenever
+        the state, result, classification or tier of their jobs change
+        """
+        cache.delete_many([cls.status_cache_key(push_id) for push_id in push_ids])
 
 
 class Commit(models.Model):
@@ -238,8 +295,48 @@ class Bugscache(models.Model):
         # for errors that have been pasted in still works.
         return re.sub(mysql_fts_operators_re, " ", search_term)
 
+    # Maximum amount of search terms looked up by a single query of `search_many`
+    SEARCH_BATCH_SIZE = 20
+
+    # One (parenthesized, so it can have its own ORDER BY & LIMIT) part of the
+    # UNION in the queries of `search_many`
+    SEARCH_SUBQUERY = """
+            (SELECT id, summary, crash_signature, keywords, os, resolution, status, whiteboard,
+             MATCH (`summary`) AGAINST (%s IN BOOLEAN MODE) AS relevance,
+             %s AS term_index
+              FROM bugscache
+             WHERE 1
+               AND `summary` LIKE CONCAT ('%%%%', %s, '%%%%') ESCAPE '='
+               AND {condition}
+          ORDER BY relevance DESC
+             LIMIT 0,%s)
+    """
+
     @classmethod
     def search(self, search_term):
+        return self.search_many([search_term])[search_term]
+
+    @classmethod
+    def search_many(self, search_terms):
+        """
+        Search for the bugs matching each of the given search terms.
+
+        Returns a dict of the open recent and all other matching bugs by search
+        term, the same as `search` does for a single term, while only running
+        two queries per `SEARCH_BATCH_SIZE` terms.
+        """
+        return self.search_many_with_failures(search_terms)[0]
+
+    @classmethod
+    def search_many_with_failures(self, search_terms):
+        """
+        Same as `search_many`, but also returns the set of the search terms
+        which couldn't be searched for (in either category), which lack the
+        bugs of that category.
+
+        A term the FULLTEXT search fails on also fails the query of all the
+        other terms of its batch, so those get searched for one by one then.
+        """
         max_size = 50
 
         # 365 days ago as limit for recent bugs which get suggested by default
@@ -247,90 +344,96 @@ class Bugscache(models.Model):
         # hidden by default with a "Show / Hide More" link.
         time_limit = datetime.datetime.now() - datetime.timedelta(days=365)
 
-        # Do not wrap a string in quotes to search as a phrase;
-        # see https://bugzilla.mozilla.org/show_bug.cgi?id=1704311
-        search_term_fulltext = self.sanitized_search_term(search_term)
+        search_terms = list(dict.fromkeys(search_terms))
+        results = {
+            search_term: {"open_recent": [], "all_others": []} for search_term in search_terms
+        }
+        failed_terms = set()
+        categories = [
+            ("open_recent", "resolution = '' AND modified >= %s"),
+            ("all_others", "(modified < %s OR resolution <> '')"),
+        ]
 
-        # Substitute escape and wildcard characters, so the search term is used
-        # literally in the LIKE statement.
-        search_term_like = (
-            search_term.replace('=', '==').replace('%', '=%').replace('_', '=_').replace('\\"', '')
-        )
+        for start in range(0, len(search_terms), self.SEARCH_BATCH_SIZE):
+            batch = search_terms[start : start + self.SEARCH_BATCH_SIZE]
+            for category, condition in categories:
+                try:
+                    matches = self._search_batch(batch, condition, time_limit, max_size)
+                except ProgrammingError:
+                    if len(batch) == 1:
+                        failed_terms.update(batch)
+                        continue
+                    logger.warning("Searching for the terms of the batch one by one")
+                    matches = {}
+                    for search_term in batch:
+                        try:
+                            matches.update(
+                                self._search_batch([search_term], condition, time_limit, max_size)
+                            )
+                        except ProgrammingError:
+                            failed_terms.add(search_term)
+                for search_term, category_matches in matches.items():
+                    results[search_term][category] = category_matches
+
+        return results, failed_terms
 
-        recent_qs = self.objects.raw(
-            """
-            SELECT id, summary, crash_signature, keywords, os, resolution, status,
-             MATCH (`summary`) AGAINST (%s IN BOOLEAN MODE) AS relevance
-              FROM bugscache
-             WHERE 1
-               AND resolution = ''
-               AND `summary` LIKE CONCAT ('%%%%', %s, '%%%%') ESCAPE '='
-               AND modified >= %s
-          ORDER BY relevance DESC
-             LIMIT 0,%s
-            """,
-            [search_term_fulltext, search_term_like, time_limit, max_size],
+    @classmethod
+    def _search_batch(self, batch, condition, time_limit, max_size):
+        """
+        Run a single query for the bugs matching each of the search terms of
+        `batch` in one category, returning them by search term.
+        """
+        subquery = self.SEARCH_SUBQUERY.format(condition=condition)
+        params = []
+        for term_index, search_term in enumerate(batch):
+            params += [
+                # Do not wrap a string in quotes to search as a phrase;
+                # see https://bugzilla.mozilla.org/show_bug.cgi?id=1704311
+                self.sanitized_search_term(search_term),
+                term_index,
+                self.escaped_like_term(search_term),
+                time_limit,
+                max_size,
+            ]
+        qs = self.objects.raw(
+            " UNION ALL ".join([subquery] * len(batch)) + " ORDER BY term_index, relevance DESC",
+            params,
         )
 
+        matches = {search_term: [] for search_term in batch}
         try:
-            open_recent_match_string = [
-                model_to_dict(item, exclude=["modified"]) for item in recent_qs
-            ]
-            open_recent = [
-                match
-                for match in open_recent_match_string
-                if match["summary"].startswith(search_term)
-                or "/" + search_term in match["summary"]
-                or " " + search_term in match["summary"]
-                or "\\" + search_term in match["summary"]
-                or "," + search_term in match["summary"]
-            ]
+            for item in qs:
+                search_term = batch[item.term_index]
+                match = model_to_dict(item, exclude=["modified"])
+                if self.matches_search_term(match["summary"], search_term):
+                    matches[search_term].append(match)
         except ProgrammingError as e:
             newrelic.agent.record_exception()
             logger.error(
                 'Failed to execute FULLTEXT search on Bugscache, error={}, SQL={}'.format(
-                    e, recent_qs.query.__str__()
+                    e, qs.query.__str__()
                 )
             )
-            open_recent = []
+            raise
+        return matches
 
-        all_others_qs = self.objects.raw(
-            """
-            SELECT id, summary, crash_signature, keywords, os, resolution, status,
-             MATCH (`summary`) AGAINST (%s IN BOOLEAN MODE) AS relevance
-              FROM bugscache
-             WHERE 1
-               AND `summary` LIKE CONCAT ('%%%%', %s, '%%%%') ESCAPE '='
-               AND (modified < %s OR resolution <> '')
-          ORDER BY relevance DESC
-             LIMIT 0,%s
-            """,
-            [search_term_fulltext, search_term_like, time_limit, max_size],
+    @classmethod
+    def escaped_like_term(self, search_term):
+        # Substitute escape and wildcard characters, so the search term is used
+        # literally in the LIKE statement.
+        return (
+            search_term.replace('=', '==').replace('%', '=%').replace('_', '=_').replace('\\"', '')
         )
 
-        try:
-            all_others_match_string = [
-                model_to_dict(item, exclude=["modified"]) for item in all_others_qs
-            ]
-            all_others = [
-                match
-                for match in all_others_match_string
-                if match["summary"].startswith(search_term)
-                or "/" + search_term in match["summary"]
-                or " " + search_term in match["summary"]
-                or "\\" + search_term in match["summary"]
-                or "," + search_term in match["summary"]
-            ]
-        except ProgrammingError as e:
-            newrelic.agent.record_exception()
-            logger.error(
-                'Failed to execute FULLTEXT search on Bugscache, error={}, SQL={}'.format(
-                    e, recent_qs.query.__str__()
-                )
-            )
-            all_others = []
-
-        return {"open_recent": open_recent, "all_others": all_others}
+    @classmethod
+    def matches_search_term(self, summary, search_term):
+        return (
+            summary.startswith(search_term)
+            or "/" + search_term in summary
+            or " " + search_term in summary
+            or "\\" + search_term in summary
+            or "," + search_term in summary
+        )
 
 
 class Machine(NamedModel):
@@ -604,6 +707,7 @@ class Job(models.Model):
     def save(self, *args, **kwargs):
         self.last_modified = datetime.datetime.now()
         super().save(*args, **kwargs)
+        Push.invalidate_statuses([self.push_id])
 
     def get_manual_classification_line(self):
         """
@@ -752,6 +856,7 @@ class BugJobMap(models.Model):
             bug_id=bug_id,
             user=user,
         )
+        JobChange.record([bug_map.job])
 
         if not user:
             return bug_map
@@ -826,6 +931,7 @@ class JobNote(models.Model):
                 name='not classified'
             ).id
         self.job.save()
+        JobChange.record([self.job])
 
     def _ensure_classification(self):
         """
@@ -890,6 +996,52 @@ class JobNote(models.Model):
         )
 
 
+class JobChange(models.Model):
+    """
+    A change of the state, result, classification or bugs of a job.
+
+    These get recorded as jobs are ingested & classified, so the incremental
+    job change feed only has to look at the changes since its pollers last
+    polled, rather than at all the jobs modified in the meantime. Only the
+    most recent changes are kept around, see TreeherderCycler.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+
+    # the index of this foreign key also covers the primary key, which is what
+    # the feed needs to page through the changes of a repository
+    repository = models.ForeignKey(Repository, on_delete=models.CASCADE)
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='changes')
+    state = models.CharField(max_length=25)
+    result = models.CharField(max_length=25)
+    failure_classification = models.ForeignKey(
+        FailureClassification, on_delete=models.CASCADE, related_name='+'
+    )
+    created = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        db_table = "job_change"
+
+    @classmethod
+    def record(cls, jobs):
+        """Record the current state, result & classification of the given jobs."""
+        cls.objects.bulk_create(
+            [
+                cls(
+                    repository_id=job.repository_id,
+                    job_id=job.id,
+                    state=job.state,
+                    result=job.result,
+                    failure_classification_id=job.failure_classification_id,
+                )
+                for job in jobs
+            ]
+        )
+
+    def __str__(self):
+        return "{0} {1} {2} {3}".format(self.id, self.job_id, self.state, self.result)
+
+
 class FailureLine(models.Model):
     # We make use of prefix indicies for several columns in this table which
     # can't be expressed in django syntax so are created with raw sql in migrations.
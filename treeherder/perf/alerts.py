@@ -13,12 +13,21 @@ from treeherder.perf.models import (
     PerformanceAlert,
     PerformanceAlertSummary,
     PerformanceDatum,
+    PerformanceDetectionState,
     PerformanceSignature,
 )
-from treeherder.perfalert.perfalert import RevisionDatum, detect_changes
+from treeherder.perfalert.perfalert import RevisionDatum, detect_changes, detection_checkpoint
+from treeherder.perfalert.perfalert.vectorized import detect_changes_vectorized
 
 logger = logging.getLogger(__name__)
 
+# Implementations of the change detection algorithm, selectable through
+# the PERFHERDER_ALERTS_DETECTION_ENGINE setting. They all yield the same results.
+DETECTION_ENGINES = {
+    'python': detect_changes,
+    'numpy': detect_changes_vectorized,
+}
+
 
 def geomean(iterable):
     # Returns a geomean of a list of values.
@@ -42,30 +51,126 @@ def get_alert_properties(prev_value, new_value, lower_is_better):
     return AlertProperties(pct_change, delta, is_regression, prev_value, new_value)
 
 
-def generate_new_alerts_in_series(signature):
-    # get series data starting from either:
-    # (1) the last alert, if there is one
-    # (2) the alerts max age
-    # (use whichever is newer)
-    max_alert_age = datetime.now() - settings.PERFHERDER_ALERTS_MAX_AGE
-    series = PerformanceDatum.objects.filter(signature=signature, push_timestamp__gte=max_alert_age)
-    latest_alert_timestamp = (
-        PerformanceAlert.objects.filter(series_signature=signature)
-        .select_related('summary__push__time')
-        .order_by('-summary__push__time')
-        .values_list('summary__push__time', flat=True)[:1]
-    )
-    if latest_alert_timestamp:
-        series = series.filter(push_timestamp__gt=latest_alert_timestamp[0])
+def _get_revision_data(series):
+    """Group a series of PerformanceDatum by push.
 
+    Returns the RevisionDatum of every push, along with the highest datum id seen.
+    """
     revision_data = {}
+    last_datum_id = 0
     for d in series:
         if not revision_data.get(d.push_id):
             revision_data[d.push_id] = RevisionDatum(
                 int(time.mktime(d.push_timestamp.timetuple())), d.push_id, []
             )
         revision_data[d.push_id].values.append(d.value)
+        last_datum_id = max(last_datum_id, d.id)
+    return revision_data, last_datum_id
+
+
+def _save_detection_state(
+    signature,
+    analyzed_series,
+    windows,
+    last_alert_push_time,
+    last_datum_id,
+    resume_from=0,
+    last_seen_regression=0,
+):
+    (first_needed, resume_from, last_seen_regression, last_stable) = detection_checkpoint(
+        analyzed_series,
+        max_back_window=windows['max_back_window'],
+        fore_window=windows['fore_window'],
+        resume_from=resume_from,
+        last_seen_regression=last_seen_regression,
+    )
+    if not resume_from:
+        # not enough data yet for any of it to be settled
+        PerformanceDetectionState.objects.filter(signature=signature).delete()
+        return
+
+    state = PerformanceDetectionState(
+        signature=signature,
+        last_alert_push_time=last_alert_push_time,
+        last_datum_id=last_datum_id,
+        last_push_id=analyzed_series[-1].push_id,
+        tail_start=datetime.fromtimestamp(analyzed_series[last_stable].push_timestamp + 1),
+        resume_from=resume_from - first_needed,
+        last_seen_regression=last_seen_regression,
+        **windows,
+    )
+    state.set_revisions(
+        [
+            [d.push_timestamp, d.push_id, d.values, d.t]
+            for d in analyzed_series[first_needed : last_stable + 1]
+        ]
+    )
+    state.save()
 
+
+def _resume_detection(signature, detect, windows, last_alert_push_time, max_alert_age):
+    """Analyze the data which came in since the last run of the alert detection.
+
+    Returns True if that data doesn't contain any changes, in which case there
+    is no need to look at the whole series. Returns False if it does or if the
+    saved detection state can't be used (e.g. because data was added to the
+    part of the series which was already analyzed).
+    """
+    try:
+        state = PerformanceDetectionState.objects.get(signature=signature)
+    except PerformanceDetectionState.DoesNotExist:
+        return False
+
+    revisions = state.get_revisions()
+    if (
+        state.last_alert_push_time != last_alert_push_time
+        or any(getattr(state, name) != value for (name, value) in windows.items())
+        # the back window must not reach past the data a full analysis would look at
+        or datetime.fromtimestamp(revisions[0][0]) < max_alert_age
+    ):
+        return False
+
+    new_data = PerformanceDatum.objects.filter(signature=signature, id__gt=state.last_datum_id)
+    if last_alert_push_time:
+        new_data = new_data.filter(push_timestamp__gt=last_alert_push_time)
+    if new_data.filter(push_timestamp__lt=state.tail_start).exists():
+        return False
+
+    tail = PerformanceDatum.objects.filter(
+        signature=signature, push_timestamp__gte=state.tail_start
+    )
+    revision_data, last_datum_id = _get_revision_data(tail)
+    if last_datum_id <= state.last_datum_id:
+        # nothing new since the last run
+        return True
+
+    analyzed_revisions = []
+    for (push_timestamp, push_id, values, t) in revisions:
+        revision = RevisionDatum(push_timestamp, push_id, values)
+        revision.t = t
+        analyzed_revisions.append(revision)
+    analyzed_series = detect(
+        analyzed_revisions + list(revision_data.values()),
+        resume_from=state.resume_from,
+        last_seen_regression=state.last_seen_regression,
+        **windows,
+    )
+    if any(d.change_detected for d in analyzed_series[state.resume_from :]):
+        return False
+
+    _save_detection_state(
+        signature,
+        analyzed_series,
+        windows,
+        last_alert_push_time,
+        last_datum_id,
+        resume_from=state.resume_from,
+        last_seen_regression=state.last_seen_regression,
+    )
+    return True
+
+
+def generate_new_alerts_in_series(signature, engine=None):
     min_back_window = signature.min_back_window
     if min_back_window is None:
         min_back_window = settings.PERFHERDER_ALERTS_MIN_BACK_WINDOW
@@ -78,15 +183,42 @@ def generate_new_alerts_in_series(signature):
     alert_threshold = signature.alert_threshold
     if alert_threshold is None:
         alert_threshold = settings.PERFHERDER_REGRESSION_THRESHOLD
+    windows = {
+        'min_back_window': min_back_window,
+        'max_back_window': max_back_window,
+        'fore_window': fore_window,
+    }
+    detect = DETECTION_ENGINES[engine or settings.PERFHERDER_ALERTS_DETECTION_ENGINE]
 
-    data = revision_data.values()
-    analyzed_series = detect_changes(
-        data,
-        min_back_window=min_back_window,
-        max_back_window=max_back_window,
-        fore_window=fore_window,
+    # get series data starting from either:
+    # (1) the last alert, if there is one
+    # (2) the alerts max age
+    # (use whichever is newer)
+    max_alert_age = datetime.now() - settings.PERFHERDER_ALERTS_MAX_AGE
+    series = PerformanceDatum.objects.filter(signature=signature, push_timestamp__gte=max_alert_age)
+    latest_alert_timestamp = (
+        PerformanceAlert.objects.filter(series_signature=signature)
+        .select_related('summary__push__time')
+        .order_by('-summary__push__time')
+        .values_list('summary__push__time', flat=True)[:1]
     )
+    last_alert_push_time = None
+    if latest_alert_timestamp:
+        last_alert_push_time = latest_alert_timestamp[0]
+        series = series.filter(push_timestamp__gt=last_alert_push_time)
 
+    incremental = settings.PERFHERDER_ALERTS_INCREMENTAL_DETECTION
+    if incremental and _resume_detection(
+        signature, detect, windows, last_alert_push_time, max_alert_age
+    ):
+        return
+
+    revision_data, last_datum_id = _get_revision_data(series)
+
+    data = revision_data.values()
+    analyzed_series = detect(data, **windows)
+
+    alerts_generated = False
     with transaction.atomic():
         for (prev, cur) in zip(analyzed_series, analyzed_series[1:]):
             if cur.change_detected:
@@ -150,6 +282,7 @@ def generate_new_alerts_in_series(signature):
                 if t_value == float('inf'):
                     t_value = 1000
 
+                alerts_generated = True
                 PerformanceAlert.objects.update_or_create(
                     summary=summary,
                     series_signature=signature,
@@ -163,3 +296,12 @@ def generate_new_alerts_in_series(signature):
                         't_value': t_value,
                     },
                 )
+
+    if incremental:
+        if alerts_generated:
+            # the next analysis starts after the new alert
+            PerformanceDetectionState.objects.filter(signature=signature).delete()
+        else:
+            _save_detection_state(
+                signature, analyzed_series, windows, last_alert_push_time, last_datum_id
+            )
@@ -0,0 +1,87 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from treeherder.perf.alerts import DETECTION_ENGINES
+from treeherder.perfalert.perfalert import RevisionDatum
+
+
+class Command(BaseCommand):
+    help = """
+    Compare the performance alert detection engines on synthetic series,
+    verifying they produce identical results
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--size',
+            action='append',
+            type=int,
+            help='Number of data points in the series (specify multiple times to benchmark '
+            'multiple sizes, defaults to 10000 and 100000)',
+        )
+        parser.add_argument(
+            '--max-retriggers',
+            action='store',
+            type=int,
+            default=3,
+            help='Maximum amount of values per revision (defaults to 3)',
+        )
+        parser.add_argument(
+            '--seed', action='store', type=int, default=0, help='Seed for the random series'
+        )
+
+    @staticmethod
+    def _generate_series(size, max_retriggers, rng):
+        series = []
+        level = 100.0
+        num_points = 0
+        push_id = 0
+        while num_points < size:
+            # introduce a regression or improvement every now and then
+            if rng.random() < 0.01:
+                level *= rng.choice([0.9, 1.1])
+            values = [rng.gauss(level, 2) for _ in range(rng.randint(1, max_retriggers))]
+            series.append((push_id, values))
+            num_points += len(values)
+            push_id += 1
+        return series
+
+    def handle(self, *args, **options):
+        if options['max_retriggers'] < 1:
+            raise CommandError("--max-retriggers must be at least 1")
+
+        rng = random.Random(options['seed'])
+        print(','.join(['points', 'revisions', 'engine', 'seconds', 'changes detected']))
+        for size in options['size'] or [10000, 100000]:
+            series = self._generate_series(size, options['max_retriggers'], rng)
+
+            results = {}
+            for (name, detect_changes) in DETECTION_ENGINES.items():
+                data = [RevisionDatum(push_id, push_id, values) for (push_id, values) in series]
+                start = time.perf_counter()
+                analyzed = detect_changes(data)
+                elapsed = time.perf_counter() - start
+                results[name] = [
+                    (d.t, d.change_detected, getattr(d, 'forward_stats', None)) for d in analyzed
+                ]
+                print(
+                    ','.join(
+                        map(
+                            str,
+                            [
+                                size,
+                                len(series),
+                                name,
+                                '%.3f' % elapsed,
+                                sum(d.change_detected for d in analyzed),
+                            ],
+                        )
+                    )
+                )
+
+            reference = results.pop('python')
+            for (name, result) in results.items():
+                if result != reference:
+                    raise CommandError("Engine '%s' disagrees with 'python'" % name)
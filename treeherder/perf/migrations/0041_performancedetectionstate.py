@@ -0,0 +1,52 @@
+# Generated by Django 3.1.12 on 2021-08-02 10:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('model', '0022_support_group_status'),
+        ('perf', '0040_performancealert_noise_profile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PerformanceDetectionState',
+            fields=[
+                (
+                    'signature',
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name='detection_state',
+                        serialize=False,
+                        to='perf.performancesignature',
+                    ),
+                ),
+                ('min_back_window', models.IntegerField()),
+                ('max_back_window', models.IntegerField()),
+                ('fore_window', models.IntegerField()),
+                ('last_alert_push_time', models.DateTimeField(null=True)),
+                ('last_datum_id', models.IntegerField()),
+                ('tail_start', models.DateTimeField()),
+                ('revisions', models.TextField()),
+                ('resume_from', models.IntegerField()),
+                ('last_seen_regression', models.IntegerField()),
+                ('last_updated', models.DateTimeField(auto_now=True)),
+                (
+                    'last_push',
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name='+',
+                        to='model.push',
+                    ),
+                ),
+            ],
+            options={
+                'db_table': 'performance_detection_state',
+            },
+        ),
+    ]
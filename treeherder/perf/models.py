@@ -233,6 +233,58 @@ class MultiCommitDatum(models.Model):
     )
 
 
+class PerformanceDetectionState(models.Model):
+    """
+    Where the alert detection of a signature left off
+
+    Allows generating alerts by only analyzing the data that came in since
+    the previous run, instead of the whole series (see
+    `treeherder.perf.alerts.generate_new_alerts_in_series`).
+    """
+
+    signature = models.OneToOneField(
+        PerformanceSignature,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='detection_state',
+    )
+
+    # settings the series was analyzed with; any change invalidates the state
+    min_back_window = models.IntegerField()
+    max_back_window = models.IntegerField()
+    fore_window = models.IntegerField()
+    last_alert_push_time = models.DateTimeField(null=True)
+
+    # highest PerformanceDatum id and last push analyzed so far
+    last_datum_id = models.IntegerField()
+    last_push = models.ForeignKey(Push, null=True, on_delete=models.SET_NULL, related_name='+')
+
+    # data pushed from this time on gets analyzed again on the next run
+    tail_start = models.DateTimeField()
+
+    # trailing revisions needed as back window for the next run, as a JSON
+    # list of [push timestamp, push id, values, t value]
+    revisions = models.TextField()
+    resume_from = models.IntegerField()
+    last_seen_regression = models.IntegerField()
+
+    last_updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'performance_detection_state'
+
+    def get_revisions(self):
+        return json.loads(self.revisions)
+
+    def set_revisions(self, revisions):
+        self.revisions = json.dumps(revisions)
+
+    def __str__(self):
+        return "PerformanceDetectionState(signature #{}, tail from {})".format(
+            self.signature_id, self.tail_start
+        )
+
+
 class IssueTracker(models.Model):
     id = models.AutoField(primary_key=True)
     name = models.CharField(max_length=255, blank=False)
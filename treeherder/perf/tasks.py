@@ -1,12 +1,128 @@
+import logging
+
 import newrelic.agent
+from django.conf import settings
+from django_redis import get_redis_connection
 
 from treeherder.perf.alerts import generate_new_alerts_in_series
 from treeherder.perf.models import PerformanceSignature
 from treeherder.workers.task import retryable_task
 
+logger = logging.getLogger(__name__)
+
+# Redis keys used for coalescing alert generation requests
+PENDING_SIGNATURES_KEY = 'perf-alerts:pending-signatures'
+PROCESSING_SIGNATURES_KEY = 'perf-alerts:processing-signatures'
+BATCH_SCHEDULED_KEY = 'perf-alerts:batch-scheduled'
+BATCH_LOCK_KEY = 'perf-alerts:batch-lock'
+REQUESTED_COUNTER_KEY = 'perf-alerts:requested'
+EXECUTED_COUNTER_KEY = 'perf-alerts:executed'
+
 
 @retryable_task(name='generate-alerts', max_retries=10)
 def generate_alerts(signature_id):
     newrelic.agent.add_custom_parameter("signature_id", str(signature_id))
     signature = PerformanceSignature.objects.get(id=signature_id)
     generate_new_alerts_in_series(signature)
+
+
+def schedule_alert_generation(signature_id):
+    """
+    Request alert generation for a signature.
+
+    With a coalescing window configured, the request is only recorded and a
+    single `generate_alerts_batch` task is scheduled to run at the end of the
+    window, so that the many requests for the same signature caused by
+    retriggers & multi-job pushes are handled by one alert generation.
+    """
+    window = settings.PERFHERDER_ALERTS_COALESCING_WINDOW
+    if not window:
+        generate_alerts.apply_async(args=[signature_id], queue='generate_perf_alerts')
+        return
+
+    redis = get_redis_connection('default')
+    pipeline = redis.pipeline()
+    pipeline.sadd(PENDING_SIGNATURES_KEY, signature_id)
+    pipeline.incr(REQUESTED_COUNTER_KEY)
+    pipeline.execute()
+
+    # the key expires on its own, so a lost batch task can't block alert
+    # generation for good; at worst, a redundant batch gets scheduled
+    if redis.set(BATCH_SCHEDULED_KEY, 1, nx=True, ex=2 * window):
+        generate_alerts_batch.apply_async(queue='generate_perf_alerts', countdown=window)
+
+
+@retryable_task(name='generate-alerts-batch', max_retries=10)
+def generate_alerts_batch():
+    """
+    Generate the alerts of all the signatures requested since the last batch.
+
+    Only one batch runs at a time: a batch scheduled while another is still
+    running (because it takes longer than the coalescing window) is deferred.
+
+    Each signature is only moved from the pending to the processing set while
+    its alerts get generated, and removed once done.  So if the worker dies
+    mid-batch, the signatures it didn't get to are still around when the
+    (late acknowledged, hence redelivered) batch task runs again.
+    """
+    window = settings.PERFHERDER_ALERTS_COALESCING_WINDOW
+    redis = get_redis_connection('default')
+    # the lock expires on its own once the batch is over the time limit, so
+    # a batch whose worker got killed can't block the next ones for good
+    lock = redis.lock(BATCH_LOCK_KEY, timeout=settings.CELERY_TASK_TIME_LIMIT)
+    if not lock.acquire(blocking=False):
+        # the running batch may already be past the requests this batch is
+        # for, so try again once the window is over
+        redis.set(BATCH_SCHEDULED_KEY, 1, ex=2 * window)
+        generate_alerts_batch.apply_async(queue='generate_perf_alerts', countdown=window)
+        return
+    try:
+        _generate_alerts_batch(redis)
+    finally:
+        lock.release()
+
+
+def _generate_alerts_batch(redis):
+    # allow requests coming in from now on to schedule another batch; this
+    # must happen before looking at the pending signatures, so none get lost
+    redis.delete(BATCH_SCHEDULED_KEY)
+    pipeline = redis.pipeline()  # transactional, so no request slips in between
+    # take back the signature a previous (dead, as this holds the lock) run of
+    # the batch was processing
+    pipeline.sunionstore(PENDING_SIGNATURES_KEY, PENDING_SIGNATURES_KEY, PROCESSING_SIGNATURES_KEY)
+    pipeline.delete(PROCESSING_SIGNATURES_KEY)
+    pipeline.smembers(PENDING_SIGNATURES_KEY)
+    *_, signature_ids = pipeline.execute()
+    signature_ids = sorted(int(signature_id) for signature_id in signature_ids)
+
+    newrelic.agent.add_custom_parameter("signature_count", len(signature_ids))
+    signatures = PerformanceSignature.objects.filter(id__in=signature_ids).order_by('id')
+    for signature in signatures:
+        # a request for the signature coming in from now on adds it to the
+        # pending set again, for the next batch
+        redis.smove(PENDING_SIGNATURES_KEY, PROCESSING_SIGNATURES_KEY, signature.id)
+        try:
+            generate_new_alerts_in_series(signature)
+        except Exception as e:
+            # don't make the other signatures wait for retries of this one
+            logger.warning("Failed to generate alerts for signature %s: %s", signature.id, e)
+            newrelic.agent.record_exception()
+            generate_alerts.apply_async(args=[signature.id], queue='generate_perf_alerts')
+        else:
+            redis.incr(EXECUTED_COUNTER_KEY)
+        redis.srem(PROCESSING_SIGNATURES_KEY, signature.id)
+
+    # forget about the signatures which got deleted in the meantime
+    missing_ids = set(signature_ids) - {signature.id for signature in signatures}
+    if missing_ids:
+        redis.srem(PENDING_SIGNATURES_KEY, *missing_ids)
+
+
+def get_alert_generation_counters():
+    """
+    Amount of alert generation requests received vs. actually executed since
+    the counters were last reset.
+    """
+    redis = get_redis_connection('default')
+    requested, executed = redis.mget(REQUESTED_COUNTER_KEY, EXECUTED_COUNTER_KEY)
+    return {'requested': int(requested or 0), 'executed': int(executed or 0)}
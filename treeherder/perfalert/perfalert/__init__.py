@@ -117,13 +117,24 @@ class RevisionDatum:
         )
 
 
-def detect_changes(data, min_back_window=12, max_back_window=24, fore_window=12, t_threshold=7):
+def detect_changes(
+    data,
+    min_back_window=12,
+    max_back_window=24,
+    fore_window=12,
+    t_threshold=7,
+    resume_from=0,
+    last_seen_regression=0,
+):
     # Use T-Tests
     # Analyze test data using T-Tests, comparing data[i-j:i] to data[i:i+k]
+    #
+    # `resume_from` and `last_seen_regression` allow continuing a previous
+    # analysis (see `detection_checkpoint`): the data before `resume_from`
+    # is only used as back window, their t values are expected to be set already.
     data = sorted(data)
 
-    last_seen_regression = 0
-    for i in range(1, len(data)):
+    for i in range(max(1, resume_from), len(data)):
         di = data[i]
 
         # keep on getting previous data until we've either got at least 12
@@ -165,7 +176,7 @@ def detect_changes(data, min_back_window=12, max_back_window=24, fore_window=12,
 
     # Now that the t-test scores are calculated, go back through the data to
     # find where changes most likely happened.
-    for i in range(1, len(data)):
+    for i in range(max(1, resume_from), len(data)):
         di = data[i]
 
         # if we don't have enough data yet, skip for now (until more comes
@@ -191,3 +202,67 @@ def detect_changes(data, min_back_window=12, max_back_window=24, fore_window=12,
         di.change_detected = True
 
     return data
+
+
+def detection_checkpoint(
+    data,
+    max_back_window=24,
+    fore_window=12,
+    t_threshold=7,
+    resume_from=0,
+    last_seen_regression=0,
+):
+    """Find how to resume `detect_changes` once more data is appended to `data`.
+
+    `data` is a series as returned by `detect_changes` (analyzed with the same
+    windows and threshold, and resumed from `resume_from` with
+    `last_seen_regression`, if it was).  Returns a tuple
+    `(first_needed, new_resume_from, new_last_seen_regression, last_stable)`:
+
+    * the t values before `new_resume_from` won't change anymore, as their fore
+      windows are complete; `detect_changes` should be resumed from there with
+      `new_last_seen_regression`
+    * `data[first_needed:last_stable + 1]` is all the data that resuming needs,
+      provided that only data newer than `data[last_stable]` gets added
+    """
+    num_revisions = len(data)
+
+    # the first point which doesn't have a complete fore window yet
+    incomplete = num_revisions
+    amount_next_data = 0
+    for i in range(num_revisions - 1, 0, -1):
+        amount_next_data += len(data[i].values)
+        if amount_next_data >= fore_window:
+            break
+        incomplete = i
+
+    # the change detection of the point just before also depends on the t
+    # value of its successor, so it has to be evaluated again as well
+    new_resume_from = max(incomplete - 1, resume_from)
+    if new_resume_from < 2:
+        return (0, 0, 0, -1)
+
+    for i in range(max(1, resume_from), new_resume_from):
+        if data[i].t > t_threshold:
+            last_seen_regression = 0
+        else:
+            last_seen_regression += 1
+
+    # back window of the first point to analyze, plus its predecessor (whose
+    # t value is used when looking for changes)
+    first_needed = max(0, new_resume_from - max(max_back_window, 1))
+
+    # all the data that the t value of this predecessor depends on must be
+    # kept, including revisions pushed at the very same time
+    last_stable = new_resume_from - 1
+    amount_next_data = len(data[last_stable].values)
+    while amount_next_data < fore_window and last_stable + 1 < num_revisions:
+        last_stable += 1
+        amount_next_data += len(data[last_stable].values)
+    while (
+        last_stable + 1 < num_revisions
+        and data[last_stable + 1].push_timestamp == data[last_stable].push_timestamp
+    ):
+        last_stable += 1
+
+    return (first_needed, new_resume_from, last_seen_regression, last_stable)
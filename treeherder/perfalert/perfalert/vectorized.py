@@ -0,0 +1,295 @@
+"""
+A NumPy implementation of the t-test based change detection in `detect_changes`.
+
+Instead of rebuilding Python lists for the back and fore windows of every data
+point, the series is laid out as a flat array of values plus an offsets array
+(revision `i` owns `values[offsets[i]:offsets[i + 1]]`) and every statistic is
+computed for all points at once.
+
+All floating point operations are carried out in the same order as the pure
+Python implementation (sequential accumulation, `pow()` rather than
+multiplication/`sqrt()`), so the results match `detect_changes` bit for bit.
+"""
+from collections import namedtuple
+from itertools import chain
+
+import numpy as np
+
+SeriesAnalysis = namedtuple(
+    'SeriesAnalysis',
+    [
+        't',
+        'amount_prev_data',
+        'amount_next_data',
+        'historical_avg',
+        'historical_variance',
+        'forward_avg',
+        'forward_variance',
+        'change_detected',
+    ],
+)
+
+
+def _longest_first(lengths):
+    """Order the points by decreasing window length.
+
+    Walking a window position by position, the points which still have data at
+    position `k` are then always the first `active[k]` ones, which lets the
+    accumulation loops below work on plain slices instead of masks.
+    """
+    order = np.argsort(-lengths, kind='stable')
+    sorted_lengths = lengths[order]
+    max_length = int(sorted_lengths[0]) if len(sorted_lengths) else 0
+    active = np.searchsorted(-sorted_lengths, -np.arange(max_length), side='left')
+    return order, sorted_lengths, active
+
+
+def _window_avg(values, offsets, first_rev, step, num_revs, weighted):
+    """Weighted average of the revisions `first_rev, first_rev + step, ...`.
+
+    Mirrors the accumulation order of `analyze()`: the values of each revision
+    are summed first, then the per-revision sums are added up in window order.
+    When `weighted` is set, `linear_weights` is used, otherwise `default_weights`.
+    """
+    counts = np.diff(offsets)
+    order, num_revs, active = _longest_first(num_revs)
+    first_rev = first_rev[order]
+    weighted_sum = np.zeros(len(order))
+    sum_of_weights = np.zeros(len(order))
+    for position, n in enumerate(active):
+        revs = first_rev[:n] + step * position
+        if weighted:
+            weights = (num_revs[:n] - position) / num_revs[:n]
+        else:
+            weights = np.ones(n)
+        rev_counts = counts[revs]
+        rev_offsets = offsets[revs]
+        rev_sum = np.zeros(n)
+        rev_sum += values[rev_offsets] * weights
+        for j in range(1, int(rev_counts.max(initial=0))):
+            more = np.flatnonzero(rev_counts > j)
+            rev_sum[more] += values[rev_offsets[more] + j] * weights[more]
+        weighted_sum[:n] += rev_sum
+        sum_of_weights[:n] += weights * rev_counts
+
+    avg = np.zeros(len(order))
+    avg[order] = np.divide(
+        weighted_sum, sum_of_weights, out=np.zeros(len(order)), where=num_revs > 0
+    )
+    return avg
+
+
+def _window_variance(flat_values, start, length, avg):
+    """Sample variance of `flat_values[start:start + length]` around `avg`."""
+    order, length, active = _longest_first(length)
+    start = start[order]
+    avg = avg[order]
+    total = np.zeros(len(order))
+    for k, n in enumerate(active):
+        total[:n] += np.power(flat_values[start[:n] + k] - avg[:n], 2.0)
+
+    variance = np.zeros(len(order))
+    variance[order] = np.divide(total, length - 1, out=np.zeros(len(order)), where=length > 1)
+    return variance
+
+
+def _calc_t(back, fore):
+    """Vectorized equivalent of `abs(calc_t(jw, kw, linear_weights))`."""
+    (back_avg, back_variance, back_n), (fore_avg, fore_variance, fore_n) = back, fore
+    delta_s = fore_avg - back_avg
+    defined = (back_n > 0) & (fore_n > 0) & (delta_s != 0)
+    zero_variance = (back_variance == 0) & (fore_variance == 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = delta_s / np.power(back_variance / back_n + fore_variance / fore_n, 0.5)
+    t = np.where(zero_variance, np.inf, t)
+    return np.abs(np.where(defined, t, 0.0))
+
+
+def analyze_series(
+    values,
+    offsets,
+    min_back_window=12,
+    max_back_window=24,
+    fore_window=12,
+    t_threshold=7,
+    resume_from=0,
+    last_seen_regression=0,
+    known_t=(),
+):
+    """Run the `detect_changes` algorithm over an already sorted series.
+
+    `values` is a flat array with the data of every revision and `offsets` has
+    one more element than there are revisions, such that the values of revision
+    `i` are `values[offsets[i]:offsets[i + 1]]`.  Returns a `SeriesAnalysis` of
+    per-revision arrays; as in `detect_changes`, the entries for the first
+    revision are left unset (zero).
+
+    When resuming a previous analysis, `known_t` holds the t values of the
+    revisions before `resume_from`; the other results are only meaningful from
+    `resume_from` onwards.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    num_revisions = len(offsets) - 1
+    total = int(offsets[-1])
+    points = np.arange(num_revisions)
+
+    # the data of the fore window is contiguous in `values`, while the back
+    # window walks the revisions backwards; lay the revisions out in reverse
+    # order so that the back window is contiguous as well
+    value_revisions = np.repeat(points, np.diff(offsets))
+    reversed_values = values[np.argsort(num_revisions - 1 - value_revisions, kind='stable')]
+
+    # fore window: revisions `i` onwards, until we have at least `fore_window` values
+    fore_end = np.searchsorted(offsets, offsets[points] + fore_window, side='left')
+    fore_end = np.clip(fore_end, points, num_revisions)
+    fore_revs = fore_end - points
+    amount_next_data = offsets[fore_end] - offsets[points]
+    fore_stats = []
+    for weighted in (False, True):
+        avg = _window_avg(values, offsets, points, 1, fore_revs, weighted)
+        fore_stats.append(
+            (
+                avg,
+                _window_variance(values, offsets[points], amount_next_data, avg),
+                amount_next_data,
+            )
+        )
+
+    # back window: revisions `i - 1` backwards, until we either have
+    # `max_back_window` values or hit the (data dependent) revision limit
+    first_fitting = np.searchsorted(offsets, offsets[points] - max_back_window, side='right') - 1
+    max_back_revs = np.minimum(points, np.where(first_fitting >= 0, points - first_fitting, points))
+    min_limit = min(max(0, min_back_window), max_back_window)
+    limits = range(min_limit, max_back_window + 1)
+
+    def back_window(limit, points=points):
+        back_revs = np.clip(np.minimum(limit, max_back_revs[points]), 0, None)
+        length = offsets[points] - offsets[points - back_revs]
+        return back_revs, length, total - offsets[points]
+
+    # the revision limit of the back window depends on the t-test of the
+    # previous point, so compute the t-test for every possible limit first
+    # (only where the limit actually changes the window)...
+    t_by_limit = []
+    for limit in limits:
+        if limit == min_limit:
+            subset = points
+        else:
+            subset = np.flatnonzero(max_back_revs >= limit)
+        back_revs, length, start = back_window(limit, subset)
+        avg = _window_avg(values, offsets, subset - 1, -1, back_revs, True)
+        back = (avg, _window_variance(reversed_values, start, length, avg), length)
+        fore = tuple(stat[subset] for stat in fore_stats[1])
+        t_for_limit = np.zeros(num_revisions)
+        t_for_limit[subset] = _calc_t(back, fore)
+        t_by_limit.append(t_for_limit.tolist())
+
+    # ...then pick the right one in a (cheap) sequential pass
+    max_back_revs_list = max_back_revs.tolist()
+    chosen_limit = [min_limit] * num_revisions
+    t = [0.0] * num_revisions
+    t[: len(known_t)] = known_t
+    for i in range(max(1, resume_from), num_revisions):
+        limit = min(max(last_seen_regression, min_back_window), max_back_window)
+        chosen_limit[i] = limit
+        t[i] = t_by_limit[max(min(limit, max_back_revs_list[i]), min_limit) - min_limit][i]
+        if t[i] > t_threshold:
+            last_seen_regression = 0
+        else:
+            last_seen_regression += 1
+    chosen_limit = np.array(chosen_limit, dtype=np.int64)
+    t = np.array(t)
+
+    back_revs, amount_prev_data, start = back_window(chosen_limit)
+    historical_avg = _window_avg(values, offsets, points - 1, -1, back_revs, False)
+    historical_variance = _window_variance(reversed_values, start, amount_prev_data, historical_avg)
+
+    # a change is detected where the t value is above the threshold, there is
+    # enough data on both sides and neither neighbour has a higher t value
+    prev_t = np.concatenate([[np.inf], t])[:-1]
+    next_t = np.concatenate([t, [-np.inf]])[1:]
+    change_detected = (
+        (points > 0)
+        & (amount_prev_data >= min_back_window)
+        & (amount_next_data >= fore_window)
+        & (t > t_threshold)
+        & (prev_t <= t)
+        & (next_t <= t)
+    )
+
+    return SeriesAnalysis(
+        t=t,
+        amount_prev_data=amount_prev_data,
+        amount_next_data=amount_next_data,
+        historical_avg=historical_avg,
+        historical_variance=historical_variance,
+        forward_avg=fore_stats[0][0],
+        forward_variance=fore_stats[0][1],
+        change_detected=change_detected,
+    )
+
+
+def detect_changes_vectorized(
+    data,
+    min_back_window=12,
+    max_back_window=24,
+    fore_window=12,
+    t_threshold=7,
+    resume_from=0,
+    last_seen_regression=0,
+):
+    """Drop-in replacement for `detect_changes`, backed by `analyze_series`."""
+    data = sorted(data)
+    if not data:
+        return data
+
+    offsets = np.zeros(len(data) + 1, dtype=np.int64)
+    np.cumsum([len(d.values) for d in data], out=offsets[1:])
+    values = np.fromiter(
+        chain.from_iterable(d.values for d in data), dtype=np.float64, count=int(offsets[-1])
+    )
+    analysis = analyze_series(
+        values,
+        offsets,
+        min_back_window=min_back_window,
+        max_back_window=max_back_window,
+        fore_window=fore_window,
+        t_threshold=t_threshold,
+        resume_from=resume_from,
+        last_seen_regression=last_seen_regression,
+        known_t=[d.t for d in data[:resume_from]],
+    )
+
+    first = max(1, resume_from)
+    columns = zip(
+        data[first:],
+        *(column[first:].tolist() for column in analysis),
+    )
+    for (
+        datum,
+        t,
+        amount_prev_data,
+        amount_next_data,
+        historical_avg,
+        historical_variance,
+        forward_avg,
+        forward_variance,
+        change_detected,
+    ) in columns:
+        datum.t = t if t else 0
+        datum.amount_prev_data = amount_prev_data
+        datum.amount_next_data = amount_next_data
+        datum.historical_stats = {
+            "avg": historical_avg,
+            "n": amount_prev_data,
+            "variance": historical_variance,
+        }
+        datum.forward_stats = {
+            "avg": forward_avg,
+            "n": amount_next_data,
+            "variance": forward_variance,
+        }
+        datum.change_detected = change_detected
+
+    return data
@@ -0,0 +1,151 @@
+from collections import defaultdict
+
+from treeherder.model.models import FailureLine, InvestigatedTests, Job, OptionCollection, Push
+from treeherder.push_health.classification import get_grouped
+from treeherder.push_health.tests import (
+    classify_test_failures,
+    get_histories,
+    group_test_failure_jobs,
+    group_test_failures,
+)
+from treeherder.push_health.utils import get_job_results
+
+JOB_RELATED_FIELDS = ('job_type', 'job_group', 'machine_platform', 'taskcluster_metadata')
+
+
+def is_lint_job(job):
+    return job.machine_platform.platform == 'lint' or job.job_type.symbol == 'mozlint'
+
+
+def is_build_job(job):
+    # name lookups are case sensitive on MySQL, hence both spellings
+    return 'Build' in job.job_type.name or 'build' in job.job_type.name
+
+
+def is_test_failure_job(job):
+    return job.result == 'testfailed' and not is_lint_job(job) and 'build' not in job.job_type.name
+
+
+def is_test_in_progress_job(job):
+    return (
+        job.result == 'unknown'
+        and job.machine_platform.platform != 'lint'
+        and not ('build' in job.job_type.name and job.job_type.symbol == 'mozlint')
+    )
+
+
+def get_health_summaries(pushes, with_in_progress_tests=False):
+    """
+    Compute the push health summary of many pushes at once.
+
+    Rather than running the queries of ``get_test_failure_jobs``,
+    ``get_test_failures``, ``get_build_failures`` & ``get_lint_failures`` for
+    every push, the jobs, failure lines, investigated tests & statuses of all
+    the pushes are fetched with a handful of set-based queries and split up by
+    push in memory.  Returns a dict of summaries by push id.
+    """
+    pushes = list(pushes)
+    push_ids = [push.id for push in pushes]
+
+    jobs_by_push = defaultdict(list)
+    for job in (
+        Job.objects.filter(push_id__in=push_ids, tier__lte=2)
+        .select_related(*JOB_RELATED_FIELDS)
+        .order_by('id')
+    ):
+        jobs_by_push[job.push_id].append(job)
+
+    testfailed_jobs = {
+        push_id: [job for job in jobs if is_test_failure_job(job)]
+        for push_id, jobs in jobs_by_push.items()
+    }
+    failed_job_types = {
+        push_id: {job.job_type.name for job in jobs} for push_id, jobs in testfailed_jobs.items()
+    }
+    # the passing jobs of the failed job types aren't restricted to tier 1 & 2
+    passing_jobs = defaultdict(list)
+    for push_id, jobs in jobs_by_push.items():
+        for job in jobs:
+            if (
+                job.result in ('success', 'unknown')
+                and job.job_type.name in failed_job_types[push_id]
+            ):
+                passing_jobs[push_id].append(job)
+    all_failed_job_types = set().union(*failed_job_types.values())
+    if all_failed_job_types:
+        for job in (
+            Job.objects.filter(
+                push_id__in=push_ids,
+                tier__gt=2,
+                job_type__name__in=all_failed_job_types,
+                result__in=['success', 'unknown'],
+            )
+            .select_related(*JOB_RELATED_FIELDS)
+            .order_by('id')
+        ):
+            if job.job_type.name in failed_job_types.get(job.push_id, ()):
+                passing_jobs[job.push_id].append(job)
+
+    test_failure_jobs = {
+        push_id: group_test_failure_jobs(testfailed_jobs.get(push_id, []), passing_jobs[push_id])
+        for push_id in push_ids
+    }
+    failing_push_ids = [push_id for push_id in push_ids if test_failure_jobs[push_id][1]]
+
+    failure_lines = defaultdict(list)
+    investigated_tests = defaultdict(list)
+    if failing_push_ids:
+        for failure_line in FailureLine.objects.filter(
+            action__in=['test_result', 'log', 'crash'],
+            job_log__job__push_id__in=failing_push_ids,
+            job_log__job__result='testfailed',
+            job_log__job__tier__lte=2,
+        ).select_related(*('job_log__job__' + field for field in JOB_RELATED_FIELDS)):
+            failure_lines[failure_line.job_log.job.push_id].append(failure_line)
+        for investigated_test in InvestigatedTests.objects.filter(push_id__in=failing_push_ids):
+            investigated_tests[investigated_test.push_id].append(investigated_test)
+        option_map = OptionCollection.objects.get_option_collection_map()
+
+    histories = {}
+    statuses = Push.get_statuses(push_ids)
+    summaries = {}
+    for push in pushes:
+        jobs = jobs_by_push[push.id]
+        result_status, test_jobs = test_failure_jobs[push.id]
+        if test_jobs:
+            push_date = push.time.date()
+            if push_date not in histories:
+                histories[push_date] = get_histories(push_date, option_map)
+            push_failures = group_test_failures(
+                failure_lines[push.id], option_map, test_jobs, investigated_tests[push.id]
+            )
+            test_result, test_failures = classify_test_failures(
+                push_failures, result_status, *histories[push_date]
+            )
+        else:
+            test_result, test_failures = ('none', get_grouped([]))
+
+        build_result, build_failures, builds_in_progress_count = get_job_results(
+            [job for job in jobs if is_build_job(job)], 'busted'
+        )
+        lint_result, lint_failures, linting_in_progress_count = get_job_results(
+            [job for job in jobs if is_lint_job(job)], 'testfailed'
+        )
+        test_in_progress_count = 0
+        if with_in_progress_tests:
+            test_in_progress_count = len([job for job in jobs if is_test_in_progress_job(job)])
+
+        summaries[push.id] = {
+            'test_result': test_result,
+            'test_failures': test_failures,
+            'build_result': build_result,
+            'build_failures': build_failures,
+            'builds_in_progress_count': builds_in_progress_count,
+            'lint_result': lint_result,
+            'lint_failures': lint_failures,
+            'linting_in_progress_count': linting_in_progress_count,
+            'test_in_progress_count': test_in_progress_count,
+            'status': statuses[push.id],
+        }
+
+    return summaries
@@ -16,9 +16,12 @@ from treeherder.webapp.api.utils import REPO_GROUPS
 logger = logging.getLogger(__name__)
 
 CACHE_KEY_ROOT = 'failure_history'
+DAY_CACHE_KEY_ROOT = 'failure_history_day'
 ONE_WEEK_IN_SECONDS = 604800
 intermittent_history_days = 14
 fixed_by_commit_history_days = 30
+# the day buckets of the longest history must outlive it
+DAY_HISTORY_TIMEOUT = (fixed_by_commit_history_days + 7) * 24 * 60 * 60
 ignored_log_lines = [
     'Return code: 1',
     'exit status 1',
@@ -30,44 +33,124 @@ ignored_log_lines = [
 def get_history(
     failure_classification_id, push_date, num_days, option_map, repository_ids, force_update=False
 ):
+    """
+    Failure counts by test, platform & config of the pushes from ``num_days``
+    up to 2 days before ``push_date``.
+
+    The counts are the sum of the day buckets of ``get_day_history``, so
+    computing the history of a new push date only scans the days which aren't
+    in the cache yet.  ``force_update`` re-sums the buckets, it doesn't
+    recompute them; see ``refresh_day_histories`` for that.
+    """
+    cache_key = f'{CACHE_KEY_ROOT}:{failure_classification_id}:{push_date}'
+    previous_failures_json = None if force_update else cache.get(cache_key)
+
+    if previous_failures_json:
+        return json.loads(previous_failures_json)
+
     start_date = push_date - datetime.timedelta(days=num_days)
     end_date = push_date - datetime.timedelta(days=2)
-    cache_key = f'{CACHE_KEY_ROOT}:{failure_classification_id}:{push_date}'
-    previous_failures_json = cache.get(cache_key)
-
-    if not previous_failures_json or force_update:
-        failure_lines = (
-            FailureLine.objects.filter(
-                job_log__job__result='testfailed',
-                job_log__job__tier__lte=2,
-                job_log__job__failure_classification_id=failure_classification_id,
-                job_log__job__push__repository_id__in=repository_ids,
-                job_log__job__push__time__gt=start_date,
-                job_log__job__push__time__lt=end_date,
-            )
-            .exclude(test=None)
-            .select_related('job_log__job__machine_platform', 'job_log__job__push')
-            .values(
-                'action',
-                'test',
-                'signature',
-                'message',
-                'job_log__job__machine_platform__platform',
-                'job_log__job__option_collection_hash',
+    days = [
+        start_date + datetime.timedelta(days=day) for day in range((end_date - start_date).days)
+    ]
+    day_histories = get_day_histories(failure_classification_id, days, option_map, repository_ids)
+
+    previous_failures = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
+    for day in days:
+        for test, platforms in day_histories[day].items():
+            for platform, configs in platforms.items():
+                for config, count in configs.items():
+                    previous_failures[test][platform][config] += count
+
+    cache.set(cache_key, json.dumps(previous_failures), ONE_WEEK_IN_SECONDS)
+    return previous_failures
+
+
+def get_day_history_cache_key(failure_classification_id, day):
+    return f'{DAY_CACHE_KEY_ROOT}:{failure_classification_id}:{day}'
+
+
+def get_day_histories(failure_classification_id, days, option_map, repository_ids):
+    """
+    The day buckets of the given ``days``, computing (and caching) the missing ones.
+    """
+    cache_keys = {day: get_day_history_cache_key(failure_classification_id, day) for day in days}
+    cached = cache.get_many(cache_keys.values())
+    day_histories = {}
+    for day, cache_key in cache_keys.items():
+        if cache_key in cached:
+            day_histories[day] = json.loads(cached[cache_key])
+        else:
+            day_histories[day] = get_day_history(
+                failure_classification_id, day, option_map, repository_ids
             )
-            .distinct()
+    return day_histories
+
+
+def get_day_history(failure_classification_id, day, option_map, repository_ids):
+    """
+    Failure counts by test, platform & config of the jobs with the given
+    classification among the pushes of ``day``.  A count is the number of
+    distinct failure lines (per platform & option collection) of that day
+    which map to the cleaned up test name, platform and config.
+    """
+    failure_lines = (
+        FailureLine.objects.filter(
+            job_log__job__result='testfailed',
+            job_log__job__tier__lte=2,
+            job_log__job__failure_classification_id=failure_classification_id,
+            job_log__job__push__repository_id__in=repository_ids,
+            job_log__job__push__time__gte=day,
+            job_log__job__push__time__lt=day + datetime.timedelta(days=1),
+        )
+        .exclude(test=None)
+        .values(
+            'action',
+            'test',
+            'signature',
+            'message',
+            'job_log__job__machine_platform__platform',
+            'job_log__job__option_collection_hash',
         )
-        previous_failures = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
-        for line in failure_lines:
-            previous_failures[clean_test(line['test'], line['signature'], line['message'])][
-                clean_platform(line['job_log__job__machine_platform__platform'])
-            ][clean_config(option_map[line['job_log__job__option_collection_hash']])] += 1
+        .distinct()
+    )
+    day_failures = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
+    for line in failure_lines:
+        day_failures[clean_test(line['test'], line['signature'], line['message'])][
+            clean_platform(line['job_log__job__machine_platform__platform'])
+        ][clean_config(option_map[line['job_log__job__option_collection_hash']])] += 1
+
+    cache.set(
+        get_day_history_cache_key(failure_classification_id, day),
+        json.dumps(day_failures),
+        DAY_HISTORY_TIMEOUT,
+    )
+    return day_failures
 
-        cache.set(cache_key, json.dumps(previous_failures), ONE_WEEK_IN_SECONDS)
-    else:
-        previous_failures = json.loads(previous_failures_json)
 
-    return previous_failures
+def refresh_day_histories(days, option_map):
+    """
+    Recompute the intermittent & FixedByCommit day buckets of the given days,
+    picking up the jobs which got classified since they were last computed.
+    """
+    repository_ids = REPO_GROUPS['trunk']
+    for day in days:
+        for failure_classification_id in (4, 2):
+            get_day_history(failure_classification_id, day, option_map, repository_ids)
+
+
+def get_histories(push_date, option_map):
+    """
+    The intermittent and FixedByCommit failure history of the days before ``push_date``.
+    """
+    repository_ids = REPO_GROUPS['trunk']
+    intermittent_history = get_history(
+        4, push_date, intermittent_history_days, option_map, repository_ids
+    )
+    fixed_by_commit_history = get_history(
+        2, push_date, fixed_by_commit_history_days, option_map, repository_ids
+    )
+    return (intermittent_history, fixed_by_commit_history)
 
 
 # For each failure item in ``tests``, we group all jobs of the exact same type into
@@ -88,11 +171,20 @@ def get_current_test_failures(push, option_map, jobs, investigatedTests=None):
         'job_log__job__machine_platform',
         'job_log__job__taskcluster_metadata',
     )
+    return group_test_failures(new_failure_lines, option_map, jobs, investigatedTests)
+
+
+def group_test_failures(failure_lines, option_map, jobs, investigatedTests=None):
+    """
+    Turn the FailureLines of the ``testfailed`` jobs of a push into the test
+    failures of that push.  ``jobs`` are the jobs of the push by job type name,
+    as returned by ``get_test_failure_jobs``.
+    """
     # using a dict here to avoid duplicates due to multiple failure_lines for
     # each job.
     tests = {}
     all_failed_jobs = {}
-    for failure_line in new_failure_lines:
+    for failure_line in failure_lines:
         test_name = clean_test(failure_line.test, failure_line.signature, failure_line.message)
         if not test_name:
             continue
@@ -115,10 +207,10 @@ def get_current_test_failures(push, option_map, jobs, investigatedTests=None):
 
         isInvestigated = False
         investigatedTestId = None
-        for investigatedTest in investigatedTests:
+        for investigatedTest in investigatedTests or []:
             if (
                 investigatedTest.test == test_name
-                and job.job_type.id == investigatedTest.job_type.id
+                and job.job_type_id == investigatedTest.job_type_id
             ):
                 isInvestigated = True
                 investigatedTestId = investigatedTest.id
@@ -190,6 +282,14 @@ def get_test_failure_jobs(push):
         push=push, job_type__name__in=failed_job_types, result__in=['success', 'unknown']
     ).select_related('job_type', 'machine_platform', 'taskcluster_metadata')
 
+    return group_test_failure_jobs(testfailed_jobs, passing_jobs)
+
+
+def group_test_failure_jobs(testfailed_jobs, passing_jobs):
+    """
+    Group the failed test jobs of a push and the passing (or still running)
+    jobs of the same job types by job type name.
+    """
     jobs = {}
     result_status = set()
 
@@ -219,28 +319,29 @@ def get_test_failures(
     # query for jobs for the last two weeks excluding today
     # find tests that have failed in the last 14 days
     # this is very cache-able for reuse on other pushes.
-    result = 'pass'
-
     if not len(jobs):
         return ('none', get_grouped([]))
 
-    repository_ids = REPO_GROUPS['trunk']
     # option_map is used to map platforms for the job.option_collection_hash
     option_map = OptionCollection.objects.get_option_collection_map()
-    push_date = push.time.date()
-    intermittent_history = get_history(
-        4, push_date, intermittent_history_days, option_map, repository_ids
-    )
-    fixed_by_commit_history = get_history(
-        2, push_date, fixed_by_commit_history_days, option_map, repository_ids
-    )
+    intermittent_history, fixed_by_commit_history = get_histories(push.time.date(), option_map)
     investigatedTests = InvestigatedTests.objects.filter(push=push)
 
+    push_failures = get_current_test_failures(push, option_map, jobs, investigatedTests)
+    return classify_test_failures(
+        push_failures, result_status, intermittent_history, fixed_by_commit_history
+    )
+
+
+def classify_test_failures(
+    push_failures, result_status, intermittent_history, fixed_by_commit_history
+):
+    result = 'pass'
+
     # ``push_failures`` are tests that have FailureLine records created by our Log Parser.
     #     These are tests we are able to show to examine to see if we can determine they are
     #     intermittent.  If they are not, we tell the user they need investigation.
     # These are failures ONLY for the current push, not relative to history.
-    push_failures = get_current_test_failures(push, option_map, jobs, investigatedTests)
     filtered_push_failures = [failure for failure in push_failures if filter_failure(failure)]
 
     # Based on the intermittent and FixedByCommit history, set the appropriate classification
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 # These strings will be omitted from test paths to more easily correllate
 # them to other test paths.
 trim_parts = [
@@ -8,6 +10,12 @@ trim_parts = [
 ]
 
 
+# Amount of (test, signature, message) combinations whose clean name is remembered.
+# The same test fails on many platforms & configs, so most calls are repeats.
+CLEAN_TEST_CACHE_SIZE = 100000
+
+
+@lru_cache(maxsize=CLEAN_TEST_CACHE_SIZE)
 def clean_test(test, signature, message):
     try:
         clean_name = test or signature or message or 'Non-Test Error'
@@ -70,6 +78,13 @@ def clean_test(test, signature, message):
     return clean_name
 
 
+def clean_test_hit_rate():
+    """Share of the ``clean_test`` calls answered from its cache."""
+    info = clean_test.cache_info()
+    calls = info.hits + info.misses
+    return info.hits / calls if calls else 0.0
+
+
 def clean_config(config):
     # We have found that pgo ~= opt for our needs, so this helps us get a
     # more representative sample size of data.
@@ -1,6 +1,7 @@
 import logging
 import threading
 import socket
+import time
 
 import environ
 import newrelic.agent
@@ -8,7 +9,11 @@ from django.conf import settings
 from kombu import Connection, Exchange, Queue
 from kombu.mixins import ConsumerMixin
 
-from treeherder.etl.tasks.pulse_tasks import store_pulse_pushes, store_pulse_tasks
+from treeherder.etl.tasks.pulse_tasks import (
+    store_pulse_pushes,
+    store_pulse_tasks,
+    store_pulse_tasks_batch,
+)
 from treeherder.utils.http import fetch_json
 
 from .exchange import get_exchange
@@ -39,6 +44,53 @@ HGMO_PUSH_BINDINGS = [
 ]
 
 
+class TaskMessageBatch:
+    """
+    Collects task messages, to hand them over to a single
+    ``store_pulse_tasks_batch`` task once ``size`` messages got collected or
+    the first of them waited for ``timeout`` seconds.  The messages only get
+    acknowledged once handed over.
+    """
+
+    def __init__(self, root_url, size, timeout):
+        self.root_url = root_url
+        self.size = size
+        self.timeout = timeout
+        self.messages = []
+        self.started = None
+
+    def add(self, body, exchange, routing_key, message):
+        if not self.messages:
+            self.started = time.monotonic()
+        self.messages.append(([body, exchange, routing_key], message))
+        if len(self.messages) >= self.size:
+            self.flush()
+
+    def flush_if_due(self):
+        if self.messages and time.monotonic() - self.started >= self.timeout:
+            self.flush()
+
+    def flush(self):
+        if not self.messages:
+            return
+        # whatever happens next, these messages mustn't get handed over again
+        messages, self.messages = self.messages, []
+        logger.debug('handing over a batch of %s task messages', len(messages))
+        store_pulse_tasks_batch.apply_async(
+            args=[[args for args, _ in messages], self.root_url], queue='store_pulse_tasks'
+        )
+        for _, message in messages:
+            try:
+                message.ack()
+            except Exception as e:
+                # e.g. the connection dropped, in which case the broker redelivers it
+                logger.warning('failed to acknowledge a task message: %s', e)
+
+    def clear(self):
+        """Drop the messages not handed over yet, which the broker will redeliver."""
+        self.messages = []
+
+
 class PulseConsumer(ConsumerMixin):
     """
     Consume jobs from Pulse exchanges
@@ -52,10 +104,41 @@ class PulseConsumer(ConsumerMixin):
         self.root_url = source['root_url']
         self.source = source
         self.build_routing_key = build_routing_key
+        self.task_batch = None
+        if settings.PULSE_TASKS_BATCH_SIZE > 1:
+            self.task_batch = TaskMessageBatch(
+                self.root_url,
+                settings.PULSE_TASKS_BATCH_SIZE,
+                settings.PULSE_TASKS_BATCH_TIMEOUT / 1000,
+            )
 
     def get_consumers(self, Consumer, channel):
         return [Consumer(**c) for c in self.consumers]
 
+    def consume(self, *args, **kwargs):
+        if self.task_batch is not None:
+            # wake up often enough to hand over the batches in time when idle
+            kwargs.setdefault('safety_interval', min(1, self.task_batch.timeout))
+        return super().consume(*args, **kwargs)
+
+    def on_iteration(self):
+        if self.task_batch is not None:
+            self.task_batch.flush_if_due()
+
+    def on_connection_revived(self):
+        if self.task_batch is not None:
+            # the messages of the lost connection can't be acknowledged anymore
+            self.task_batch.clear()
+
+    def store_task(self, body, exchange, routing_key, message):
+        if self.task_batch is not None:
+            self.task_batch.add(body, exchange, routing_key, message)
+            return
+        store_pulse_tasks.apply_async(
+            args=[body, exchange, routing_key, self.root_url], queue='store_pulse_tasks'
+        )
+        message.ack()
+
     def bindings(self):
         """Get the bindings for this consumer, each of the form `<exchange>.<routing_keys>`,
         with `<routing_keys>` being `:`-separated."""
@@ -153,10 +236,7 @@ class TaskConsumer(PulseConsumer):
         exchange = message.delivery_info['exchange']
         routing_key = message.delivery_info['routing_key']
         logger.debug('received job message from %s#%s', exchange, routing_key)
-        store_pulse_tasks.apply_async(
-            args=[body, exchange, routing_key, self.root_url], queue='store_pulse_tasks'
-        )
-        message.ack()
+        self.store_task(body, exchange, routing_key, message)
 
 
 class PushConsumer(PulseConsumer):
@@ -207,14 +287,12 @@ class JointConsumer(PulseConsumer):
         routing_key = message.delivery_info['routing_key']
         logger.debug('received job message from %s#%s', exchange, routing_key)
         if exchange.startswith('exchange/taskcluster-queue/v1/'):
-            store_pulse_tasks.apply_async(
-                args=[body, exchange, routing_key, self.root_url], queue='store_pulse_tasks'
-            )
+            self.store_task(body, exchange, routing_key, message)
         else:
             store_pulse_pushes.apply_async(
                 args=[body, exchange, routing_key, self.root_url], queue='store_pulse_pushes'
             )
-        message.ack()
+            message.ack()
 
 
 class Consumers:
@@ -3,11 +3,17 @@ import requests
 from django.conf import settings
 
 
-def make_request(url, method='GET', headers=None, timeout=30, **kwargs):
-    """A wrapper around requests to set defaults & call raise_for_status()."""
+def make_request(url, method='GET', headers=None, timeout=30, session=None, **kwargs):
+    """
+    A wrapper around requests to set defaults & call raise_for_status().
+
+    Pass a ``session`` to reuse its (keep-alive) connections.
+    """
     headers = headers or {}
     headers['User-Agent'] = 'treeherder/{}'.format(settings.SITE_HOSTNAME)
-    response = requests.request(method, url, headers=headers, timeout=timeout, **kwargs)
+    response = (session or requests).request(
+        method, url, headers=headers, timeout=timeout, **kwargs
+    )
     if response.history:
         params = {
             'url': url,
@@ -20,12 +26,12 @@ def make_request(url, method='GET', headers=None, timeout=30, **kwargs):
     return response
 
 
-def fetch_json(url, params=None, headers=None):
+def fetch_json(url, params=None, headers=None, session=None):
     if headers is None:
         headers = {'Accept': 'application/json'}
     else:
         headers['Accept'] = 'application/json'
-    response = make_request(url, params=params, headers=headers)
+    response = make_request(url, params=params, headers=headers, session=session)
     return response.json()
 
 
@@ -1,8 +1,287 @@
+import asyncio
+import bisect
+import threading
+import time
+from collections import Counter, OrderedDict
+
+import aiohttp
+import newrelic.agent
+import requests
 import taskcluster_urls
+from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
 
 from treeherder.utils.http import fetch_json
 
+# Upper bounds, in milliseconds, of the buckets of the request latency histogram
+LATENCY_BUCKETS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class ClientStats:
+    """
+    Counts of the requests this process made to Taskcluster & of the
+    connections it opened for them, along with a histogram of the latencies.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.latencies = Counter()
+        self._lock = threading.Lock()
+        self._reported = (Counter(), Counter())
+
+    @staticmethod
+    def bucket(seconds):
+        index = bisect.bisect_left(LATENCY_BUCKETS, seconds * 1000)
+        return '{}ms'.format(LATENCY_BUCKETS[index]) if index < len(LATENCY_BUCKETS) else 'more'
+
+    def increment(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+    def record_request(self, seconds, failed=False):
+        with self._lock:
+            self.counts['requests'] += 1
+            if failed:
+                self.counts['failed_requests'] += 1
+            self.latencies[self.bucket(seconds)] += 1
+        newrelic.agent.record_custom_metric('Custom/TaskclusterClient/RequestTime', seconds)
+
+    def stats(self):
+        """Counts & latency histogram since the process started."""
+        with self._lock:
+            return {
+                'counts': dict(self.counts),
+                'latencies': {
+                    bucket: self.latencies[bucket]
+                    for bucket in ['{}ms'.format(bound) for bound in LATENCY_BUCKETS] + ['more']
+                },
+            }
+
+    def record_metrics(self):
+        """Report the counts since the previous report to New Relic."""
+        with self._lock:
+            counts, latencies = self.counts.copy(), self.latencies.copy()
+            reported_counts, reported_latencies = self._reported
+            self._reported = (counts, latencies)
+        for name in counts:
+            newrelic.agent.record_custom_metric(
+                'Custom/TaskclusterClient/{}'.format(name), counts[name] - reported_counts[name]
+            )
+        for bucket in latencies:
+            newrelic.agent.record_custom_metric(
+                'Custom/TaskclusterClient/Latency/{}'.format(bucket),
+                latencies[bucket] - reported_latencies[bucket],
+            )
+
+
+client_stats = ClientStats()
+
+
+class TaskclusterCache:
+    """
+    Cache of the task definitions & artifact lists fetched from Taskcluster.
+
+    A task gets a pulse message for each of its states (and reruns), which
+    each need its definition, so those are shared by all the worker processes
+    through the django cache.  The most recently used entries are kept in this
+    process as well, which saves the round trip to the cache when the messages
+    of a task are handled by the same worker.  Task definitions never change,
+    but artifact lists should only be cached once their run is resolved.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > now:
+                    self._entries.move_to_end(key)
+                    client_stats.increment('cache_hits')
+                    return value
+                del self._entries[key]
+
+        entry = cache.get(key)
+        if entry is None:
+            client_stats.increment('cache_misses')
+            return None
+        client_stats.increment('shared_cache_hits')
+        # don't keep it around any longer than the shared cache does
+        expires, value = entry
+        self._set_local(key, value, expires - time.time())
+        return value
+
+    def set(self, key, value, timeout):
+        cache.set(key, (time.time() + timeout, value), timeout)
+        self._set_local(key, value, timeout)
+
+    def _set_local(self, key, value, timeout):
+        with self._lock:
+            if timeout <= 0 or self.max_size <= 0:
+                self._entries.pop(key, None)
+                return
+            self._entries[key] = (time.monotonic() + timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+taskcluster_cache = TaskclusterCache(settings.TASKCLUSTER_CACHE_SIZE)
+
+
+# The fields of a task definition the pulse ingestion uses, besides the
+# treeherder config & the environment variables of mobile tasks
+TASK_FIELDS = ('taskGroupId', 'created', 'workerType', 'routes', 'metadata', 'tags')
+
+
+def trim_task_definition(task):
+    """
+    Only keep the parts of a task definition pulse ingestion uses, as the
+    definitions of many thousands of tasks get cached at once.
+    """
+    trimmed = {field: task[field] for field in TASK_FIELDS if field in task}
+    treeherder = task.get('extra', {}).get('treeherder')
+    if treeherder is not None:
+        trimmed['extra'] = {'treeherder': treeherder}
+    trimmed['payload'] = {
+        'env': {
+            name: value
+            for name, value in task.get('payload', {}).get('env', {}).items()
+            if name.startswith('MOBILE_')
+        }
+    }
+    return trimmed
+
+
+def task_cache_key(root_url, task_id):
+    return 'taskcluster-task:{}:{}'.format(root_url, task_id)
+
+
+def artifacts_cache_key(root_url, task_id, run_id):
+    return 'taskcluster-artifacts:{}:{}:{}'.format(root_url, task_id, run_id)
+
+
+_lock = threading.Lock()
+_session = None
+_async_session = None
+
+
+def _trace_config():
+    trace_config = aiohttp.TraceConfig()
+
+    async def on_request_start(session, context, params):
+        context.start = time.monotonic()
+
+    async def on_request_end(session, context, params):
+        client_stats.record_request(time.monotonic() - context.start)
+
+    async def on_request_exception(session, context, params):
+        client_stats.record_request(time.monotonic() - context.start, failed=True)
+
+    async def on_connection_create_end(session, context, params):
+        client_stats.increment('connections_created')
+
+    async def on_connection_reuseconn(session, context, params):
+        client_stats.increment('connections_reused')
+
+    async def on_connection_queued_start(session, context, params):
+        # all the connections allowed to the host are busy
+        client_stats.increment('connections_queued')
+
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+    trace_config.on_connection_queued_start.append(on_connection_queued_start)
+    return trace_config
+
+
+def get_async_session():
+    """
+    The aiohttp session all the async Taskcluster clients of this process share,
+    to keep their connections (& TLS sessions) alive from one task to the next.
+
+    A session belongs to an event loop, so this has to be called from a
+    coroutine of the loop ``run_async`` runs them on.
+    """
+    global _async_session
+    loop = asyncio.get_event_loop()
+    if _async_session is None or _async_session[1].closed or _async_session[0] is not loop:
+        connector = aiohttp.TCPConnector(
+            limit=settings.TASKCLUSTER_CLIENT_CONNECTIONS,
+            limit_per_host=settings.TASKCLUSTER_CLIENT_CONNECTIONS_PER_HOST,
+            keepalive_timeout=settings.TASKCLUSTER_CLIENT_KEEPALIVE,
+        )
+        _async_session = (
+            loop,
+            aiohttp.ClientSession(connector=connector, trace_configs=[_trace_config()]),
+        )
+    return _async_session[1]
+
+
+def run_async(coroutine):
+    """
+    Run a coroutine on the event loop of this process, which is kept around
+    (along with the session of ``get_async_session``) for the next ones.
+    """
+    loop = asyncio.get_event_loop()
+    if loop.is_closed():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+    return loop.run_until_complete(coroutine)
+
+
+def get_session():
+    """The requests session the sync Taskcluster requests of this process share."""
+    global _session
+    with _lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=settings.TASKCLUSTER_CLIENT_CONNECTIONS_PER_HOST)
+            _session.mount('https://', adapter)
+            _session.mount('http://', adapter)
+        return _session
+
+
+def close_sessions():
+    global _session, _async_session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+    if _async_session is not None:
+        loop, session = _async_session
+        _async_session = None
+        if not session.closed and not loop.is_closed():
+            loop.run_until_complete(session.close())
+
 
 def get_task_definition(root_url, task_id):
+    """The (trimmed, see ``trim_task_definition``) definition of a task."""
+    cache_key = task_cache_key(root_url, task_id)
+    task = taskcluster_cache.get(cache_key)
+    if task is not None:
+        return task
+
     task_url = taskcluster_urls.api(root_url, 'queue', 'v1', 'task/{}'.format(task_id))
-    return fetch_json(task_url)
+    start = time.monotonic()
+    try:
+        task = fetch_json(task_url, session=get_session())
+    except Exception:
+        client_stats.record_request(time.monotonic() - start, failed=True)
+        raise
+    client_stats.record_request(time.monotonic() - start)
+    task = trim_task_definition(task)
+    taskcluster_cache.set(cache_key, task, settings.TASKCLUSTER_TASK_CACHE_TIMEOUT)
+    return task
@@ -3,7 +3,7 @@ from rest_framework import viewsets
 from rest_framework.response import Response
 from rest_framework.status import HTTP_404_NOT_FOUND
 
-from treeherder.model.models import BugJobMap, Job
+from treeherder.model.models import BugJobMap, Job, JobChange
 
 from .serializers import BugJobMapSerializer
 
@@ -33,7 +33,9 @@ class BugJobMapViewSet(viewsets.ViewSet):
         """
         job_id, bug_id = map(int, pk.split("-"))
         job = Job.objects.get(repository__name=project, id=job_id)
-        BugJobMap.objects.filter(job=job, bug_id=bug_id).delete()
+        deleted, _ = BugJobMap.objects.filter(job=job, bug_id=bug_id).delete()
+        if deleted:
+            JobChange.record([job])
 
         return Response({"message": "Bug job map deleted"})
 
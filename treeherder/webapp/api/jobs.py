@@ -3,8 +3,10 @@ import logging
 
 import django_filters
 from dateutil import parser
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import models as django_models
+from django.db.models import Max, Min
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -14,6 +16,7 @@ from rest_framework.status import HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
 from treeherder.model.error_summary import get_error_summary
 from treeherder.model.models import (
     Job,
+    JobChange,
     JobLog,
     OptionCollection,
     Repository,
@@ -21,7 +24,12 @@ from treeherder.model.models import (
     TextLogStep,
 )
 from treeherder.webapp.api import pagination, serializers
-from treeherder.webapp.api.utils import CharInFilter, NumberInFilter, to_timestamp
+from treeherder.webapp.api.utils import (
+    CharInFilter,
+    NumberInFilter,
+    dictionary_encode,
+    to_timestamp,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -149,6 +157,15 @@ class JobsViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_class = JobFilter
     pagination_class = pagination.JobPagination
 
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if pagination.JobCursorPagination.is_requested(self.request):
+                self._paginator = pagination.JobCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
     def get_serializer_context(self):
         option_collection_map = OptionCollection.objects.get_option_collection_map()
         return {'option_collection_map': option_collection_map}
@@ -220,6 +237,31 @@ class JobsProjectViewSet(viewsets.ViewSet):
         'option_collection_hash'
     )
 
+    # properties with few distinct values, which `return_type=columns` sends
+    # as the list of distinct values plus the index of each job's value in it
+    _dictionary_encoded_properties = {
+        'build_architecture',
+        'build_os',
+        'build_platform',
+        'build_system_type',
+        'job_group_description',
+        'job_group_name',
+        'job_group_symbol',
+        'job_type_description',
+        'job_type_name',
+        'job_type_symbol',
+        'machine_platform_architecture',
+        'machine_platform_os',
+        'option_collection_hash',
+        'platform',
+        'reason',
+        'ref_data_name',
+        'result',
+        'signature',
+        'state',
+        'who',
+    }
+
     def _get_job_list_response(self, job_qs, offset, count, return_type):
         """
         custom method to serialize + format jobs information
@@ -228,11 +270,20 @@ class JobsProjectViewSet(viewsets.ViewSet):
         the django rest framework serializer or whatever) as
         this function is often in the critical path
         """
+        return self._format_job_list(
+            job_qs[offset : (offset + count)].values_list(
+                *[pq[1] for pq in self._property_query_mapping]
+            ),
+            return_type,
+        )
+
+    def _format_job_list(self, job_values, return_type):
+        if return_type == 'columns':
+            return self._format_job_columns(job_values)
+
         option_collection_map = OptionCollection.objects.get_option_collection_map()
         results = []
-        for values in job_qs[offset : (offset + count)].values_list(
-            *[pq[1] for pq in self._property_query_mapping]
-        ):
+        for values in job_values:
             platform_option = option_collection_map.get(
                 values[self._option_collection_hash_idx], ""
             )
@@ -267,6 +318,38 @@ class JobsProjectViewSet(viewsets.ViewSet):
 
         return response_dict
 
+    def _format_job_columns(self, job_values):
+        """
+        Columnar variant of `_format_job_list`: one list of values per
+        property, the values of `_dictionary_encoded_properties` being
+        encoded as `{'values': [distinct values], 'indexes': [index per job]}`.
+
+        The rows are transposed, transformed & encoded a whole column at a
+        time, rather than value by value.
+        """
+        option_collection_map = OptionCollection.objects.get_option_collection_map()
+        columns = list(zip(*job_values)) or [()] * len(self._property_query_mapping)
+
+        results = {}
+        for (name, _, func), column in zip(self._property_query_mapping, columns):
+            if func:
+                column = map(func, column)
+            if name in self._dictionary_encoded_properties:
+                results[name] = dictionary_encode(column)
+            else:
+                results[name] = list(column)
+
+        option_collection_hashes = results['option_collection_hash']
+        results['platform_option'] = {
+            'values': [
+                option_collection_map.get(option_collection_hash, "")
+                for option_collection_hash in option_collection_hashes['values']
+            ],
+            'indexes': option_collection_hashes['indexes'],
+        }
+
+        return {'results': results}
+
     def retrieve(self, request, project, pk=None):
         """
         GET method implementation for detail view
@@ -311,7 +394,10 @@ class JobsProjectViewSet(viewsets.ViewSet):
         Optional parameters (default):
         - offset (0)
         - count (10)
-        - return_type (dict)
+        - return_type (dict): `dict`, `list` or `columns`
+        - pagination (offset): `cursor` to page through the jobs (ordered
+          by id) by following the `next` link in the `meta` of each response
+          rather than by offset, see JobCursorPagination
         """
         MAX_JOBS_COUNT = 2000
 
@@ -367,11 +453,124 @@ class JobsProjectViewSet(viewsets.ViewSet):
             ),
         ).qs
 
+        if pagination.JobCursorPagination.is_requested(request):
+            paginator = pagination.JobCursorPagination()
+            paginator.page_size = count
+            page = paginator.paginate_queryset(
+                jobs.values(*[pq[1] for pq in self._property_query_mapping]), request, view=self
+            )
+            response_body = self._format_job_list(
+                [[job[pq[1]] for pq in self._property_query_mapping] for job in page],
+                return_type,
+            )
+            response_body["meta"] = dict(
+                repository=project,
+                count=count,
+                next=paginator.get_next_link(),
+                previous=paginator.get_previous_link(),
+            )
+            return Response(response_body)
+
         response_body = self._get_job_list_response(jobs, offset, count, return_type)
         response_body["meta"] = dict(repository=project, offset=offset, count=count)
 
         return Response(response_body)
 
+    @action(detail=False, methods=['get'])
+    def changes(self, request, project):
+        """
+        Incremental feed of the jobs whose state, result, classification or
+        bugs changed since the given cursor.
+
+        Optional parameters (default):
+        - cursor (none): the `cursor` of the previous response; without it,
+          no changes are returned, only the cursor of the latest change
+        - count (2000): maximum amount of changes to look at
+
+        Returns the current state, result & classification of the jobs which
+        changed, along with the `cursor` to pass next and whether there are
+        `more` changes to fetch right away. Jobs listed because their bugs
+        changed need their bugs to be fetched separately. Only the last few
+        days of changes are kept, see JobChange.
+
+        The cursor is the id of the last change returned, but the transactions
+        recording changes don't commit in the order of their ids, so changes
+        are only returned once they're JOB_CHANGES_FEED_LAG seconds old.  The
+        cursor never passes the first change which is more recent than that,
+        so a change committed after one with a higher id isn't skipped.
+
+        This is best-effort: a change whose transaction takes longer than
+        JOB_CHANGES_FEED_LAG to commit (e.g. the ingestion of a large batch of
+        jobs), or whose `created` time is off because of clock skew between
+        the hosts, can still be passed by the cursor before it's committed, and
+        is then never returned.  Clients needing every change have to compare
+        against the jobs endpoint now and then.
+        """
+        MAX_CHANGES_COUNT = 2000
+
+        try:
+            cursor = request.query_params.get("cursor")
+            cursor = int(cursor) if cursor is not None else None
+            count = int(request.query_params.get("count", MAX_CHANGES_COUNT))
+        except ValueError:
+            return Response("Invalid value for cursor or count", status=HTTP_400_BAD_REQUEST)
+
+        if count > MAX_CHANGES_COUNT:
+            msg = "Specified count exceeds API MAX_CHANGES_COUNT value: {}".format(
+                MAX_CHANGES_COUNT
+            )
+            return Response({"detail": msg}, status=HTTP_400_BAD_REQUEST)
+
+        try:
+            repository = Repository.objects.get(name=project)
+        except Repository.DoesNotExist:
+            return Response(
+                {"detail": "No project with name {}".format(project)}, status=HTTP_404_NOT_FOUND
+            )
+
+        changes = JobChange.objects.filter(repository=repository)
+        watermark = datetime.datetime.now() - datetime.timedelta(
+            seconds=settings.JOB_CHANGES_FEED_LAG
+        )
+        more = False
+        if cursor is None:
+            rows = []
+            first_recent_id = changes.filter(created__gte=watermark).aggregate(Min('id'))['id__min']
+            if first_recent_id is not None:
+                cursor = first_recent_id - 1
+            else:
+                cursor = changes.aggregate(Max('id'))['id__max'] or 0
+        else:
+            rows = list(
+                changes.filter(id__gt=cursor)
+                .order_by('id')
+                .values_list(
+                    'id', 'job_id', 'state', 'result', 'failure_classification_id', 'created'
+                )[:count]
+            )
+            more = len(rows) == count
+            for index, row in enumerate(rows):
+                if row[-1] >= watermark:
+                    # the changes before this one may not have been committed yet
+                    rows = rows[:index]
+                    more = False
+                    break
+
+        # only the latest change of each job matters
+        latest_changes = {}
+        for (change_id, job_id, *values, created) in rows:
+            latest_changes.pop(job_id, None)
+            latest_changes[job_id] = [job_id] + values
+
+        return Response(
+            {
+                "results": list(latest_changes.values()),
+                "job_property_names": ["id", "state", "result", "failure_classification_id"],
+                "cursor": rows[-1][0] if rows else cursor,
+                "more": more,
+            }
+        )
+
     # TODO remove
     @action(detail=True, methods=['get'])
     def text_log_steps(self, request, project, pk=None):
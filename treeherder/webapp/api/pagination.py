@@ -24,3 +24,24 @@ class JobPagination(pagination.PageNumberPagination):
     page_size_query_param = 'count'
     max_page_size = 2000
     django_paginator_class = CustomPaginator
+
+
+class JobCursorPagination(pagination.CursorPagination):
+    """
+    Keyset pagination of jobs, which is used instead of `JobPagination` when
+    the `pagination=cursor` query parameter is given.
+
+    Every page continues right after the id of the last job of the previous
+    page (encoded in the opaque `next` cursor), so fetching a page takes the
+    same time no matter how far into the jobs it is, and the jobs matching
+    the filters are never counted.
+    """
+
+    ordering = 'id'
+    page_size = 2000
+    page_size_query_param = 'count'
+    max_page_size = 2000
+
+    @staticmethod
+    def is_requested(request):
+        return request.query_params.get('pagination') == 'cursor'
@@ -1,13 +1,17 @@
 import datetime
 import time
 from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
 
 import django_filters
 from django.conf import settings
 from django.db import transaction
 from django.db.models import CharField, Count, Q, Subquery, Value
 from django.db.models.functions import Concat
+from django.http import StreamingHttpResponse
 from rest_framework import exceptions, filters, generics, pagination, viewsets
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.status import HTTP_400_BAD_REQUEST
 from typing import List
@@ -41,7 +45,7 @@ from .performance_serializers import (
     TestSuiteHealthParamsSerializer,
     TestSuiteHealthSerializer,
 )
-from .utils import GroupConcat
+from .utils import GroupConcat, dictionary_encode, to_timestamps
 
 
 class PerformanceSignatureViewSet(viewsets.ViewSet):
@@ -217,6 +221,12 @@ class PerformanceDatumViewSet(viewsets.ViewSet):
         push_ids = request.query_params.getlist("push_id")
         no_retriggers = request.query_params.get("no_retriggers", False)
         no_retriggers = OptionalBooleanField().to_internal_value(no_retriggers)
+        return_type = request.query_params.get("return_type", "dict").lower()
+        if return_type not in ('dict', 'columns'):
+            return Response(
+                {"message": "return_type must be either dict or columns"},
+                status=HTTP_400_BAD_REQUEST,
+            )
 
         try:
             job_ids = [int(job_id) for job_id in request.query_params.getlist("job_id")]
@@ -276,7 +286,6 @@ class PerformanceDatumViewSet(viewsets.ViewSet):
         if end_date:
             datums = datums.filter(push_timestamp__lt=end_date)
 
-        ret, seen_push_ids = defaultdict(list), defaultdict(set)
         values_list = datums.values_list(
             'id',
             'signature_id',
@@ -287,38 +296,68 @@ class PerformanceDatumViewSet(viewsets.ViewSet):
             'value',
             'push__revision',
         )
+        if no_retriggers:
+            values_list = self._skip_retriggers(values_list)
+        datum_rows = list(values_list)
+        push_timestamps = to_timestamps(row[5] for row in datum_rows)
+
+        if return_type == 'columns':
+            return Response(self._format_columns(datum_rows, push_timestamps))
+
+        ret = defaultdict(list)
         for (
-            id,
-            signature_id,
-            signature_hash,
-            job_id,
-            push_id,
+            (id, signature_id, signature_hash, job_id, push_id, _, value, push__revision),
             push_timestamp,
-            value,
-            push__revision,
-        ) in values_list:
-            should_include_datum = True
-            if no_retriggers:
-                if push_id in seen_push_ids[signature_hash]:
-                    should_include_datum = False
-                else:
-                    seen_push_ids[signature_hash].add(push_id)
-
-            if should_include_datum:
-                ret[signature_hash].append(
-                    {
-                        'id': id,
-                        'signature_id': signature_id,
-                        'job_id': job_id,
-                        'push_id': push_id,
-                        'revision': push__revision,
-                        'push_timestamp': int(time.mktime(push_timestamp.timetuple())),
-                        'value': round(value, 2),  # round to 2 decimal places
-                    }
-                )
+        ) in zip(datum_rows, push_timestamps):
+            ret[signature_hash].append(
+                {
+                    'id': id,
+                    'signature_id': signature_id,
+                    'job_id': job_id,
+                    'push_id': push_id,
+                    'revision': push__revision,
+                    'push_timestamp': push_timestamp,
+                    'value': round(value, 2),  # round to 2 decimal places
+                }
+            )
 
         return Response(ret)
 
+    @staticmethod
+    def _skip_retriggers(datum_rows):
+        seen_push_ids = defaultdict(set)
+        for row in datum_rows:
+            signature_hash, push_id = row[2], row[4]
+            if push_id not in seen_push_ids[signature_hash]:
+                seen_push_ids[signature_hash].add(push_id)
+                yield row
+
+    @staticmethod
+    def _format_columns(datum_rows, push_timestamps):
+        """
+        Lay out the data of each signature as parallel arrays, one per property;
+        the revisions are dictionary encoded, as a push has many data points.
+        """
+        rows_by_signature = defaultdict(list)
+        timestamps_by_signature = defaultdict(list)
+        for row, push_timestamp in zip(datum_rows, push_timestamps):
+            rows_by_signature[row[2]].append(row)
+            timestamps_by_signature[row[2]].append(push_timestamp)
+
+        ret = {}
+        for signature_hash, rows in rows_by_signature.items():
+            (ids, signature_ids, _, job_ids, push_ids, _, values, revisions) = zip(*rows)
+            ret[signature_hash] = {
+                'id': ids,
+                'signature_id': signature_ids,
+                'job_id': job_ids,
+                'push_id': push_ids,
+                'revision': dictionary_encode(revisions),
+                'push_timestamp': timestamps_by_signature[signature_hash],
+                'value': [round(value, 2) for value in values],
+            }
+        return ret
+
 
 class AlertSummaryPagination(pagination.PageNumberPagination):
     ordering = ('-created', '-id')
@@ -582,6 +621,7 @@ class PerformanceIssueTrackerViewSet(viewsets.ReadOnlyModelViewSet):
 class PerformanceSummary(generics.ListAPIView):
     serializer_class = PerformanceSummarySerializer
     queryset = None
+    series_fields = ('value', 'job_id', 'id', 'push_id', 'push_timestamp', 'push__revision')
 
     def list(self, request):
         query_params = PerformanceQueryParamsSerializer(data=request.query_params)
@@ -596,9 +636,11 @@ class PerformanceSummary(generics.ListAPIView):
         frameworks = query_params.validated_data['framework']
         parent_signature = query_params.validated_data['parent_signature']
         signature = query_params.validated_data['signature']
+        signatures = query_params.validated_data['signatures']
         no_subtests = query_params.validated_data['no_subtests']
         all_data = query_params.validated_data['all_data']
         no_retriggers = query_params.validated_data['no_retriggers']
+        stream = query_params.validated_data['stream']
 
         signature_data = PerformanceSignature.objects.select_related(
             'framework', 'repository', 'platform', 'push', 'job'
@@ -609,6 +651,8 @@ class PerformanceSummary(generics.ListAPIView):
             signature_data = signature_data.filter(signature_hash=signature)
         elif signature:
             signature_data = signature_data.filter(id=signature)
+        elif signatures:
+            signature_data = signature_data.filter(id__in=signatures)
         else:
             signature_data = signature_data.filter(parent_signature__isnull=no_subtests)
 
@@ -671,11 +715,21 @@ class PerformanceSummary(generics.ListAPIView):
             item['id']: item['option__name'] for item in list(option_collection)
         }
 
-        if signature and all_data:
+        if (signature or signatures) and all_data and stream:
             for item in self.queryset:
-                item['data'] = data.values(
-                    'value', 'job_id', 'id', 'push_id', 'push_timestamp', 'push__revision'
-                ).order_by('push_timestamp', 'push_id', 'job_id')
+                item['option_name'] = option_collection_map[item['option_collection_id']]
+                item['repository_name'] = repository_name
+            return StreamingHttpResponse(
+                self._stream_summaries(self.queryset, data, no_retriggers),
+                content_type='application/json',
+            )
+
+        if (signature or signatures) and all_data:
+            series = {
+                signature_id: list(datums) for signature_id, datums in self._iter_series(data)
+            }
+            for item in self.queryset:
+                item['data'] = series.get(item['id'], [])
                 item['option_name'] = option_collection_map[item['option_collection_id']]
                 item['repository_name'] = repository_name
 
@@ -702,6 +756,53 @@ class PerformanceSummary(generics.ListAPIView):
 
         return Response(data=serialized_data)
 
+    def _stream_summaries(self, signatures, data, no_retriggers):
+        """
+        Write the summaries out as a JSON array, one signature at a time.
+
+        The series of all signatures are read from a single query ordered by
+        signature, so only the series of the signature being written is ever
+        held in memory.  The summaries come out ordered by signature id.
+        """
+        series = self._iter_series(data)
+        signature_id, datums = next(series, (None, None))
+        renderer = JSONRenderer()
+
+        yield b'['
+        for index, item in enumerate(sorted(signatures, key=itemgetter('id'))):
+            item['data'] = []
+            while signature_id is not None and signature_id <= item['id']:
+                if signature_id == item['id']:
+                    item['data'] = list(self._skip_retriggers(datums) if no_retriggers else datums)
+                signature_id, datums = next(series, (None, None))
+            if index:
+                yield b','
+            yield renderer.render(self.get_serializer(item).data)
+        yield b']'
+
+    def _iter_series(self, data):
+        """
+        Read the data points of all signatures with one ordered query, yielding
+        every signature id along with the data points of its series.
+        """
+        datums = (
+            data.values('signature_id', *self.series_fields)
+            .order_by('signature_id', 'push_timestamp', 'push_id', 'job_id')
+            .iterator()
+        )
+        return groupby(datums, key=itemgetter('signature_id'))
+
+    @staticmethod
+    def _skip_retriggers(datums):
+        """
+        Same as ``_filter_out_retriggers``, for the data points of a single series
+        """
+        seen_push_id = None
+        for datum in datums:
+            if datum['push_id'] != seen_push_id:
+                seen_push_id = datum['push_id']
+                yield datum
+
     @staticmethod
     def _filter_out_retriggers(serialized_data: List[dict]) -> List[dict]:
         """
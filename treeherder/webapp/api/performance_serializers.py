@@ -287,9 +287,12 @@ class PerformanceQueryParamsSerializer(serializers.Serializer):
     interval = serializers.IntegerField(required=False, allow_null=True, default=None)
     parent_signature = serializers.CharField(required=False, allow_null=True, default=None)
     signature = serializers.CharField(required=False, allow_null=True, default=None)
+    # comma separated ids, for fetching the data of many signatures at once
+    signatures = serializers.CharField(required=False, allow_null=True, default=None)
     no_subtests = serializers.BooleanField(required=False)
     all_data = OptionalBooleanField()
     no_retriggers = OptionalBooleanField()
+    stream = OptionalBooleanField()
 
     def validate(self, data):
         if (
@@ -303,6 +306,16 @@ class PerformanceQueryParamsSerializer(serializers.Serializer):
 
         return data
 
+    def validate_signatures(self, signatures):
+        if signatures is None:
+            return []
+        try:
+            return [int(signature_id) for signature_id in signatures.split(',')]
+        except ValueError:
+            raise serializers.ValidationError(
+                '{} is not a list of signature ids.'.format(signatures)
+            )
+
     def validate_repository(self, repository):
         try:
             Repository.objects.get(name=repository)
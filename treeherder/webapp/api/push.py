@@ -13,11 +13,8 @@ from treeherder.model.models import Job, JobType, Push, Repository
 from treeherder.push_health.builds import get_build_failures
 from treeherder.push_health.compare import get_commit_history
 from treeherder.push_health.linting import get_lint_failures
-from treeherder.push_health.tests import (
-    get_test_failures,
-    get_test_failure_jobs,
-    get_test_in_progress_count,
-)
+from treeherder.push_health.summary import get_health_summaries
+from treeherder.push_health.tests import get_test_failures, get_test_failure_jobs
 from treeherder.push_health.usage import get_usage
 from treeherder.webapp.api.serializers import PushSerializer
 from treeherder.webapp.api.utils import to_datetime, to_timestamp
@@ -250,29 +247,22 @@ class PushViewSet(viewsets.ViewSet):
         data = []
         commit_history = None
 
-        for push in list(pushes):
-            result_status, jobs = get_test_failure_jobs(push)
-
-            test_result, push_health_test_failures = get_test_failures(
-                push,
-                jobs,
-                result_status,
-            )
-
-            build_result, push_health_build_failures, builds_in_progress_count = get_build_failures(
-                push
-            )
-
-            lint_result, push_health_lint_failures, linting_in_progress_count = get_lint_failures(
-                push
-            )
-
-            test_failure_count = len(push_health_test_failures['needInvestigation'])
-            build_failure_count = len(push_health_build_failures)
-            lint_failure_count = len(push_health_lint_failures)
-            test_in_progress_count = 0
-
-            status = push.get_status()
+        pushes = list(pushes)
+        summaries = get_health_summaries(pushes, with_in_progress_tests)
+        for push in pushes:
+            summary = summaries[push.id]
+            test_result = summary['test_result']
+            build_result = summary['build_result']
+            lint_result = summary['lint_result']
+            builds_in_progress_count = summary['builds_in_progress_count']
+            linting_in_progress_count = summary['linting_in_progress_count']
+            test_in_progress_count = summary['test_in_progress_count']
+
+            test_failure_count = len(summary['test_failures']['needInvestigation'])
+            build_failure_count = len(summary['build_failures'])
+            lint_failure_count = len(summary['lint_failures'])
+
+            status = summary['status']
             total_failures = test_failure_count + build_failure_count + lint_failure_count
             # Override the testfailed value added in push.get_status so that it aligns with how we detect lint, build and test failures
             # for the push health API's (total_failures doesn't include known intermittent failures)
@@ -281,8 +271,6 @@ class PushViewSet(viewsets.ViewSet):
             if with_history:
                 serializer = PushSerializer([push], many=True)
                 commit_history = serializer.data
-            if with_in_progress_tests:
-                test_in_progress_count = get_test_in_progress_count(push)
 
             data.append(
                 {
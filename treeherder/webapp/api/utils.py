@@ -46,6 +46,29 @@ def to_timestamp(datetime_obj):
     return None
 
 
+EPOCH = datetime(1970, 1, 1)
+ONE_SECOND = timedelta(seconds=1)
+
+
+def to_timestamps(datetime_objs):
+    """
+    get the unix timestamps of many (naive, UTC) datetime objects; same as
+    ``to_timestamp``, but several times faster than going through a time tuple
+    """
+    return [(datetime_obj - EPOCH) // ONE_SECOND for datetime_obj in datetime_objs]
+
+
+def dictionary_encode(values):
+    """
+    Encode a sequence of values as the list of its distinct values (in order of
+    appearance) and the index of each value in that list.
+    """
+    values = list(values)
+    distinct_values = list(dict.fromkeys(values))
+    index_by_value = {value: index for (index, value) in enumerate(distinct_values)}
+    return {'values': distinct_values, 'indexes': list(map(index_by_value.__getitem__, values))}
+
+
 def get_end_of_day(date):
     """Add a 23:59:59.999 timestamp (default is 00:00:00)"""
     return date + timedelta(days=1, microseconds=-1)
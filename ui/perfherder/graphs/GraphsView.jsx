@@ -1,6 +1,7 @@
 import React from 'react';
 import PropTypes from 'prop-types';
 import { Button, Container, Col, Row } from 'reactstrap';
+import groupBy from 'lodash/groupBy';
 import unionBy from 'lodash/unionBy';
 import queryString from 'query-string';
 
@@ -118,17 +119,25 @@ class GraphsView extends React.Component {
     this.setState(updates);
   };
 
-  createSeriesParams = (series) => {
+  createSeriesParams = (seriesList) => {
     const {
       repository_name: repositoryName,
       signature_id: signatureId,
       framework_id: frameworkId,
-    } = series;
+    } = seriesList[0];
     const { timeRange } = this.state;
+    const signatureParams =
+      seriesList.length === 1 || typeof signatureId !== 'number'
+        ? { signature: signatureId }
+        : {
+            signatures: seriesList
+              .map((series) => series.signature_id)
+              .join(','),
+          };
 
     return {
       repository: repositoryName,
-      signature: signatureId,
+      ...signatureParams,
       framework: frameworkId,
       interval: timeRange.value,
       all_data: true,
@@ -140,10 +149,18 @@ class GraphsView extends React.Component {
     const tests = newDisplayedTests.length ? newDisplayedTests : testData;
     this.setState({ loading: true });
 
+    // fetch the series of the same repository & framework with a single request
+    // (series still identified by their signature hash are fetched one by one,
+    // as the same hash is used by the series of a test on every repository)
+    const testsByRepository = groupBy(tests, (series) =>
+      typeof series.signature_id === 'number'
+        ? `${series.repository_name} ${series.framework_id}`
+        : `${series.repository_name} ${series.signature_id}`,
+    );
     const responses = await Promise.all(
-      tests.map((series) =>
+      Object.values(testsByRepository).map((seriesList) =>
         getData(
-          createApiUrl(endpoints.summary, this.createSeriesParams(series)),
+          createApiUrl(endpoints.summary, this.createSeriesParams(seriesList)),
         ),
       ),
     );
@@ -152,11 +169,19 @@ class GraphsView extends React.Component {
     if (errorMessages.length) {
       this.setState({ errorMessages, loading: false });
     } else {
-      // If the server returns an empty array instead of signature data with data: [],
+      // If the server doesn't return the signature data of a test (not even with data: []),
       // that test won't be shown in the graph or legend; this will prevent the UI from breaking
-      const data = responses
-        .filter((response) => response.data.length)
-        .map((reponse) => reponse.data[0]);
+      const seriesData = responses.flatMap((response) => response.data);
+      const data = tests
+        .map((series) =>
+          seriesData.find(
+            (item) =>
+              (item.signature_id === series.signature_id ||
+                item.signature_hash === series.signature_id) &&
+              item.repository_name === series.repository_name,
+          ),
+        )
+        .filter((item) => item);
       let newTestData = await this.createGraphObject(data);
 
       if (newDisplayedTests.length) {